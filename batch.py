@@ -0,0 +1,410 @@
+"""
+Vectorized batch simulator: plays N games in lockstep as NumPy arrays.
+
+Every game starts with player 1 and alternates, so on any step all unfinished
+games have the same side to move. Each step picks one shot per active game
+with a vectorized strategy, resolves it, and retires the games that ended.
+Cells are flattened to indices (y * SIZE + x) throughout.
+"""
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+from board import Board, Fleet
+from player import RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore
+
+RANDOM = "random"
+HUNT_TARGET = "hunt_target"
+HUNT_TARGET_MORE = "hunt_target_more"
+
+# Vectorized counterpart of each scalar strategy; target mode is targeting.TargetEngine's
+BATCH_STRATEGIES = {
+    RandomPlayer: RANDOM,
+    HuntTargetPlayer: HUNT_TARGET,
+    HuntTargetPlayerMore: HUNT_TARGET_MORE,
+}
+
+@lru_cache(maxsize=None)
+def placement_table(size: int, length: int) -> np.ndarray:
+    """All legal placements of a ship as a (placements, cells) boolean array."""
+    rows = []
+    for y in range(size):
+        for x in range(size):
+            for horizontal in (True, False):
+                if (x + length if horizontal else y + length) > size:
+                    continue
+                row = np.zeros(size * size, dtype=bool)
+                for i in range(length):
+                    cx, cy = (x + i, y) if horizontal else (x, y + i)
+                    row[cy * size + cx] = True
+                rows.append(row)
+    return np.array(rows)
+
+@lru_cache(maxsize=None)
+def distance_table(size: int) -> np.ndarray:
+    """Pairwise Manhattan distances between cells, shape (cells, cells)."""
+    xs = np.arange(size * size) % size
+    ys = np.arange(size * size) // size
+    return (np.abs(xs[:, None] - xs[None, :]) + np.abs(ys[:, None] - ys[None, :])).astype(np.int16)
+
+def choose(rng: np.random.Generator, mask: np.ndarray) -> np.ndarray:
+    """Uniformly picks one True column per row (rows must have at least one)."""
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1.0
+    return keys.argmax(axis=1)
+
+class BatchSimulator:
+    def __init__(self, n_games: int, p1_strategy: str, p2_strategy: str, seed: Optional[int] = None,
+                 size: Optional[int] = None, fleet: Optional[Fleet] = None):
+        self.n = n_games
+        # Dense (games, cells) state and the (cells, cells) distance table suit boards up to about 30x30
+        self.size = size or Board.SIZE
+        self.cells = self.size * self.size
+        self.strategies = (p1_strategy, p2_strategy)
+        self.rng = np.random.default_rng(seed)
+        self.lengths = np.array([length for _, length in (fleet or Board.FLEET)], dtype=np.int8)
+
+        n, c, f = n_games, self.cells, len(self.lengths)
+        # Per side: that side's own fleet, and its knowledge of the opponent
+        self.ship_id = np.full((2, n, c), -1, dtype=np.int8)
+        self.ship_hits = np.zeros((2, n, f), dtype=np.int8)
+        self.remaining = np.full((2, n), int(self.lengths.sum()), dtype=np.int16)
+        self.fired = np.zeros((2, n, c), dtype=bool)
+        self.enemy_alive = np.ones((2, n, f), dtype=bool)
+        # Hits on ships not yet sunk, which target mode works through
+        self.open = np.zeros((2, n, c), dtype=bool)
+        self.dist = np.full((2, n, c), 2 * self.size, dtype=np.int16)
+
+        self.winner = np.full(n, -1, dtype=np.int8)
+        self.turn_count = np.zeros(n, dtype=np.int32)
+
+    def place_ships(self):
+        """
+        Places every fleet uniformly over the placements still legal for each ship.
+        This matches Board.place_ships_randomly, whose retry loop accepts each legal
+        (x, y, orientation) with equal probability.
+        """
+        for side in (0, 1):
+            occupied = np.zeros((self.n, self.cells), dtype=bool)
+            for ship, length in enumerate(self.lengths):
+                table = placement_table(self.size, int(length))
+                overlap = occupied.astype(np.uint8) @ table.T.astype(np.uint8)
+                picks = table[choose(self.rng, overlap == 0)]
+                occupied |= picks
+                self.ship_id[side][picks] = ship
+
+    def run(self):
+        """Plays every game to completion; fills winner and turn_count."""
+        self.place_ships()
+        active = np.arange(self.n)
+        turn = 0
+        while active.size:
+            turn += 1
+            side = (turn - 1) % 2
+            shots = self._get_shots(side, active)
+            done = self._resolve(side, active, shots)
+            finished = active[done]
+            self.winner[finished] = side
+            self.turn_count[finished] = turn
+            active = active[~done]
+
+    def _get_shots(self, side: int, g: np.ndarray) -> np.ndarray:
+        strategy = self.strategies[side]
+        shots = np.full(g.size, -1, dtype=np.int64)
+        if strategy != RANDOM:
+            self._target_shots(side, g, shots)
+
+        hunting = shots < 0
+        if hunting.any():
+            hg = g[hunting]
+            if strategy == HUNT_TARGET:
+                shots[hunting] = self._min_length_probe(side, hg)
+            elif strategy == HUNT_TARGET_MORE:
+                shots[hunting] = self._max_distance_probe(side, hg)
+            else:
+                shots[hunting] = choose(self.rng, ~self.fired[side, hg])
+        return shots
+
+    def _target_shots(self, side: int, g: np.ndarray, shots: np.ndarray):
+        """
+        Target mode for every game with open hits, as targeting.TargetEngine
+        plays it: clusters of connected open hits are tried largest first,
+        and the first that scores any cell picks the shot. Ties are broken at random.
+        """
+        rows = np.flatnonzero(self.open[side, g].any(axis=1))
+        hits = self.open[side, g[rows]]
+        while rows.size:
+            tg = g[rows]
+            scores, cluster = self._cluster_scores(hits, self.open[side, tg], self.fired[side, tg],
+                                                   self.enemy_alive[side, tg])
+            found = scores.any(axis=1)
+            if found.any():
+                best = scores[found]
+                shots[rows[found]] = choose(self.rng, best == best.max(axis=1, keepdims=True))
+            # Rarely no cell around the largest cluster scores; the next cluster is tried instead
+            hits = hits[~found] & ~cluster[~found]
+            left = hits.any(axis=1)
+            rows, hits = rows[~found][left], hits[left]
+
+    def _cluster_scores(self, hits: np.ndarray, open_hits: np.ndarray, fired: np.ndarray, alive: np.ndarray):
+        """
+        Per game, the largest cluster of hits (a subset of its open hits) and
+        the cells it scores: a straight cluster scores the cells past its two
+        ends by the placements of the remaining ships that extend it, and
+        otherwise (or when neither end scores) each hit is scored along both
+        axes, with the cluster's unshot neighbors as the last resort.
+        """
+        size, c = self.size, self.cells
+        m = hits.shape[0]
+        r = np.arange(m)
+        alive_lengths = np.where(alive, self.lengths, 0).astype(np.int64)
+        longest = alive_lengths.max(axis=1)
+        counts = [(int(length), (alive_lengths == length).sum(axis=1)) for length in np.unique(self.lengths)]
+        # Ships can run through unshot cells and open hits, but not misses or sunk ships
+        passable = ~fired | open_hits
+        cluster, first, cluster_size = self._largest_cluster(hits)
+        scores = np.zeros((m, c), dtype=np.int64)
+
+        # A straight cluster: score the cells just past either end
+        last = c - 1 - cluster[:, ::-1].argmax(axis=1)
+        horizontal = first // size == last // size
+        line = np.flatnonzero((cluster_size > 1) & (horizontal | (first % size == last % size)))
+        if line.size:
+            first, last, horizontal = first[line], last[line], horizontal[line]
+            start = np.where(horizontal, first % size, first // size)
+            end = np.where(horizontal, last % size, last // size)
+            reach = np.maximum(longest[line] - (end - start + 1), 0)
+            dx, dy = horizontal.astype(np.int64), 1 - horizontal
+            before = self._runs(passable, line, first, -dx, -dy, reach)
+            after = self._runs(passable, line, last, dx, dy, reach)
+            votes = self._votes(start, end, before, after, [(length, count[line]) for length, count in counts])
+            step = np.where(horizontal, 1, size)
+            for cast, cell in zip(votes, (first - step, last + step)):
+                cell = np.where(cast > 0, cell, 0)
+                add = (cast > 0) & ~fired[line, cell]
+                scores[line[add], cell[add]] += cast[add]
+
+        # Otherwise each hit of the cluster on its own, along both axes
+        todo = ~scores.any(axis=1)
+        rows, cells = np.nonzero(cluster & todo[:, None])
+        if rows.size:
+            reach = np.maximum(longest[rows] - 1, 0)
+            per_hit = [(length, count[rows]) for length, count in counts]
+            for position, dx, dy, step in ((cells % size, 1, 0, 1), (cells // size, 0, 1, size)):
+                before = self._runs(passable, rows, cells, -dx, -dy, reach)
+                after = self._runs(passable, rows, cells, dx, dy, reach)
+                for cast, cell in zip(self._votes(position, position, before, after, per_hit),
+                                      (cells - step, cells + step)):
+                    # No votes reach past the board's edge, so an edge cell's neighbor index is never used
+                    add = cast > 0
+                    np.add.at(scores, (rows[add], cell[add]), cast[add])
+            # Votes only count for unshot cells
+            scores[fired & todo[:, None]] = 0
+
+        # Nothing explains the cluster: its unshot neighbors
+        todo = np.flatnonzero(~scores.any(axis=1))
+        if todo.size:
+            grid = cluster[todo].reshape(-1, size, size)
+            near = np.zeros_like(grid)
+            near[:, 1:, :] |= grid[:, :-1, :]
+            near[:, :-1, :] |= grid[:, 1:, :]
+            near[:, :, 1:] |= grid[:, :, :-1]
+            near[:, :, :-1] |= grid[:, :, 1:]
+            scores[todo] = near.reshape(-1, c) & ~fired[todo]
+        return scores, cluster
+
+    def _largest_cluster(self, hits: np.ndarray):
+        """
+        Per row, the largest cluster of orthogonally connected hits (the one
+        with the lowest cell on ties) as a mask, with its lowest cell and size.
+        Each cell is labelled with the lowest cell it connects to.
+        """
+        m, size, c = hits.shape[0], self.size, self.cells
+        cluster = hits.copy()
+        first = hits.argmax(axis=1)
+        count = hits.sum(axis=1)
+        cluster_size = np.minimum(count, 1)
+        # A lone hit is its own cluster; only games with several need labelling
+        several = np.flatnonzero(count > 1)
+        if not several.size:
+            return cluster, first, cluster_size
+        grid = hits[several].reshape(-1, size, size)
+        labels = np.where(grid, np.arange(c, dtype=np.int16).reshape(size, size), np.int16(c))
+        while True:
+            low = labels.copy()
+            np.minimum(low[:, 1:, :], labels[:, :-1, :], out=low[:, 1:, :])
+            np.minimum(low[:, :-1, :], labels[:, 1:, :], out=low[:, :-1, :])
+            np.minimum(low[:, :, 1:], labels[:, :, :-1], out=low[:, :, 1:])
+            np.minimum(low[:, :, :-1], labels[:, :, 1:], out=low[:, :, :-1])
+            low[~grid] = c
+            if np.array_equal(low, labels):
+                break
+            labels = low
+        labels = labels.reshape(-1, c).astype(np.int64)
+        k = several.size
+        sizes = np.bincount((labels + np.arange(k)[:, None] * (c + 1)).ravel(), minlength=k * (c + 1))
+        sizes = sizes.reshape(k, c + 1)[:, :c]
+        best = sizes.argmax(axis=1)
+        cluster[several] = labels == best[:, None]
+        first[several] = best
+        cluster_size[several] = sizes[np.arange(k), best]
+        return cluster, first, cluster_size
+
+    def _runs(self, passable: np.ndarray, rows: np.ndarray, cells: np.ndarray, dx, dy, limit) -> np.ndarray:
+        """For each (row, cell), how many passable cells follow it in direction (dx, dy), up to limit."""
+        size = self.size
+        x, y = cells % size, cells // size
+        run = np.zeros(cells.shape, dtype=np.int64)
+        going = np.ones(cells.shape, dtype=bool)
+        for k in range(1, size):
+            cx, cy = x + dx * k, y + dy * k
+            going &= (k <= limit) & (cx >= 0) & (cx < size) & (cy >= 0) & (cy < size)
+            if not going.any():
+                break
+            going &= passable[rows, np.where(going, cy * size + cx, 0)]
+            run += going
+        return run
+
+    @staticmethod
+    def _votes(start, end, before, after, counts):
+        """
+        TargetEngine.score_line's placement counts, elementwise: for a line
+        start..end along an axis with before/after free cells beyond it, the
+        placements of the remaining ships covering the line and the cell just
+        before it, and the line and the cell just after it.
+        """
+        votes_before = np.zeros(np.broadcast(start, before).shape, dtype=np.int64)
+        votes_after = np.zeros_like(votes_before)
+        for length, count in counts:
+            low = np.maximum(end - length + 1, start - before)
+            high = np.minimum(end + after - length + 1, start)
+            fits = low <= high
+            votes_before += np.where(fits & (low < start), count * (np.minimum(high, start - 1) - low + 1), 0)
+            votes_after += np.where(fits & (high > end - length + 1),
+                                    count * (high - np.maximum(low, end - length + 2) + 1), 0)
+        return votes_before, votes_after
+
+    def _resolve_sunk(self, side: int, g: np.ndarray, cells: np.ndarray):
+        """
+        Player._resolve_sunk for each game: the result does not name the ship,
+        so the sunk length is taken as the largest remaining one that fits the
+        longest line of open hits through the cell (horizontal on ties), and
+        that many of its hits, the lowest-ordered segment containing the cell,
+        stop being open.
+        """
+        if not g.size:
+            return
+        size = self.size
+        x, y = cells % size, cells // size
+        # Open hits on each side of the cell along each axis
+        spans = [self._runs(self.open[side], g, cells, dx, dy, size)
+                 for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))]
+        left, right, up, down = spans
+        vertical = up + down > left + right
+        low = np.where(vertical, up, left)
+        run = 1 + low + np.where(vertical, down, right)
+
+        alive = self.enemy_alive[side, g]
+        fitting = alive & (self.lengths <= run[:, None])
+        known = fitting.any(axis=1)
+        length = np.where(fitting, self.lengths, 0).max(axis=1).astype(np.int64)
+        # Equal-length ships are interchangeable, so the first alive one of that length is retired
+        ship = (alive & (self.lengths == length[:, None])).argmax(axis=1)
+        g, x, y, vertical, low, run, length, ship = (
+            a[known] for a in (g, x, y, vertical, low, run, length, ship))
+        self.enemy_alive[side, g, ship] = False
+
+        position = np.where(vertical, y, x)
+        start = np.maximum(position - low, position - length + 1)
+        stop = np.minimum(start + length, position - low + run)
+        for k in range(int(length.max(initial=0))):
+            along = start + k
+            inside = along < stop
+            cell = np.where(vertical, along * size + x, y * size + along)
+            self.open[side, g[inside], cell[inside]] = False
+
+    def _min_length_probe(self, side: int, g: np.ndarray) -> np.ndarray:
+        size = self.size
+        fired = self.fired[side, g]
+        lengths = np.where(self.enemy_alive[side, g], self.lengths, 127).min(axis=1)
+        candidates = np.zeros_like(fired)
+
+        for k in np.unique(lengths):
+            k = int(k)
+            rows = lengths == k
+            grid = fired[rows].reshape(-1, size, size)
+            cover = np.zeros(grid.shape, dtype=bool)
+            for axis in (2, 1):
+                counts = np.cumsum(grid, axis=axis, dtype=np.int16)
+                counts = np.concatenate([np.zeros_like(counts.take([0], axis=axis)), counts], axis=axis)
+                hi = counts.take(np.arange(k, size + 1), axis=axis)
+                lo = counts.take(np.arange(0, size - k + 1), axis=axis)
+                open_windows = (hi - lo) == 0
+                for offset in range(k):
+                    if axis == 2:
+                        cover[:, :, offset:offset + size - k + 1] |= open_windows
+                    else:
+                        cover[:, offset:offset + size - k + 1, :] |= open_windows
+            candidates[rows] = cover.reshape(-1, self.cells)
+
+        candidates &= ~fired
+        empty = ~candidates.any(axis=1)
+        candidates[empty] = ~fired[empty]
+        return choose(self.rng, candidates)
+
+    def _max_distance_probe(self, side: int, g: np.ndarray) -> np.ndarray:
+        fired = self.fired[side, g]
+        dist = np.where(fired, -1, self.dist[side, g])
+        best = dist.max(axis=1, keepdims=True)
+        candidates = dist == best
+        # First shot of the game has no reference point: fire anywhere
+        first = ~fired.any(axis=1)
+        candidates[first] = True
+        return choose(self.rng, candidates)
+
+    def _resolve(self, side: int, g: np.ndarray, shots: np.ndarray) -> np.ndarray:
+        target = 1 - side
+        self.fired[side, g, shots] = True
+        if self.strategies[side] == HUNT_TARGET_MORE:
+            self.dist[side, g] = np.minimum(self.dist[side, g], distance_table(self.size)[shots])
+
+        ship = self.ship_id[target, g, shots].astype(np.int64)
+        hit = ship >= 0
+        hg, hs, hship = g[hit], shots[hit], ship[hit]
+        self.ship_hits[target, hg, hship] += 1
+        self.remaining[target, hg] -= 1
+        sunk = self.ship_hits[target, hg, hship] >= self.lengths[hship]
+
+        if self.strategies[side] != RANDOM:
+            self.open[side, hg, hs] = True
+            self._resolve_sunk(side, hg[sunk], hs[sunk])
+
+        return self.remaining[target, g] == 0
+
+def run_batch(p1_class, p2_class, iterations: int, seed: Optional[int] = None, batch_size: int = 10000,
+              size: Optional[int] = None, fleet: Optional[Fleet] = None) -> dict:
+    """
+    Plays iterations games in lockstep chunks of batch_size.
+    Returns the same totals run_parallel does, plus per-game winner and turn_count arrays.
+    """
+    strategies = (BATCH_STRATEGIES[p1_class], BATCH_STRATEGIES[p2_class])
+    seeds = np.random.SeedSequence(seed).spawn((iterations + batch_size - 1) // batch_size)
+
+    winners = []
+    turn_counts = []
+    for i, chunk_seed in enumerate(seeds):
+        n = min(batch_size, iterations - i * batch_size)
+        sim = BatchSimulator(n, strategies[0], strategies[1], seed=chunk_seed, size=size, fleet=fleet)
+        sim.run()
+        winners.append(sim.winner)
+        turn_counts.append(sim.turn_count)
+
+    winner = np.concatenate(winners) if winners else np.zeros(0, dtype=np.int8)
+    turn_count = np.concatenate(turn_counts) if turn_counts else np.zeros(0, dtype=np.int32)
+    return {
+        "iterations": iterations,
+        "p1_wins": int((winner == 0).sum()),
+        "p2_wins": int((winner == 1).sum()),
+        "total_turns": int(turn_count.sum()),
+        "winner": winner,
+        "turn_count": turn_count,
+    }
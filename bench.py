@@ -0,0 +1,266 @@
+"""
+Microbenchmarks for the engine hot paths.
+
+    python bench.py                          # run and print
+    python bench.py -o baseline.json         # save a baseline
+    python bench.py --compare baseline.json  # diff against a saved baseline
+    python bench.py --scaling                # time per game versus board size
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from board import Board
+from game import Game
+from seeding import game_seeds
+from stats import percentile
+from player import RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer
+
+PLAYER_CLASSES = [RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer]
+
+def summarize(latencies_ns: List[int], elapsed: float) -> dict:
+    """Throughput and latency percentiles (microseconds) for one benchmark."""
+    ordered = sorted(latencies_ns)
+    return {
+        "calls": len(ordered),
+        "total_s": round(elapsed, 6),
+        "ops_per_s": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_us": round(percentile(ordered, 50) / 1000, 3),
+        "p90_us": round(percentile(ordered, 90) / 1000, 3),
+        "p99_us": round(percentile(ordered, 99) / 1000, 3),
+        "max_us": round(ordered[-1] / 1000, 3) if ordered else 0.0,
+    }
+
+def peak_memory_kb(run: Callable[[], object]) -> float:
+    """Peak traced Python allocation during one extra run (kept out of the timed runs)."""
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+def bench_receive_shot(boards: int) -> dict:
+    latencies = []
+    cells = [(x, y) for x in range(Board.SIZE) for y in range(Board.SIZE)]
+    start = time.perf_counter()
+    for _ in range(boards):
+        board = Board()
+        board.place_ships_randomly()
+        random.shuffle(cells)
+        for x, y in cells:
+            t0 = time.perf_counter_ns()
+            board.receive_shot(x, y)
+            latencies.append(time.perf_counter_ns() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+def bench_place_ships(boards: int) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(boards):
+        board = Board()
+        t0 = time.perf_counter_ns()
+        board.place_ships_randomly()
+        latencies.append(time.perf_counter_ns() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+def bench_probe(player_class, probe: str, games: int) -> dict:
+    """Times one hunt probe at every state of a game whose shots follow the probe itself."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(games):
+        player = player_class(player_class.__name__)
+        method = getattr(player, probe)
+        for _ in range(Board.SIZE * Board.SIZE):
+            t0 = time.perf_counter_ns()
+            x, y = method()
+            latencies.append(time.perf_counter_ns() - t0)
+            player.record_shot(x, y)
+    return summarize(latencies, time.perf_counter() - start)
+
+def bench_game(p1_class, p2_class, games: int, reuse: bool = False) -> dict:
+    """
+    Times game.play; with reuse, one pair of players is reset() between games.
+    blocks_per_game is the number of live memory blocks the game state holds
+    at its end that it did not hold before the game: everything for fresh
+    players, only container growth for reused ones.
+    """
+    latencies = []
+    shots = 0
+    blocks = 0
+    p1 = p1_class(p1_class.__name__)
+    p2 = p2_class(p2_class.__name__)
+    start = time.perf_counter()
+    for _ in range(games):
+        if not reuse:
+            p1 = p2 = None
+        b0 = sys.getallocatedblocks()
+        if reuse:
+            p1.reset()
+            p2.reset()
+        else:
+            p1 = p1_class(p1_class.__name__)
+            p2 = p2_class(p2_class.__name__)
+        game = Game(p1, p2)
+        t0 = time.perf_counter_ns()
+        game.play()
+        latencies.append(time.perf_counter_ns() - t0)
+        blocks += sys.getallocatedblocks() - b0
+        shots += game.turn_count
+        del game
+    elapsed = time.perf_counter() - start
+    result = summarize(latencies, elapsed)
+    result["games_per_s"] = result.pop("ops_per_s")
+    result["shots_per_s"] = round(shots / elapsed, 1) if elapsed else 0.0
+    result["blocks_per_game"] = round(blocks / games, 1)
+    return result
+
+def bench_scaling(sizes: List[int], games: int, budget_s: float, seed: int = 0) -> Dict[str, dict]:
+    """
+    Self-play time per game for every strategy at each board size, standard fleet.
+    Each size plays up to games games or until budget_s is spent (at least one);
+    once a strategy needs more than budget_s for a single game, larger sizes are skipped.
+    """
+    results: Dict[str, dict] = {}
+    for player_class in PLAYER_CLASSES:
+        name = player_class.__name__
+        results[name] = {}
+        for size in sizes:
+            seeds = game_seeds(seed)
+            played = 0
+            turns = 0
+            worst = 0.0
+            start = time.perf_counter()
+            while played < games and (played == 0 or time.perf_counter() - start < budget_s):
+                game = Game(player_class(name, size=size), player_class(name, size=size), seed=next(seeds))
+                t0 = time.perf_counter()
+                game.play()
+                worst = max(worst, time.perf_counter() - t0)
+                played += 1
+                turns += game.turn_count
+            elapsed = time.perf_counter() - start
+            results[name][size] = {
+                "games": played,
+                "s_per_game": round(elapsed / played, 6),
+                "turns_per_game": round(turns / played, 1),
+                "us_per_turn": round(elapsed / turns * 1e6, 2),
+            }
+            row = results[name][size]
+            print(f"{name:<26} {size:>4}x{size:<4} {row['s_per_game']:>10.4f}s/game {row['turns_per_game']:>9.1f} turns"
+                  f" {row['us_per_turn']:>9.2f}us/turn  ({played} games)")
+            if worst > budget_s:
+                skipped = [s for s in sizes if s > size]
+                if skipped:
+                    print(f"{name:<26} skipping {', '.join(map(str, skipped))}: one game took {worst:.1f}s")
+                break
+    return results
+
+def run_benchmarks(scale: float = 1.0, seed: int = 0) -> Dict[str, dict]:
+    n = lambda count: max(1, int(count * scale))
+    cases = {
+        "board.receive_shot": (bench_receive_shot, (n(2000),)),
+        "board.place_ships_randomly": (bench_place_ships, (n(20000),)),
+        "player.min_length_probe": (bench_probe, (HuntTargetPlayer, "min_length_probe", n(200))),
+        "player.max_distance_probe": (bench_probe, (HuntTargetPlayerMore, "max_distance_probe", n(200))),
+    }
+    for p1_class in PLAYER_CLASSES:
+        for p2_class in PLAYER_CLASSES:
+            cases[f"game.play[{p1_class.__name__}-{p2_class.__name__}]"] = (bench_game, (p1_class, p2_class, n(200)))
+    # Same pairing with the players reused across games, as run_simulation does
+    for p1_class, p2_class in ((HuntTargetPlayer, HuntTargetPlayerMore), (RandomPlayer, RandomPlayer)):
+        pairing = f"{p1_class.__name__}-{p2_class.__name__}"
+        cases[f"game.play.reuse[{pairing}]"] = (bench_game, (p1_class, p2_class, n(200), True))
+
+    results = {}
+    for name, (func, args) in cases.items():
+        random.seed(seed)
+        result = func(*args)
+        # Memory pass uses a single small workload of the same kind
+        small_args = tuple(1 if type(a) is int else a for a in args)
+        result["peak_kb"] = peak_memory_kb(lambda: func(*small_args))
+        results[name] = result
+        print(f"{name:<60} {format_result(result)}")
+
+    return results
+
+def format_result(result: dict) -> str:
+    if "games_per_s" in result:
+        rate = (f"{result['games_per_s']:>9.1f} games/s {result['shots_per_s']:>11.0f} shots/s"
+                f" {result['blocks_per_game']:>8.1f} blocks/game")
+    else:
+        rate = f"{result['ops_per_s']:>11.0f} calls/s"
+    return f"{rate}  p50 {result['p50_us']:>9.2f}us  p99 {result['p99_us']:>9.2f}us  peak {result['peak_kb']:>8.1f}KB"
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+    }
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Prints throughput ratios against a baseline; returns the regressed benchmark names."""
+    regressions = []
+    print("-" * 30)
+    print(f"Comparison (regression threshold {threshold:.0%}):")
+    for name, result in current.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        key = "games_per_s" if "games_per_s" in result else "ops_per_s"
+        if not old.get(key):
+            continue
+        ratio = result[key] / old[key]
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<60} {ratio:>6.2f}x{flag}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Battleship engine hot paths")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every workload size (e.g. 0.1 for a quick run)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed for the benchmark workloads")
+    parser.add_argument("-o", "--output", default=None, help="Save results as a JSON baseline")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown fraction reported as a regression")
+    parser.add_argument("--scaling", action="store_true", help="Run the board-size scaling benchmark instead")
+    parser.add_argument("--sizes", default="10,20,50,100", help="Board sizes for --scaling")
+    parser.add_argument("--budget", type=float, default=30.0, help="Seconds per strategy and size for --scaling")
+    args = parser.parse_args()
+
+    if args.scaling:
+        sizes = [int(size) for size in args.sizes.split(",")]
+        scaling = bench_scaling(sizes, max(1, int(20 * args.scale)), args.budget, args.seed)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"meta": metadata(), "scaling": scaling}, f, indent=2)
+            print(f"Saved scaling results to {args.output}")
+        raise SystemExit(0)
+
+    results = run_benchmarks(args.scale, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "scale": args.scale, "benchmarks": results}, f, indent=2)
+        print(f"Saved baseline to {args.output}")
+
+    regressions: Optional[List[str]] = None
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["benchmarks"], args.threshold)
+    if regressions:
+        raise SystemExit(1)
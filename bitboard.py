@@ -0,0 +1,151 @@
+import random
+from functools import lru_cache
+from typing import List, Tuple, Dict, Optional
+from board import Board, Fleet, Ship
+from placements import LayoutPool
+from enums import CellState, ShotResult
+
+@lru_cache(maxsize=None)
+def placement_mask(size: int, length: int, x: int, y: int, horizontal: bool) -> int:
+    """Bitmask covered by a ship at (x, y), or 0 if it would leave the board."""
+    if horizontal and x + length > size:
+        return 0
+    if not horizontal and y + length > size:
+        return 0
+    step = 1 if horizontal else size
+    start = y * size + x
+    mask = 0
+    for i in range(length):
+        mask |= 1 << (start + i * step)
+    return mask
+
+class BitBoard(Board):
+    """
+    Board backed by integer bitmasks (bit index = y * SIZE + x).
+    Shot resolution is a single mask operation; grid and
+    ship_map are derived views kept for the visualizer and other readers.
+    """
+    __slots__ = ("ship_mask", "shot_mask", "hit_mask", "miss_mask", "_grid_cache")
+
+    def __init__(self, rng=None, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+                 layout_pool: Optional[LayoutPool] = None):
+        # Deliberately skips Board.__init__: grid/ship_map/shots_received are views here
+        self.rng = rng if rng is not None else random
+        self.size = size or self.SIZE
+        self.fleet = list(fleet or self.FLEET)
+        self.layout_pool = layout_pool
+        self.layout: List[Tuple[int, int, bool]] = []
+        self.ships: List[Ship] = []
+        self.ship_mask = 0
+        self.shot_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.remaining = 0
+        self._ship_at: List[Optional[Ship]] = [None] * (self.size * self.size)
+        self.last_shot: Optional[int] = None
+        self._grid_cache = None
+
+    def __getstate__(self):
+        # Board's grid slot is shadowed by the grid view below, so it is not part of the state
+        names = [name for name in Board.__slots__ + BitBoard.__slots__ if name not in ("grid", "_grid_cache")]
+        return None, {name: getattr(self, name) for name in names}
+
+    def __setstate__(self, state):
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        self._grid_cache = None
+
+    def reset(self):
+        self.layout = []
+        self.ships.clear()
+        self.ship_mask = self.shot_mask = self.hit_mask = self.miss_mask = 0
+        self.remaining = 0
+        ship_at = self._ship_at
+        for i in range(len(ship_at)):
+            ship_at[i] = None
+        self.last_shot = None
+        self._grid_cache = None
+
+    def _can_place(self, ship: Ship, x: int, y: int, horizontal: bool) -> bool:
+        mask = placement_mask(self.size, ship.length, x, y, horizontal)
+        return mask != 0 and not (mask & self.ship_mask)
+
+    def _place(self, ship: Ship, x: int, y: int, horizontal: bool):
+        self.ships.append(ship)
+        self.remaining += ship.length
+        self.ship_mask |= placement_mask(self.size, ship.length, x, y, horizontal)
+        step = 1 if horizontal else self.size
+        start = y * self.size + x
+        for i in range(ship.length):
+            self._ship_at[start + i * step] = ship
+        self._grid_cache = None
+
+    def receive_shot(self, x: int, y: int) -> ShotResult:
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return ShotResult.DUPLICATE # Treat OOB as wasted shot
+
+        idx = y * self.size + x
+        self.last_shot = idx
+        bit = 1 << idx
+        if self.shot_mask & bit:
+            return ShotResult.DUPLICATE
+
+        self.shot_mask |= bit
+        self._grid_cache = None
+
+        if not (self.ship_mask & bit):
+            self.miss_mask |= bit
+            return ShotResult.MISS
+
+        self.hit_mask |= bit
+        self.remaining -= 1
+        ship = self._ship_at[idx]
+        ship.hits += 1
+        if ship.is_sunk:
+            return ShotResult.SUNK
+        return ShotResult.HIT
+
+    def all_ships_sunk(self) -> bool:
+        return self.remaining == 0
+
+    def cell_state(self, index: int) -> CellState:
+        # Read from the masks, so one cell does not rebuild the whole grid view
+        bit = 1 << index
+        if self.hit_mask & bit:
+            return CellState.HIT
+        if self.miss_mask & bit:
+            return CellState.MISS
+        if self.ship_mask & bit:
+            return CellState.SHIP
+        return CellState.EMPTY
+
+    @property
+    def grid(self) -> List[List[CellState]]:
+        # Rebuilt lazily at most once per state change, since draw_board reads it per cell
+        if self._grid_cache is None:
+            grid = []
+            for y in range(self.size):
+                row = []
+                for x in range(self.size):
+                    bit = 1 << (y * self.size + x)
+                    if self.hit_mask & bit:
+                        row.append(CellState.HIT)
+                    elif self.miss_mask & bit:
+                        row.append(CellState.MISS)
+                    elif self.ship_mask & bit:
+                        row.append(CellState.SHIP)
+                    else:
+                        row.append(CellState.EMPTY)
+                grid.append(row)
+            self._grid_cache = grid
+        return self._grid_cache
+
+    @property
+    def ship_map(self) -> Dict[Tuple[int, int], Ship]:
+        return {(idx % self.size, idx // self.size): ship
+                for idx, ship in enumerate(self._ship_at) if ship is not None}
+
+    @property
+    def shots_received(self) -> set:
+        return {(idx % self.size, idx // self.size)
+                for idx in range(self.size * self.size) if self.shot_mask >> idx & 1}
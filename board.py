@@ -1,8 +1,11 @@
 import random
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, Sequence
 from enums import CellState, ShotResult
+from placements import LayoutPool, sample_layout
 
 class Ship:
+    __slots__ = ("name", "length", "hits")
+
     def __init__(self, name: str, length: int):
         self.name = name
         self.length = length
@@ -12,44 +15,111 @@ class Ship:
     def is_sunk(self) -> bool:
         return self.hits >= self.length
 
+Fleet = Sequence[Tuple[str, int]]
+
+def parse_fleet(spec: str) -> List[Tuple[str, int]]:
+    """
+    Parses a fleet such as "Carrier:5,Destroyer:2" or just "5,4,3,3,2"
+    (unnamed ships are called "Ship 1", "Ship 2", ...).
+    """
+    fleet = []
+    for i, item in enumerate(part.strip() for part in spec.split(",") if part.strip()):
+        name, _, length = item.rpartition(":")
+        fleet.append((name or f"Ship {i + 1}", int(length)))
+    if not fleet or any(length < 1 for _, length in fleet):
+        raise ValueError(f"Invalid fleet: {spec!r}")
+    return fleet
+
 class Board:
+    # Defaults for boards built without an explicit size or fleet
     SIZE = 10
+    # Standard fleet as (name, length) pairs
+    FLEET = [
+        ("Carrier", 5),
+        ("Battleship", 4),
+        ("Cruiser", 3),
+        ("Submarine", 3),
+        ("Destroyer", 2)
+    ]
+    __slots__ = ("rng", "size", "fleet", "layout_pool", "grid", "ships", "layout", "remaining", "_ship_at", "last_shot")
 
-    def __init__(self):
-        # 10x10 grid initialized to EMPTY
-        self.grid = [[CellState.EMPTY for _ in range(self.SIZE)] for _ in range(self.SIZE)]
+    def __init__(self, rng=None, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+                 layout_pool: Optional[LayoutPool] = None):
+        # RNG stream for placement; defaults to the process-wide random module
+        self.rng = rng if rng is not None else random
+        self.size = size or self.SIZE
+        self.fleet = list(fleet or self.FLEET)
+        # Optional pool of pre-generated layouts, usually shared by every board of a run
+        self.layout_pool = layout_pool
+        # size x size grid initialized to EMPTY
+        self.grid = [[CellState.EMPTY for _ in range(self.size)] for _ in range(self.size)]
         self.ships: List[Ship] = []
-        self.ship_map: Dict[Tuple[int, int], Ship] = {} # Maps coordinates to Ship objects
-        self.shots_received = set()
+        # Ship at each cell index (y * size + x), or None
+        self._ship_at: List[Optional[Ship]] = [None] * (self.size * self.size)
+        self.layout: List[Tuple[int, int, bool]] = []
+        # Ship cells not yet hit; the game is won when this reaches 0
+        self.remaining = 0
+        # Cell index of the most recent shot on the board, which the visualizer restyles
+        self.last_shot: Optional[int] = None
+
+    @property
+    def lengths(self) -> List[int]:
+        return [length for _, length in self.fleet]
+
+    def reset(self):
+        """Clears the board in place for another game, reusing its containers."""
+        for row in self.grid:
+            for x in range(self.size):
+                row[x] = CellState.EMPTY
+        self.ships.clear()
+        ship_at = self._ship_at
+        for i in range(len(ship_at)):
+            ship_at[i] = None
+        self.layout = []
+        self.remaining = 0
+        self.last_shot = None
+
+    def cell_state(self, index: int) -> CellState:
+        """State of the cell at index (y * size + x)."""
+        return self.grid[index // self.size][index % self.size]
+
+    def ship_cells(self, ship: Ship) -> List[int]:
+        """Cell indices covered by ship, from its entry in the layout."""
+        x, y, horizontal = self.layout[self.ships.index(ship)]
+        step = 1 if horizontal else self.size
+        return [y * self.size + x + i * step for i in range(ship.length)]
+
+    @property
+    def ship_map(self) -> Dict[Tuple[int, int], Ship]:
+        """Coordinates to Ship objects; a view built on demand for the visualizer."""
+        return {(idx % self.size, idx // self.size): ship
+                for idx, ship in enumerate(self._ship_at) if ship is not None}
+
+    @property
+    def shots_received(self) -> set:
+        return {(x, y) for y, row in enumerate(self.grid) for x, cell in enumerate(row)
+                if cell == CellState.MISS or cell == CellState.HIT}
 
     def place_ships_randomly(self):
-        """Places the standard 5 battleship fleet randomly."""
-        fleet = [
-            Ship("Carrier", 5),
-            Ship("Battleship", 4),
-            Ship("Cruiser", 3),
-            Ship("Submarine", 3),
-            Ship("Destroyer", 2)
-        ]
-        
-        for ship in fleet:
-            placed = False
-            attempts = 0
-            while not placed and attempts < 1000:
-                x = random.randint(0, self.SIZE - 1)
-                y = random.randint(0, self.SIZE - 1)
-                horizontal = random.choice([True, False])
-                if self._can_place(ship, x, y, horizontal):
-                    self._place(ship, x, y, horizontal)
-                    placed = True
-                attempts += 1
-            if not placed:
-                raise RuntimeError(f"Failed to place {ship.name} after 1000 attempts.")
+        """Places the board's fleet randomly."""
+        pool = self.layout_pool
+        # A pool only serves boards of the size and fleet it was generated for
+        if pool is not None and pool.size == self.size and list(pool.lengths) == self.lengths:
+            layout = pool.draw(self.rng)
+        else:
+            layout = sample_layout(self.size, self.lengths, self.rng)
+        self.place_layout(layout)
+
+    def place_layout(self, layout: List[Tuple[int, int, bool]]):
+        """Places the fleet at the given (x, y, horizontal) origins, in fleet order."""
+        self.layout = list(layout)
+        for (name, length), (x, y, horizontal) in zip(self.fleet, layout):
+            self._place(Ship(name, length), x, y, horizontal)
 
     def _can_place(self, ship: Ship, x: int, y: int, horizontal: bool) -> bool:
         for i in range(ship.length):
             cx, cy = (x + i, y) if horizontal else (x, y + i)
-            if cx >= self.SIZE or cy >= self.SIZE:
+            if cx >= self.size or cy >= self.size:
                 return False
             if self.grid[cy][cx] != CellState.EMPTY:
                 return False
@@ -57,28 +127,29 @@ class Board:
 
     def _place(self, ship: Ship, x: int, y: int, horizontal: bool):
         self.ships.append(ship)
+        self.remaining += ship.length
         for i in range(ship.length):
             cx, cy = (x + i, y) if horizontal else (x, y + i)
             self.grid[cy][cx] = CellState.SHIP
-            self.ship_map[(cx, cy)] = ship
+            self._ship_at[cy * self.size + cx] = ship
 
     def receive_shot(self, x: int, y: int) -> ShotResult:
-        if not (0 <= x < self.SIZE and 0 <= y < self.SIZE):
+        if not (0 <= x < self.size and 0 <= y < self.size):
             return ShotResult.DUPLICATE # Treat OOB as wasted shot
-        
-        if (x, y) in self.shots_received:
-            return ShotResult.DUPLICATE
 
-        self.shots_received.add((x, y))
-        cell = self.grid[y][x]
+        self.last_shot = y * self.size + x
+        # A cell already shot at holds MISS or HIT, so the grid doubles as the shot record
+        row = self.grid[y]
+        cell = row[x]
 
-        if cell == CellState.EMPTY:
-            self.grid[y][x] = CellState.MISS
+        if cell is CellState.EMPTY:
+            row[x] = CellState.MISS
             return ShotResult.MISS
         
-        elif cell == CellState.SHIP:
-            self.grid[y][x] = CellState.HIT
-            ship = self.ship_map[(x, y)]
+        elif cell is CellState.SHIP:
+            row[x] = CellState.HIT
+            self.remaining -= 1
+            ship = self._ship_at[y * self.size + x]
             ship.hits += 1
             if ship.is_sunk:
                 return ShotResult.SUNK
@@ -87,4 +158,4 @@ class Board:
         return ShotResult.DUPLICATE
 
     def all_ships_sunk(self) -> bool:
-        return all(ship.is_sunk for ship in self.ships)
\ No newline at end of file
+        return self.remaining == 0
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Stand-in external bot for server.py, built on the in-process strategies.
+
+Speaks the match server's line protocol on stdin/stdout, or over TCP with
+--connect. --delay adds think time per move to exercise the server's timeouts.
+"""
+import argparse
+import socket
+import sys
+import time
+from typing import Dict
+from enums import ShotResult
+from player import Player, RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer
+
+PLAYER_CLASSES = {cls.__name__: cls for cls in (RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer)}
+
+def serve(lines, send, strategy: type, delay: float = 0.0):
+    """Answers protocol lines from lines, writing replies with send."""
+    games: Dict[str, Player] = {}
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        command, game_id = parts[0], parts[1]
+        if command == "NEW":
+            size = int(parts[2])
+            fleet = [(f"Ship {i + 1}", int(length)) for i, length in enumerate(parts[3].split(","))]
+            games[game_id] = strategy(strategy.__name__, size=size, fleet=fleet)
+        elif command == "SHOT":
+            if delay:
+                time.sleep(delay)
+            x, y = games[game_id].get_shot()
+            send(f"SHOT {game_id} {x} {y}")
+        elif command == "RESULT":
+            games[game_id].inform_result(int(parts[2]), int(parts[3]), ShotResult[parts[4]])
+        elif command == "END":
+            games.pop(game_id, None)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in bot for the match server")
+    parser.add_argument("--strategy", choices=sorted(PLAYER_CLASSES), default=HuntTargetPlayerMore.__name__, help="Strategy that picks the shots")
+    parser.add_argument("--connect", default=None, help="Connect to a server at HOST:PORT instead of using stdin/stdout")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds of think time per move")
+    parser.add_argument("--name", default=None, help="Name announced to the server")
+    args = parser.parse_args()
+
+    strategy = PLAYER_CLASSES[args.strategy]
+    name = args.name or f"bot-{strategy.__name__}"
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)))
+        # Separate reader and writer: a read-write text file drops read-ahead on every write
+        lines, out = sock.makefile("r"), sock.makefile("w")
+    else:
+        lines, out = sys.stdin, sys.stdout
+
+    def send(text: str):
+        out.write(text + "\n")
+        out.flush()
+
+    send(f"HELLO {name}")
+    serve(lines, send, strategy, args.delay)
@@ -0,0 +1,177 @@
+from typing import Iterable, List, Optional, Set, Tuple
+
+class FitIndex:
+    """
+    Incremental index of unfired cells that can still hold a ship of length k.
+
+    Every horizontal and vertical window of k cells keeps a count of fired
+    cells inside it; a cell is a candidate while it is unfired and covered by
+    at least one window with no fired cells. Recording a shot only touches the
+    windows that contain it, instead of rescanning the whole board.
+
+    A Fenwick tree over the x-major cell order counts the candidates, so
+    choice() can draw the same cell as rng.choice(ordered()) in O(log cells)
+    without sorting, which matters on large boards.
+    """
+
+    def __init__(self, size: int, k: int, fired: Iterable[Tuple[int, int]] = ()):
+        self.size = size
+        self.k = k
+        # Fired-cell count per window, indexed [row][start_x] and [col][start_y]
+        self.h_fired = [[0] * (size - k + 1) for _ in range(size)]
+        self.v_fired = [[0] * (size - k + 1) for _ in range(size)]
+        # Number of open windows covering each cell, indexed [y][x]
+        self.cover = [[0] * size for _ in range(size)]
+        self.fired: Set[Tuple[int, int]] = set()
+        self.candidates: Set[Tuple[int, int]] = set()
+        # 1-based Fenwick tree over positions x * size + y
+        self._tree = [0] * (size * size + 1)
+
+        for x, y in fired:
+            self._count(x, y)
+        self._build()
+
+    def _count(self, x: int, y: int):
+        if (x, y) in self.fired:
+            return
+        self.fired.add((x, y))
+        for sx in self._starts(x):
+            self.h_fired[y][sx] += 1
+        for sy in self._starts(y):
+            self.v_fired[x][sy] += 1
+
+    def _starts(self, pos: int) -> range:
+        return range(max(0, pos - self.k + 1), min(self.size - self.k, pos) + 1)
+
+    def _build(self):
+        k = self.k
+        for y in range(self.size):
+            for sx, count in enumerate(self.h_fired[y]):
+                if count == 0:
+                    for cx in range(sx, sx + k):
+                        self.cover[y][cx] += 1
+        for x in range(self.size):
+            for sy, count in enumerate(self.v_fired[x]):
+                if count == 0:
+                    for cy in range(sy, sy + k):
+                        self.cover[cy][x] += 1
+        for y in range(self.size):
+            for x in range(self.size):
+                if self.cover[y][x] and (x, y) not in self.fired:
+                    self.candidates.add((x, y))
+                    self._update(x, y, 1)
+
+    def _update(self, x: int, y: int, delta: int):
+        tree = self._tree
+        i = x * self.size + y + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _discard(self, x: int, y: int):
+        if (x, y) in self.candidates:
+            self.candidates.remove((x, y))
+            self._update(x, y, -1)
+
+    def record(self, x: int, y: int):
+        """Marks (x, y) as fired and closes every window that contained it."""
+        if (x, y) in self.fired:
+            return
+        self.fired.add((x, y))
+        self._discard(x, y)
+
+        k = self.k
+        cover = self.cover
+        for sx in self._starts(x):
+            self.h_fired[y][sx] += 1
+            if self.h_fired[y][sx] == 1:
+                for cx in range(sx, sx + k):
+                    cover[y][cx] -= 1
+                    if cover[y][cx] == 0:
+                        self._discard(cx, y)
+        for sy in self._starts(y):
+            self.v_fired[x][sy] += 1
+            if self.v_fired[x][sy] == 1:
+                for cy in range(sy, sy + k):
+                    cover[cy][x] -= 1
+                    if cover[cy][x] == 0:
+                        self._discard(x, cy)
+
+    def ordered(self) -> List[Tuple[int, int]]:
+        """Candidates in the x-major scan order min_length_probe has always used."""
+        return sorted(self.candidates)
+
+    def choice(self, rng) -> Optional[Tuple[int, int]]:
+        """
+        Same cell (and same rng consumption) as rng.choice(self.ordered()),
+        or None when there are no candidates.
+        """
+        if not self.candidates:
+            return None
+        # choice() draws its index with _randbelow(len), exactly as randrange(len) does
+        remaining = rng.randrange(len(self.candidates))
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= remaining:
+                pos = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return divmod(pos, self.size)
+
+class DistanceField:
+    """
+    Incrementally maintained Manhattan distance from every cell to its nearest fired cell.
+
+    A new shot runs a breadth-first relaxation outwards from the shot and stops
+    wherever a cell's distance does not drop. Cells closer to the new shot than
+    to any earlier one form a region connected to it along shortest paths, so
+    the pruned search reaches all of them and nothing else.
+
+    Cells are also bucketed by distance, so farthest() only sorts the top
+    bucket instead of scanning the whole board.
+    """
+
+    def __init__(self, size: int, fired: Iterable[Tuple[int, int]] = ()):
+        self.size = size
+        # Larger than any on-board distance until the first shot arrives
+        self.dist = [[2 * size] * size for _ in range(size)]
+        # Cells at each distance, as x-major positions x * size + y
+        self.buckets: List[Set[int]] = [set() for _ in range(2 * size + 1)]
+        self.buckets[2 * size].update(range(size * size))
+        self._top = 2 * size
+        for x, y in fired:
+            self.record(x, y)
+
+    def record(self, x: int, y: int):
+        dist = self.dist
+        if dist[y][x] == 0:
+            return
+        size = self.size
+        buckets = self.buckets
+        buckets[dist[y][x]].discard(x * size + y)
+        dist[y][x] = 0
+        buckets[0].add(x * size + y)
+
+        queue = [(x, y)]
+        for cx, cy in queue:
+            d = dist[cy][cx] + 1
+            for nx, ny in ((cx, cy - 1), (cx, cy + 1), (cx - 1, cy), (cx + 1, cy)):
+                if 0 <= nx < size and 0 <= ny < size and dist[ny][nx] > d:
+                    pos = nx * size + ny
+                    buckets[dist[ny][nx]].discard(pos)
+                    buckets[d].add(pos)
+                    dist[ny][nx] = d
+                    queue.append((nx, ny))
+
+    def farthest(self) -> List[Tuple[int, int]]:
+        """Unfired cells at the maximum distance, in the x-major scan order."""
+        # Distances only ever shrink, so the top bucket index only moves down
+        while self._top > 0 and not self.buckets[self._top]:
+            self._top -= 1
+        if self._top == 0:
+            return []
+        size = self.size
+        return [divmod(pos, size) for pos in sorted(self.buckets[self._top])]
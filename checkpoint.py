@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from results import shard_path
+from seeding import SeedStream, game_seeds
+
+class ShardProgress:
+    """
+    Running totals of one shard of games, plus the shard's seed stream.
+    Games are played in seed order, so the totals and the stream position
+    together are everything needed to continue the shard exactly.
+    """
+
+    def __init__(self, shard: int, seed: int):
+        self.shard = shard
+        self.seeds: SeedStream = game_seeds(seed)
+        self.games = 0
+        self.p1_wins = 0
+        self.p2_wins = 0
+        self.total_turns = 0
+        # Games per turn count
+        self.turn_counts: Dict[int, int] = {}
+        self.elapsed = 0.0
+
+    def record(self, p1_won: bool, turns: int):
+        self.games += 1
+        self.total_turns += turns
+        self.turn_counts[turns] = self.turn_counts.get(turns, 0) + 1
+        if p1_won:
+            self.p1_wins += 1
+        else:
+            self.p2_wins += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "shard": self.shard,
+            "games": self.games,
+            "p1_wins": self.p1_wins,
+            "p2_wins": self.p2_wins,
+            "total_turns": self.total_turns,
+            "turn_counts": {str(turns): count for turns, count in sorted(self.turn_counts.items())},
+            "elapsed": self.elapsed,
+            "seed_state": self.seeds.getstate(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ShardProgress":
+        progress = cls(data["shard"], 0)
+        progress.seeds.setstate(data["seed_state"])
+        progress.games = data["games"]
+        progress.p1_wins = data["p1_wins"]
+        progress.p2_wins = data["p2_wins"]
+        progress.total_turns = data["total_turns"]
+        progress.turn_counts = {int(turns): count for turns, count in data.get("turn_counts", {}).items()}
+        progress.elapsed = data["elapsed"]
+        return progress
+
+def write_atomic(path: str, data: dict):
+    """Writes JSON to a temporary file and renames it over path, so a crash never leaves a torn file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def load_checkpoint(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != Checkpointer.VERSION:
+        raise ValueError(f"{path} is not a checkpoint file this version can resume.")
+    return data
+
+def config_mismatches(saved: dict, current: dict) -> List[str]:
+    """Settings that differ between a checkpoint's run and the current one."""
+    return [key for key in sorted(set(saved) | set(current)) if saved.get(key) != current.get(key)]
+
+class Checkpointer:
+    """
+    Saves run progress to path, at most every every_games games or every_seconds
+    of wall time (whichever comes first; 0 disables either trigger).
+    config identifies the run, so a resume can refuse mismatched settings.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, config: dict, every_games: int = 0, every_seconds: float = 60.0):
+        self.path = path
+        self.config = config
+        self.every_games = every_games
+        self.every_seconds = every_seconds
+        self.saves = 0
+        self._last_games = 0
+        self._last_time = time.monotonic()
+
+    def for_shard(self, shard: int) -> "Checkpointer":
+        """A checkpointer for one worker's shard, next to the run's own file."""
+        return Checkpointer(shard_path(self.path, shard), self.config, self.every_games, self.every_seconds)
+
+    def mark(self, games: int):
+        """Restarts both intervals, e.g. when a shard starts or resumes."""
+        self._last_games = games
+        self._last_time = time.monotonic()
+
+    def due(self, games: int) -> bool:
+        if self.every_games and games - self._last_games >= self.every_games:
+            return True
+        return bool(self.every_seconds) and time.monotonic() - self._last_time >= self.every_seconds
+
+    def save(self, shards: Dict[int, ShardProgress], games: int = 0, complete: bool = False):
+        write_atomic(self.path, {
+            "version": self.VERSION,
+            "config": self.config,
+            "complete": complete,
+            "shards": {str(shard): progress.to_dict() for shard, progress in shards.items()},
+        })
+        self.saves += 1
+        self.mark(games)
+
+    @staticmethod
+    def shards(data: dict) -> Dict[int, ShardProgress]:
+        """The shard progress stored in a loaded checkpoint."""
+        return {int(shard): ShardProgress.from_dict(saved) for shard, saved in data["shards"].items()}
+
+    @staticmethod
+    def load_shard(path: str) -> Optional[ShardProgress]:
+        """A worker's own shard checkpoint, if it wrote one before the run stopped."""
+        if not os.path.exists(path):
+            return None
+        return next(iter(Checkpointer.shards(load_checkpoint(path)).values()), None)
@@ -0,0 +1,274 @@
+"""
+Coordinator/worker mode for spreading a run's games across machines.
+
+The coordinator splits the games into shards, each with its own seed from
+the master seed (as run_parallel does per worker), and hands them to
+workers that connect over TCP. Workers play their shards with
+parallel.run_shard and report the totals back. The protocol is line-delimited
+text with JSON payloads:
+
+    worker -> coordinator   HELLO <name>                  once, on connect
+    coordinator -> worker   CONFIG <json>                 players, board, fleet, heartbeat interval
+    coordinator -> worker   SHARD <shard> <games> <seed>  play these games
+    worker -> coordinator   BEAT <shard>                  every few seconds while playing
+    worker -> coordinator   DONE <shard> <json>           the shard's wins, turns and turn counts
+    coordinator -> worker   BYE                           every shard is done
+
+A worker that disconnects or goes silent for longer than the lease loses its
+shard, which goes back to the queue for the next free worker. A shard's
+games depend only on its seed, so a re-issued shard plays the same games
+and the merged totals match a run of the same shards with -w.
+
+    python main.py --headless -n 100000 -s 1 --coordinate 0.0.0.0:7000 --shards 64
+    python distributed.py coordinator-host:7000           # on each worker machine
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from bitboard import BitBoard
+from board import Board, Fleet
+from checkpoint import ShardProgress
+from parallel import ShardJob, run_shard, split_iterations
+from player import Engine, RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer, TablePlayer
+from seeding import derive_seeds
+
+PLAYER_CLASSES = {cls.__name__: cls for cls in (RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer,
+                                                TablePlayer)}
+BOARD_CLASSES = {cls.__name__: cls for cls in (Board, BitBoard)}
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def histogram_percentile(counts: Dict[int, int], pct: float) -> int:
+    """Nearest-rank percentile of the values counted in a histogram."""
+    total = sum(counts.values())
+    rank = max(1, -(-total * pct // 100))
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= rank:
+            return value
+    return 0
+
+class Coordinator:
+    """
+    Serves shards of one run to workers and merges their results.
+    local_workers worker processes are started on this machine once the
+    coordinator is listening; port 0 picks a free port.
+    """
+
+    def __init__(self, address: str, shards: int, lease: float = 30.0, local_workers: int = 0):
+        self.host, self.port = parse_address(address)
+        self.shards = shards
+        self.lease = lease
+        self.local_workers = local_workers
+        self.workers = 0
+        self.reissued = 0
+        self._config: dict = {}
+        self._specs: List[Tuple[int, int]] = []
+        self._pending: Deque[int] = deque()
+        self._done: Dict[int, dict] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._connections = 0
+
+    def run(self, p1_class, p2_class, iterations: int, seed: Optional[int] = None,
+            size: Optional[int] = None, fleet: Optional[Fleet] = None, engine: Engine = Engine()) -> dict:
+        """Plays the run on whatever workers connect and returns the merged totals."""
+        self._config = {
+            "p1": p1_class.__name__,
+            "p2": p2_class.__name__,
+            "size": size,
+            "fleet": fleet,
+            "board": engine.board_class.__name__,
+            "policy": engine.policy_path,
+            # Several heartbeats per lease, so one late beat does not cost a shard
+            "beat": self.lease / 3,
+        }
+        self._specs = list(zip(split_iterations(iterations, self.shards), derive_seeds(seed, self.shards)))
+        self._pending = deque(range(self.shards))
+        self._done = {}
+        return asyncio.run(self._run())
+
+    async def _run(self) -> dict:
+        self._changed = asyncio.Condition()
+        server = await asyncio.start_server(self._serve_worker, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"Coordinator listening on {self.host}:{self.port} ({self.shards} shards)")
+        processes = [await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), f"{self.host}:{self.port}", "--name", f"local-{i}")
+            for i in range(self.local_workers)]
+
+        async with server:
+            async with self._changed:
+                while len(self._done) < self.shards:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), 1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    if (processes and self._connections == 0 and len(self._done) < self.shards
+                            and all(process.returncode is not None for process in processes)):
+                        raise RuntimeError("Every local worker exited with shards still outstanding.")
+        for process in processes:
+            try:
+                await asyncio.wait_for(process.wait(), self.lease)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+        results = [self._done[shard] for shard in range(self.shards)]
+        turn_counts: Dict[int, int] = {}
+        for result in results:
+            for turns, count in result["turn_counts"].items():
+                turn_counts[int(turns)] = turn_counts.get(int(turns), 0) + count
+        return {
+            "iterations": sum(r["games"] for r in results),
+            "p1_wins": sum(r["p1_wins"] for r in results),
+            "p2_wins": sum(r["p2_wins"] for r in results),
+            "total_turns": sum(r["total_turns"] for r in results),
+            "worker_time": sum(r["elapsed"] for r in results),
+            "turn_counts": turn_counts,
+        }
+
+    async def _next_shard(self) -> Optional[int]:
+        """The next shard to hand out, waiting while others are still in play; None once all are done."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._pending or len(self._done) == self.shards)
+            return self._pending.popleft() if self._pending else None
+
+    async def _serve_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        shard = None
+        self._connections += 1
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.lease)
+            parts = line.decode().split(maxsplit=1)
+            if len(parts) != 2 or parts[0] != "HELLO":
+                return
+            self.workers += 1
+            writer.write(f"CONFIG {json.dumps(self._config)}\n".encode())
+            while True:
+                shard = await self._next_shard()
+                if shard is None:
+                    writer.write(b"BYE\n")
+                    await writer.drain()
+                    return
+                games, seed = self._specs[shard]
+                writer.write(f"SHARD {shard} {games} {seed}\n".encode())
+                await writer.drain()
+                while True:
+                    # Silence longer than the lease counts as a dead worker
+                    line = await asyncio.wait_for(reader.readline(), self.lease)
+                    parts = line.decode().split(maxsplit=2)
+                    if not parts or parts[1:2] != [str(shard)]:
+                        raise ConnectionError(f"Unexpected reply {line!r}")
+                    if parts[0] == "DONE" and len(parts) == 3:
+                        result = json.loads(parts[2])
+                        if result["games"] != games:
+                            raise ConnectionError(f"Shard {shard} came back with {result['games']} of {games} games")
+                        break
+                    if parts[0] != "BEAT":
+                        raise ConnectionError(f"Unexpected reply {line!r}")
+                async with self._changed:
+                    # A re-issued shard can finish twice; both copies played the same games
+                    self._done.setdefault(shard, result)
+                    shard = None
+                    self._changed.notify_all()
+        except (asyncio.TimeoutError, ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            self._connections -= 1
+            if shard is not None:
+                async with self._changed:
+                    if shard not in self._done:
+                        self.reissued += 1
+                        self._pending.append(shard)
+                    self._changed.notify_all()
+            writer.close()
+
+def run_worker(address: str, name: str, retry_seconds: float = 30.0, crash_after: int = 0):
+    """
+    Connects to a coordinator and plays shards until it says BYE. Retries the
+    connection for retry_seconds, so workers can be started before the coordinator.
+    crash_after > 0 exits abruptly after that many games, to exercise re-issue.
+    """
+    deadline = time.monotonic() + retry_seconds
+    while True:
+        try:
+            sock = socket.create_connection(parse_address(address))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+    stream = sock.makefile("rwb")
+    lock = threading.Lock()
+
+    def send(line: str):
+        with lock:
+            stream.write(line.encode() + b"\n")
+            stream.flush()
+
+    send(f"HELLO {name}")
+    command, _, payload = stream.readline().decode().partition(" ")
+    if command != "CONFIG":
+        raise ConnectionError(f"Expected CONFIG from the coordinator, got {command!r}")
+    config = json.loads(payload)
+    p1_class, p2_class = PLAYER_CLASSES[config["p1"]], PLAYER_CLASSES[config["p2"]]
+    engine = Engine(BOARD_CLASSES[config["board"]], policy_path=config["policy"])
+    fleet = [tuple(ship) for ship in config["fleet"]] if config["fleet"] else None
+    played = 0
+
+    while True:
+        parts = stream.readline().decode().split()
+        if not parts or parts[0] == "BYE":
+            break
+        shard, games, seed = (int(part) for part in parts[1:4])
+        if crash_after and played + games >= crash_after:
+            games = crash_after - played
+
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(config["beat"]):
+                try:
+                    send(f"BEAT {shard}")
+                except OSError:
+                    return
+
+        beater = threading.Thread(target=beat, daemon=True)
+        beater.start()
+        job = ShardJob(p1_class, p2_class, games, ShardProgress(shard, seed), engine, config["size"], fleet)
+        try:
+            progress = run_shard(job)["progress"]
+        finally:
+            stop.set()
+            beater.join()
+        played += progress.games
+        if crash_after and played >= crash_after:
+            print(f"{name}: exiting after {played} games (--crash-after)", file=sys.stderr)
+            os._exit(1)
+        result = progress.to_dict()
+        del result["seed_state"]
+        send(f"DONE {shard} {json.dumps(result, separators=(',', ':'))}")
+    stream.close()
+    sock.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play shards for a coordinator started with main.py --coordinate")
+    parser.add_argument("address", help="Coordinator HOST:PORT")
+    parser.add_argument("--name", default=socket.gethostname(), help="Worker name reported to the coordinator")
+    parser.add_argument("--retry", type=float, default=30.0, help="Seconds to keep retrying the connection")
+    parser.add_argument("--crash-after", type=int, default=0, metavar="GAMES", help="Exit abruptly after this many games (tests shard re-issue)")
+    args = parser.parse_args()
+    try:
+        run_worker(args.address, args.name, args.retry, args.crash_after)
+    except OSError as e:
+        # The coordinator re-issues whatever this worker was playing
+        sys.exit(f"{args.name}: lost the coordinator ({e})")
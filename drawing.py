@@ -0,0 +1,81 @@
+"""
+Canvas drawing shared by the Tk visualizer and the headless renderer. Only
+the create_* calls of a tkinter Canvas are used, so anything with the same
+methods (render.RasterCanvas) can be drawn on.
+"""
+from enums import CellState
+
+def cell_style(cell, ship):
+    """Fill color and marker ("oval", "cross" or None) for one cell."""
+    if cell == CellState.MISS:
+        return "white", "oval"
+    if cell == CellState.SHIP:
+        return "gray", None
+    if cell == CellState.HIT:
+        # Check if the ship at this location is sunk
+        if ship is not None and ship.is_sunk:
+            return "#d32f2f", "cross" # Red (Sunk)
+        return "orange", "cross" # Hit
+    return "lightblue", None # Empty/Water
+
+# Boards are scaled to fit this many pixels, up to 30 pixels per cell (a 10x10 board)
+BOARD_PIXELS = 300
+
+def cell_size_for(size: int) -> int:
+    return max(2, min(30, BOARD_PIXELS // size))
+
+# Gap around and between the two boards, in pixels
+PADDING = 70
+
+def window_size(size: int, padding: int = PADDING):
+    """Width and height of the two-board scene for size x size boards."""
+    board_pixel_size = size * cell_size_for(size)
+    return padding * 3 + board_pixel_size * 2, padding * 2 + board_pixel_size + 80
+
+def draw_cell(canvas, x0, y0, cell_size, fill_color, marker):
+    x1 = x0 + cell_size
+    y1 = y0 + cell_size
+    inset = cell_size // 3
+    canvas.create_rectangle(x0, y0, x1, y1, fill=fill_color, outline="black")
+
+    # Draw simple markers for clarity
+    if marker == "oval":
+        canvas.create_oval(x0 + inset, y0 + inset, x1 - inset, y1 - inset, outline="black")
+    elif marker == "cross":
+        canvas.create_line(x0, y0, x1, y1, fill="black")
+        canvas.create_line(x0, y1, x1, y0, fill="black")
+
+def draw_board(canvas, board, offset_x, offset_y, cell_size, player_name):
+    size = board.size
+    # Draw Player Name
+    canvas.create_text(offset_x + (size * cell_size) / 2, offset_y - 20,
+                       text=player_name, font=("Arial", 14, "bold"))
+
+    grid = board.grid
+    ship_map = board.ship_map
+    for y in range(size):
+        for x in range(size):
+            fill_color, marker = cell_style(grid[y][x], ship_map.get((x, y)))
+            draw_cell(canvas, offset_x + x * cell_size, offset_y + y * cell_size, cell_size, fill_color, marker)
+
+def draw_legend(canvas, x, y, size):
+    items = [
+        ("Water", "lightblue", None),
+        ("Ship", "gray", None),
+        ("Miss", "white", "oval"),
+        ("Hit", "orange", "cross"),
+        ("Sunk", "#d32f2f", "cross")
+    ]
+    
+    canvas.create_text(x, y, text="Legend:", font=("Arial", 12, "bold"), anchor="w")
+    
+    start_x = x + 70
+    for label, color, marker in items:
+        canvas.create_rectangle(start_x, y - 10, start_x + size, y - 10 + size, fill=color, outline="black")
+        if marker == "oval":
+            canvas.create_oval(start_x + 4, y - 10 + 4, start_x + size - 4, y - 10 + size - 4, outline="black")
+        elif marker == "cross":
+            canvas.create_line(start_x, y - 10, start_x + size, y - 10 + size, fill="black")
+            canvas.create_line(start_x, y - 10 + size, start_x + size, y - 10, fill="black")
+        canvas.create_text(start_x + size + 5, y, text=label, anchor="w")
+        start_x += 90
@@ -1,40 +1,112 @@
+import gc
+from contextlib import contextmanager
 from player import Player
 from enums import ShotResult
+from results import GameRecord
+from seeding import spawn_rngs
+from typing import List, Optional, Tuple
+
+@contextmanager
+def paused_gc(enabled: bool = True):
+    """
+    Suspends the cyclic garbage collector for a block of games.
+    Game state holds no reference cycles, so reference counting alone frees
+    it; one full collection runs when the block ends.
+    """
+    if not enabled or not gc.isenabled():
+        yield
+        return
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+        gc.collect()
 
 class Game:
-    def __init__(self, player1: Player, player2: Player):
+    def __init__(self, player1: Player, player2: Player, seed: Optional[int] = None, record_moves: bool = False):
+        if (player1.size, player1.fleet) != (player2.size, player2.fleet):
+            raise ValueError("Both players must use the same board size and fleet.")
         self.p1 = player1
         self.p2 = player2
+        self.size = player1.size
         self.turn_count = 0
+        # With a seed, each player (and its board) gets its own stream derived from it
+        self.seed = seed
+        if seed is not None:
+            rng1, rng2 = spawn_rngs(seed, 2)
+            self.p1.set_rng(rng1)
+            self.p2.set_rng(rng2)
+        self.record = None
+        # (x, y, result) per turn, kept only when recording for replay.MoveLog
+        self.moves: Optional[List[Tuple[int, int, ShotResult]]] = [] if record_moves else None
 
-    def play(self, observer=None) -> Player:
+    def play(self, observer=None, sink=None, profiler=None) -> Player:
         """
         Runs the game loop until a winner is decided.
-        Returns the winning Player object.
+        Returns the winning Player object; the per-game GameRecord is kept
+        on self.record and also written to sink, if one is given.
+        A profiling.PhaseProfiler, if given, times each phase of every turn.
         """
+        if profiler is not None:
+            observer = profiler.instrument(self, observer)
+
         self.p1.setup_board()
         self.p2.setup_board()
 
-        current = self.p1
-        opponent = self.p2
+        players = (self.p1, self.p2)
+        # The board each side fires at
+        targets = (self.p2.board, self.p1.board)
+        moves = self.moves
+        side = 0
+        turn = 0
+        hits = [0, 0]
+        misses = [0, 0]
+        sink_shots = ([], [])
 
         while True:
-            self.turn_count += 1
-            
+            turn += 1
+            self.turn_count = turn
+            current = players[side]
+            target = targets[side]
+
             # Get shot coordinates from current player
             x, y = current.get_shot()
-            
+
             # Process shot on opponent's board
-            result = opponent.board.receive_shot(x, y)
-            
+            result = target.receive_shot(x, y)
+
             # Inform current player of the result (to update strategy)
             current.inform_result(x, y, result)
 
-            if observer:
-                observer(self.p1, self.p2, self.turn_count)
+            if moves is not None:
+                moves.append((x, y, result))
+
+            if result is ShotResult.MISS:
+                misses[side] += 1
+            elif result is ShotResult.HIT:
+                hits[side] += 1
+            elif result is ShotResult.SUNK:
+                hits[side] += 1
+                # Shots this player has taken so far (player 1 fires on odd turns)
+                sink_shots[side].append((turn + 1 - side) // 2)
+
+            if observer is not None:
+                observer(self.p1, self.p2, turn)
+
+            # Only a sinking shot can end the game, and the board's counter makes the check O(1)
+            if result is ShotResult.SUNK and not target.remaining:
+                break
 
-            if opponent.board.all_ships_sunk():
-                return current
+            side ^= 1
 
-            # Swap turns
-            current, opponent = opponent, current
\ No newline at end of file
+        self.record = GameRecord(
+            self.seed, side + 1, turn,
+            hits[0], misses[0], hits[1], misses[1],
+            tuple(sink_shots[0]), tuple(sink_shots[1]),
+        )
+        if sink is not None:
+            sink.write(self.record)
+        if profiler is not None:
+            profiler.finish(self)
+        return current
@@ -1,45 +1,154 @@
-from player import RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore
-from game import Game
-from visualizer import show_game_state, InteractiveVisualizer, get_player_selection
-import argparse
 import time
+# Taken before any other import so startup cost can be reported
+STARTUP_T0 = time.perf_counter()
+
+from player import Engine, RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer, TablePlayer
+from bitboard import BitBoard
+from board import Board, parse_fleet
+from checkpoint import Checkpointer, ShardProgress, config_mismatches, load_checkpoint
+from placements import LayoutPool
+from policy import PolicyTable
+from game import Game, paused_gc
+from seeding import derive_seeds
+from profiling import PhaseProfiler
+from replay import MoveLog, MoveLogWriter
+from results import open_sink
+from transposition import TranspositionCache
+import os
+import argparse
 
-def run_simulation(p1_class, p2_class, iterations=1, visualize=False):
-    p1_wins = 0
-    p2_wins = 0
-    total_turns = 0
+# visualizer (tkinter) and parallel (multiprocessing) are imported only by the modes
+# that use them, so headless runs skip their import and Tk start-up cost entirely.
+
+def run_simulation(p1_class, p2_class, iterations=1, visualize=False, workers=1, seed=None, batch=False,
+                   results=None, moves=None, profile=False, profile_out=None, final_window=True, gc_paused=False,
+                   size=None, fleet=None, checkpoint=None, resume=None, coordinator=None, engine=Engine()):
 
     print(f"Starting simulation: {p1_class.__name__} vs {p2_class.__name__}")
     print(f"Iterations: {iterations}")
+    if size or fleet:
+        fleet_text = ", ".join(f"{name} ({length})" for name, length in (fleet or Board.FLEET))
+        print(f"Board: {size or Board.SIZE}x{size or Board.SIZE}, fleet: {fleet_text}")
 
     start_time = time.time()
 
+    if batch:
+        # NumPy is only needed for this mode, so import it on demand
+        from batch import run_batch
+        if visualize:
+            print("Play-by-play visualization is not available in batch mode.")
+        summary = run_batch(p1_class, p2_class, iterations, seed=seed, size=size, fleet=fleet)
+        elapsed = time.time() - start_time
+        print_summary(p1_class, p2_class, iterations, summary["p1_wins"], summary["p2_wins"],
+                      summary["total_turns"], elapsed)
+        return
+
+    if coordinator:
+        if visualize:
+            print("Play-by-play visualization is not available in coordinator mode.")
+        summary = coordinator.run(p1_class, p2_class, iterations, seed, size, fleet, engine)
+        elapsed = time.time() - start_time
+        print_summary(p1_class, p2_class, iterations, summary["p1_wins"], summary["p2_wins"], summary["total_turns"],
+                      elapsed, worker_time=summary["worker_time"], workers=coordinator.workers)
+        print_turn_counts(summary["turn_counts"])
+        print(f"Shards: {coordinator.shards} ({coordinator.reissued} re-issued after a worker was lost)")
+        print("-" * 30)
+        return
+
+    if workers > 1:
+        from parallel import run_parallel
+        if visualize:
+            print("Play-by-play visualization is not available with multiple workers.")
+        print(f"Workers: {workers}")
+        summary = run_parallel(p1_class, p2_class, iterations, workers, seed, results=results, moves=moves,
+                               profile=profile or bool(profile_out), gc_paused=gc_paused, size=size, fleet=fleet,
+                               checkpoint=checkpoint, resume=resume, engine=engine)
+        elapsed = time.time() - start_time
+        print_summary(p1_class, p2_class, iterations, summary["p1_wins"], summary["p2_wins"], summary["total_turns"],
+                      elapsed, worker_time=summary["worker_time"], workers=workers)
+        if summary["profiler"]:
+            print_profile(summary["profiler"], profile_out)
+        print_transposition(engine)
+        print_checkpoint(checkpoint)
+        if results:
+            print(f"Wrote game records to one file per worker alongside {results}")
+        if moves:
+            print(f"Wrote move logs to one file per worker alongside {moves}")
+
+        if final_window and summary["last_game"]:
+            show_final_state(*summary["last_game"])
+        return
+
+    # Same derivation as a single-shard parallel run, so -w 1 matches serial
+    progress = Checkpointer.shards(resume)[0] if resume else ShardProgress(0, derive_seeds(seed, 1)[0])
+    if progress.games:
+        print(f"Resuming after game {progress.games}")
+    seeds = progress.seeds
+    sink = open_sink(results, len(fleet or Board.FLEET)) if results else None
+    move_writer = MoveLogWriter(moves) if moves else None
+    profiler = PhaseProfiler() if profile or profile_out else None
+
     vis = None
     if visualize:
-        vis = InteractiveVisualizer()
-
-    for i in range(iterations):
-        # Instantiate fresh players for every game
-        p1 = p1_class(p1_class.__name__)
-        p2 = p2_class(p2_class.__name__)
-        
-        game = Game(p1, p2)
-        observer = (lambda p1, p2, turn: vis.update(p1, p2, i + 1, turn)) if vis else None
-        winner = game.play(observer=observer)
-        
-        if vis:
-            vis.show_round_result(p1, p2, i + 1, winner.name)
-        
-        total_turns += game.turn_count
-        if winner == p1:
-            p1_wins += 1
-        else:
-            p2_wins += 1
+        from visualizer import InteractiveVisualizer
+        vis = InteractiveVisualizer(size or Board.SIZE)
+
+    # The same two players play every game; reset() clears their per-game state
+    p1 = p1_class(p1_class.__name__, size=size, fleet=fleet, engine=engine)
+    p2 = p2_class(p2_class.__name__, size=size, fleet=fleet, engine=engine)
+    winner = None
+    if checkpoint:
+        checkpoint.save({0: progress}, progress.games)
 
+    with paused_gc(gc_paused):
+        while progress.games < iterations:
+            i = progress.games
+            game_seed = next(seeds)
+            if winner is not None:
+                p1.reset()
+                p2.reset()
+
+            game = Game(p1, p2, seed=game_seed, record_moves=move_writer is not None)
+            observer = (lambda p1, p2, turn: vis.update(p1, p2, i + 1, turn)) if vis else None
+            winner = game.play(observer=observer, sink=sink, profiler=profiler)
+            if move_writer:
+                move_writer.write(MoveLog.from_game(game))
+
+            if vis:
+                vis.show_round_result(p1, p2, i + 1, winner.name)
+
+            progress.record(winner == p1, game.turn_count)
+            if checkpoint and checkpoint.due(progress.games):
+                checkpoint.save({0: progress}, progress.games)
+
+    if checkpoint:
+        checkpoint.save({0: progress}, progress.games, complete=True)
     if vis:
         vis.close()
 
+    if sink:
+        sink.close()
+        print(f"Wrote {sink.count} game records to {results}")
+    if move_writer:
+        move_writer.close()
+        print(f"Wrote {move_writer.count} move logs to {moves}")
+
     elapsed = time.time() - start_time
+    print_summary(p1_class, p2_class, iterations, progress.p1_wins, progress.p2_wins, progress.total_turns, elapsed)
+    if profiler:
+        print_profile(profiler, profile_out)
+    print_transposition(engine)
+    print_checkpoint(checkpoint)
+    
+    if final_window and winner is not None:
+        show_final_state(p1, p2, winner.name)
+
+def show_final_state(p1, p2, winner_name):
+    from visualizer import show_game_state
+    print("Displaying final game state...")
+    show_game_state(p1, p2, winner_name)
+
+def print_summary(p1_class, p2_class, iterations, p1_wins, p2_wins, total_turns, elapsed, worker_time=None, workers=1):
     avg_turns = total_turns / iterations
 
     print("-" * 30)
@@ -47,29 +156,194 @@ def run_simulation(p1_class, p2_class, iterations=1, visualize=False):
     print(f"{p1_class.__name__} Wins: {p1_wins} ({p1_wins/iterations:.1%})")
     print(f"{p2_class.__name__} Wins: {p2_wins} ({p2_wins/iterations:.1%})")
     print(f"Average Turns per Game: {avg_turns:.1f}")
+    if worker_time is not None:
+        print(f"Worker Time: {worker_time:.2f}s across {workers} workers ({worker_time / elapsed:.1f}x wall clock)")
     print("-" * 30)
-    
-    if iterations > 0:
-        print("Displaying final game state...")
-        show_game_state(p1, p2, winner.name)
+
+def print_turn_counts(turn_counts):
+    from distributed import histogram_percentile
+    points = "  ".join(f"p{pct} {histogram_percentile(turn_counts, pct)}" for pct in (10, 50, 90, 99))
+    print(f"Turns per Game: min {min(turn_counts)}  {points}  max {max(turn_counts)}")
+
+def print_profile(profiler, profile_out=None):
+    for line in profiler.summary_lines():
+        print(line)
+    if profile_out:
+        profiler.export_folded(profile_out)
+        print(f"Wrote folded stacks to {profile_out}")
+    print("-" * 30)
+
+def print_transposition(engine):
+    if engine.transposition_cache is not None:
+        print(engine.transposition_cache.summary())
+        print("-" * 30)
+
+def print_checkpoint(checkpoint):
+    if checkpoint:
+        print(f"Checkpoint: {checkpoint.path} ({checkpoint.saves} saves)")
+        print("-" * 30)
+
+PLAYER_CLASSES = {cls.__name__: cls for cls in (RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer,
+                                                TablePlayer)}
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run Battleship simulation")
     parser.add_argument("-n", "--iterations", type=int, default=1000, help="Number of iterations to run")
-    parser.add_argument("-v", "--visualize", default=True, action="store_true", help="Visual play-by-play (press space to advance)")
+    parser.add_argument("-v", "--visualize", default=True, action=argparse.BooleanOptionalAction, help="Visual play-by-play (press space to advance)")
+    parser.add_argument("--final-window", default=True, action=argparse.BooleanOptionalAction, help="Show the final game state in a window at the end")
+    parser.add_argument("--headless", action="store_true", help="No windows at all: implies --no-visualize and --no-final-window")
+    parser.add_argument("--p1", choices=sorted(PLAYER_CLASSES), default=HuntTargetPlayer.__name__, help="Player 1 strategy when not selecting interactively")
+    parser.add_argument("--p2", choices=sorted(PLAYER_CLASSES), default=HuntTargetPlayerMore.__name__, help="Player 2 strategy when not selecting interactively")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes to shard games across")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Master seed; results are reproducible for a given seed and worker count")
+    parser.add_argument("--batch", action="store_true", help="Play all games in lockstep with the NumPy batch simulator")
+    parser.add_argument("--bitboard", action="store_true", help="Use the bitmask-backed board engine")
+    parser.add_argument("-r", "--results", default=None, help="Stream per-game records to this path (.jsonl, .csv, or a columnar directory)")
+    parser.add_argument("--record-moves", default=None, help="Record a compact move log of every game to this file (replay with replay.py)")
+    parser.add_argument("--profile", action="store_true", help="Time each phase of Game.play per player class and print a breakdown")
+    parser.add_argument("--profile-out", default=None, help="Also write the phase profile as flamegraph folded stacks to this file")
+    parser.add_argument("--layout-pool", type=int, default=0, help="Pre-generate this many fleet layouts and share them across games")
+    parser.add_argument("--layouts", default=None, help="Load the layout pool from this file (or save it there with --layout-pool)")
+    parser.add_argument("--transposition", type=int, default=0, metavar="SHOTS", help="Cache hunt decisions for states with up to this many shots fired (0 disables)")
+    parser.add_argument("--opening-book", default=None, help="Pre-load the transposition cache from this file, and save it back after a serial run")
+    parser.add_argument("--size", type=int, default=None, help=f"Board width and height (default {Board.SIZE})")
+    parser.add_argument("--fleet", type=parse_fleet, default=None, help='Ship lengths, optionally named: "5,4,3,3,2" or "Carrier:5,Destroyer:2"')
+    parser.add_argument("--checkpoint", default=None, help="Periodically save run progress to this file")
+    parser.add_argument("--checkpoint-every", type=int, default=0, metavar="GAMES", help="Checkpoint at least every this many games")
+    parser.add_argument("--checkpoint-seconds", type=float, default=60.0, metavar="SECONDS", help="Checkpoint at least every this many seconds of wall time (0 disables)")
+    parser.add_argument("--resume", action="store_true", help="Continue the run saved in --checkpoint")
+    parser.add_argument("--policy", default=None, help="Policy table for TablePlayer, written by solver.py")
+    parser.add_argument("--coordinate", default=None, metavar="HOST:PORT", help="Serve the run's shards to workers (distributed.py) connecting here")
+    parser.add_argument("--shards", type=int, default=16, help="Shards to split a --coordinate run into")
+    parser.add_argument("--local-workers", type=int, default=0, help="Start this many workers on this machine for --coordinate")
+    parser.add_argument("--lease", type=float, default=30.0, metavar="SECONDS", help="Re-issue a shard whose worker is silent this long")
+    parser.add_argument("--no-gc", action="store_true", help="Pause the cyclic garbage collector while games run")
+    parser.add_argument("--tournament", action="store_true", help="Rank every strategy in an adaptive round-robin (see tournament.py) instead of one matchup")
     args = parser.parse_args()
+    if args.headless:
+        args.visualize = False
+        args.final_window = False
+
+    if args.tournament:
+        if args.size or args.fleet:
+            parser.error("--tournament plays on the standard board and fleet.")
+        from tournament import run_tournament
+        run_tournament(seed=args.seed)
+        parser.exit()
+
+    size = args.size or Board.SIZE
+    lengths = [length for _, length in (args.fleet or Board.FLEET)]
+    if size < 1 or max(lengths) > size:
+        parser.error(f"Every ship must fit on a {size}x{size} board.")
+    if args.record_moves and size * size > 256:
+        parser.error("--record-moves supports boards up to 16x16.")
+
+    if args.resume:
+        if not args.checkpoint:
+            parser.error("--resume needs the run's --checkpoint file.")
+        if args.batch or args.results or args.record_moves:
+            parser.error("--resume cannot continue --batch runs or --results/--record-moves streams.")
+        if args.layout_pool and not args.layouts:
+            parser.error("--resume with --layout-pool needs the pool saved with --layouts.")
+        if args.layout_pool:
+            # Load the saved pool rather than generating a different one
+            args.layout_pool = 0
+    elif args.checkpoint and args.batch:
+        parser.error("--checkpoint is not supported with --batch.")
 
-    p1_class = HuntTargetPlayer
-    p2_class = HuntTargetPlayerMore
+    if args.coordinate:
+        if args.batch or args.workers > 1 or args.checkpoint:
+            parser.error("--coordinate cannot be combined with --batch, --workers or --checkpoint.")
+        if args.results or args.record_moves or args.profile or args.profile_out:
+            parser.error("--coordinate does not collect --results, --record-moves or profiles from workers.")
+        if args.layout_pool or args.layouts or args.transposition or args.opening_book:
+            parser.error("--coordinate workers do not share layout pools or transposition caches.")
+        if args.shards < 1:
+            parser.error("--shards must be at least 1.")
+
+    layout_pool = None
+    if args.layout_pool:
+        layout_pool = LayoutPool.generate(size, lengths, args.layout_pool)
+        if args.layouts:
+            layout_pool.save(args.layouts)
+    elif args.layouts:
+        layout_pool = LayoutPool.load(args.layouts)
+        if layout_pool.size != size or list(layout_pool.lengths) != lengths:
+            parser.error(f"{args.layouts} was generated for a different board size or fleet.")
+
+    transposition_cache = None
+    if args.transposition or args.opening_book:
+        transposition_cache = TranspositionCache(max_shots=args.transposition or 8)
+        if args.opening_book and os.path.exists(args.opening_book):
+            transposition_cache.load(args.opening_book)
+
+    p1_class = PLAYER_CLASSES[args.p1]
+    p2_class = PLAYER_CLASSES[args.p2]
+    if TablePlayer in (p1_class, p2_class):
+        if not args.policy:
+            parser.error("TablePlayer needs --policy (a table written by solver.py).")
+        table = PolicyTable.load(args.policy)
+        if table.size != size or sorted(table.lengths) != sorted(lengths):
+            parser.error(f"{args.policy} was solved for a {table.size}x{table.size} board with ships "
+                         f"{','.join(map(str, table.lengths))}; pass matching --size and --fleet.")
+
+    engine = Engine(BitBoard if args.bitboard else Board, layout_pool, transposition_cache, args.policy)
 
     if args.visualize:
-        classes = [RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore]
+        from visualizer import get_player_selection
+        classes = [RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer]
         descriptions = {
             RandomPlayer: "Fires randomly at any valid coordinate.",
             HuntTargetPlayer: "Hunts by checking gaps for smallest ship. Targets neighbors upon hit.",
-            HuntTargetPlayerMore: "Hunts by maximizing distance from previous shots. Targets neighbors upon hit."
+            HuntTargetPlayerMore: "Hunts by maximizing distance from previous shots. Targets neighbors upon hit.",
+            ProbabilityDensityPlayer: "Fires where the most legal placements of unsunk ships overlap, favoring lines through hits."
         }
         p1_class, p2_class = get_player_selection(classes, descriptions)
 
+    if args.batch:
+        try:
+            from batch import BATCH_STRATEGIES
+        except ImportError:
+            parser.error("--batch needs numpy.")
+        unsupported = [cls.__name__ for cls in (p1_class, p2_class) if cls not in BATCH_STRATEGIES]
+        if unsupported:
+            supported = ", ".join(cls.__name__ for cls in BATCH_STRATEGIES)
+            parser.error(f"--batch has no vectorized {' or '.join(dict.fromkeys(unsupported))}; it supports {supported}.")
+
+    checkpoint = resume = None
+    if args.checkpoint:
+        # A resumed run needs every shard's seed, so checkpointed runs always have a master seed
+        if args.seed is None and not args.resume:
+            args.seed = derive_seeds(None, 1)[0]
+        if args.resume:
+            if not os.path.exists(args.checkpoint):
+                parser.error(f"No checkpoint at {args.checkpoint} to resume from.")
+            resume = load_checkpoint(args.checkpoint)
+            if args.seed is None:
+                args.seed = resume["config"]["seed"]
+        config = {"p1": p1_class.__name__, "p2": p2_class.__name__, "iterations": args.iterations,
+                  "workers": args.workers, "seed": args.seed, "size": size, "lengths": lengths,
+                  "layout_pool": len(layout_pool) if layout_pool else 0}
+        if resume:
+            mismatched = config_mismatches(resume["config"], config)
+            if mismatched:
+                parser.error(f"{args.checkpoint} was saved with different settings: {', '.join(mismatched)}")
+        checkpoint = Checkpointer(args.checkpoint, config, args.checkpoint_every, args.checkpoint_seconds)
+
+    coordinator = None
+    if args.coordinate:
+        from distributed import Coordinator
+        coordinator = Coordinator(args.coordinate, args.shards, args.lease, args.local_workers)
+
+    print(f"Startup Time: {(time.perf_counter() - STARTUP_T0) * 1000:.1f}ms")
+
     # Compare Random Strategy vs Hunt/Target Strategy
-    run_simulation(p1_class, p2_class, iterations=args.iterations, visualize=args.visualize)
\ No newline at end of file
+    run_simulation(p1_class, p2_class, iterations=args.iterations, visualize=args.visualize,
+                   workers=args.workers, seed=args.seed, batch=args.batch, results=args.results,
+                   moves=args.record_moves, profile=args.profile, profile_out=args.profile_out,
+                   final_window=args.final_window, gc_paused=args.no_gc, size=args.size, fleet=args.fleet,
+                   checkpoint=checkpoint, resume=resume, coordinator=coordinator, engine=engine)
+
+    if args.opening_book and args.workers == 1 and not args.batch:
+        transposition_cache.save(args.opening_book)
+        print(f"Saved {len(transposition_cache.entries)} opening book states to {args.opening_book}")
@@ -0,0 +1,159 @@
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool
+from typing import List, Optional
+from board import Board, Fleet
+from checkpoint import Checkpointer, ShardProgress
+from game import Game, paused_gc
+from player import Engine
+from profiling import PhaseProfiler
+from replay import MoveLog, MoveLogWriter
+from results import open_sink, shard_path
+from seeding import derive_seeds
+
+def split_iterations(iterations: int, shards: int) -> List[int]:
+    """Splits iterations into near-equal shard sizes (earlier shards get the remainder)."""
+    base, extra = divmod(iterations, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+@dataclass(frozen=True)
+class ShardJob:
+    """Settings for one shard of games, handed to run_shard in a worker process."""
+    p1_class: type
+    p2_class: type
+    # Games the shard plays in total, and its progress towards them so far
+    iterations: int
+    progress: ShardProgress
+    engine: Engine = Engine()
+    size: Optional[int] = None
+    fleet: Optional[Fleet] = None
+    results_path: Optional[str] = None
+    moves_path: Optional[str] = None
+    profile: bool = False
+    gc_paused: bool = False
+    checkpointer: Optional[Checkpointer] = None
+
+def run_shard(job: ShardJob) -> dict:
+    """
+    Plays one shard of games in the current process, continuing from its progress.
+    Every game gets its own seed from the shard's stream, so the shard is
+    reproducible from its seed alone. With a checkpointer, the shard's progress
+    is saved periodically and once more when it finishes.
+    """
+    progress, checkpointer, fleet = job.progress, job.checkpointer, job.fleet
+    transposition_cache = job.engine.transposition_cache
+    winner = None
+
+    sink = open_sink(job.results_path, len(fleet or Board.FLEET)) if job.results_path else None
+    move_writer = MoveLogWriter(job.moves_path) if job.moves_path else None
+    profiler = PhaseProfiler() if job.profile else None
+    seeds = progress.seeds
+    if checkpointer:
+        checkpointer.mark(progress.games)
+
+    start_time = time.time()
+    elapsed_before = progress.elapsed
+    # The same two players play every game; reset() clears their per-game state
+    p1 = job.p1_class(job.p1_class.__name__, size=job.size, fleet=fleet, engine=job.engine)
+    p2 = job.p2_class(job.p2_class.__name__, size=job.size, fleet=fleet, engine=job.engine)
+    with paused_gc(job.gc_paused):
+        while progress.games < job.iterations:
+            game_seed = next(seeds)
+            if winner is not None:
+                p1.reset()
+                p2.reset()
+
+            game = Game(p1, p2, seed=game_seed, record_moves=move_writer is not None)
+            winner = game.play(sink=sink, profiler=profiler)
+            if move_writer:
+                move_writer.write(MoveLog.from_game(game))
+
+            progress.record(winner == p1, game.turn_count)
+            if checkpointer and checkpointer.due(progress.games):
+                progress.elapsed = elapsed_before + time.time() - start_time
+                checkpointer.save({progress.shard: progress}, progress.games)
+
+    progress.elapsed = elapsed_before + time.time() - start_time
+    if checkpointer:
+        checkpointer.save({progress.shard: progress}, progress.games, complete=True)
+    if sink:
+        sink.close()
+    if move_writer:
+        move_writer.close()
+
+    return {
+        "progress": progress,
+        "profiler": profiler,
+        "transposition": ((transposition_cache.hits, transposition_cache.misses)
+                          if transposition_cache is not None else None),
+        # Final game of the shard, so the caller can still display an end state
+        "last_game": (p1, p2, winner.name) if winner else None,
+    }
+
+def run_parallel(p1_class, p2_class, iterations: int, workers: int, seed: Optional[int] = None,
+                 results: Optional[str] = None, moves: Optional[str] = None, profile: bool = False,
+                 gc_paused: bool = False, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+                 checkpoint: Optional[Checkpointer] = None, resume: Optional[dict] = None,
+                 engine: Engine = Engine()) -> dict:
+    """
+    Shards iterations across a process pool and merges the per-shard totals.
+    The result depends only on (seed, workers), not on scheduling order.
+    With results (or moves), each shard streams its game records (or move logs)
+    to its own shard_path file. Each worker gets its own copy of any transposition
+    cache; only the hit/miss counts are merged back into the parent's cache.
+
+    With a checkpoint, each worker checkpoints its own shard to a shard_path
+    file, and the run's file records every shard that has finished. resume is
+    that file, loaded: finished shards are skipped and the rest continue from
+    their own checkpoints.
+    """
+    sizes = split_iterations(iterations, workers)
+    seeds = derive_seeds(seed, workers)
+    done = Checkpointer.shards(resume) if resume else {}
+    jobs = []
+    for i, (n, s) in enumerate(zip(sizes, seeds)):
+        if i in done:
+            continue
+        shard_checkpoint = checkpoint.for_shard(i) if checkpoint else None
+        progress = Checkpointer.load_shard(shard_checkpoint.path) if resume else None
+        jobs.append(ShardJob(p1_class, p2_class, n, progress or ShardProgress(i, s), engine, size, fleet,
+                             shard_path(results, i) if results else None, shard_path(moves, i) if moves else None,
+                             profile, gc_paused, shard_checkpoint))
+
+    if checkpoint:
+        # Written up front so a run stopped before any shard finishes can still resume
+        checkpoint.save(done)
+
+    shards = []
+    with Pool(processes=workers) as pool:
+        # Record each shard as it finishes; the merge below sorts by shard id
+        for shard in pool.imap_unordered(run_shard, jobs):
+            shards.append(shard)
+            progress = shard["progress"]
+            done[progress.shard] = progress
+            if checkpoint:
+                checkpoint.save(done, complete=len(done) == workers)
+                os.remove(checkpoint.for_shard(progress.shard).path)
+    shards.sort(key=lambda shard: shard["progress"].shard)
+
+    last_game = None
+    profiler = PhaseProfiler() if profile else None
+    for shard in shards:
+        if shard["last_game"]:
+            last_game = shard["last_game"]
+        if profiler:
+            profiler.merge(shard["profiler"])
+        if shard["transposition"]:
+            engine.transposition_cache.merge_stats(*shard["transposition"])
+
+    totals = list(done.values())
+    return {
+        "iterations": sum(p.games for p in totals),
+        "p1_wins": sum(p.p1_wins for p in totals),
+        "p2_wins": sum(p.p2_wins for p in totals),
+        "total_turns": sum(p.total_turns for p in totals),
+        "worker_time": sum(p.elapsed for p in totals),
+        "last_game": last_game,
+        "profiler": profiler,
+    }
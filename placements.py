@@ -0,0 +1,157 @@
+import random
+import struct
+from bisect import bisect_right
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class PlacementTable:
+    """
+    Every legal placement of one ship length on an empty board.
+    Placements are bitmasks over cell indices (y * size + x); by_cell lists the
+    placements covering each cell so callers can prune them as cells are ruled out.
+    """
+
+    def __init__(self, size: int, length: int):
+        self.size = size
+        self.length = length
+        self.cells: List[Tuple[int, ...]] = []
+        self.origins: List[Tuple[int, int, bool]] = []
+        self.by_cell: List[List[int]] = [[] for _ in range(size * size)]
+
+        for y in range(size):
+            for x in range(size):
+                for horizontal in (True, False):
+                    if (x + length if horizontal else y + length) > size:
+                        continue
+                    step = 1 if horizontal else size
+                    cells = tuple(y * size + x + i * step for i in range(length))
+                    pid = len(self.cells)
+                    self.cells.append(cells)
+                    self.origins.append((x, y, horizontal))
+                    for c in cells:
+                        self.by_cell[c].append(pid)
+
+        # Lazily filled: placements of this table overlapping (other length, other pid)
+        self._conflicts: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._masks: Optional[List[int]] = None
+
+    @property
+    def masks(self) -> List[int]:
+        """Placement bitmasks, built on first use: on large boards each mask is a big int."""
+        if self._masks is None:
+            self._masks = [sum(1 << c for c in cells) for cells in self.cells]
+        return self._masks
+
+    def conflicts(self, other: "PlacementTable", pid: int) -> Tuple[int, ...]:
+        """Placements in this table that overlap placement pid of another table."""
+        key = (other.length, pid)
+        found = self._conflicts.get(key)
+        if found is None:
+            found = tuple(sorted({p for cell in other.cells[pid] for p in self.by_cell[cell]}))
+            self._conflicts[key] = found
+        return found
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+@lru_cache(maxsize=None)
+def placement_table(size: int, length: int) -> PlacementTable:
+    """Module-level cache: each (size, length) table is built once per process."""
+    return PlacementTable(size, length)
+
+def sample_layout(size: int, lengths: Sequence[int], rng=random) -> List[Tuple[int, int, bool]]:
+    """
+    Draws a full fleet layout, one draw per ship, as (x, y, horizontal) origins.
+
+    Each ship is drawn uniformly from the placements that do not overlap ships
+    already placed. Rejection sampling over random (x, y, orientation) accepts
+    every legal placement with equal probability, so the distribution is the same.
+    """
+    placed: List[Tuple[PlacementTable, int]] = []
+    layout = []
+    for length in lengths:
+        table = placement_table(size, length)
+        # Placements of this length already blocked by earlier ships, in pid order
+        if placed:
+            blocked = set()
+            for other, other_pid in placed:
+                blocked.update(table.conflicts(other, other_pid))
+            blocked = sorted(blocked)
+        else:
+            blocked = []
+        if len(blocked) == len(table):
+            raise RuntimeError(f"No legal placement left for a ship of length {length}.")
+
+        # Single draw over the legal placements, mapped to the pid that is the
+        # r-th unblocked one: the fixed point of pid = r + (blocked pids <= pid)
+        r = rng.randrange(len(table) - len(blocked))
+        pid = r
+        while True:
+            shifted = r + bisect_right(blocked, pid)
+            if shifted == pid:
+                break
+            pid = shifted
+
+        placed.append((table, pid))
+        layout.append(table.origins[pid])
+    return layout
+
+class LayoutPool:
+    """
+    Pre-generated fleet layouts shared across games, optionally saved to disk.
+
+    Layouts are stored as one 16-bit code per ship ((y * size + x) * 2 + horizontal)
+    so a pool of a million standard fleets takes about 10 MB.
+    """
+    MAGIC = b"BSLP"
+
+    def __init__(self, size: int, lengths: Sequence[int], codes: array):
+        self.size = size
+        self.lengths = tuple(lengths)
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.codes) // len(self.lengths)
+
+    @classmethod
+    def generate(cls, size: int, lengths: Sequence[int], count: int, rng=random) -> "LayoutPool":
+        codes = array("H")
+        for _ in range(count):
+            for x, y, horizontal in sample_layout(size, lengths, rng):
+                codes.append((y * size + x) * 2 + int(horizontal))
+        return cls(size, lengths, codes)
+
+    def draw(self, rng=random) -> List[Tuple[int, int, bool]]:
+        """A uniformly chosen layout from the pool."""
+        n = len(self.lengths)
+        start = rng.randrange(len(self)) * n
+        layout = []
+        for code in self.codes[start:start + n]:
+            cell, horizontal = divmod(code, 2)
+            layout.append((cell % self.size, cell // self.size, bool(horizontal)))
+        return layout
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(struct.pack("<4sHH", self.MAGIC, self.size, len(self.lengths)))
+            f.write(struct.pack(f"<{len(self.lengths)}H", *self.lengths))
+            codes = self.codes
+            if sys.byteorder != "little":
+                codes = array("H", codes)
+                codes.byteswap()
+            f.write(codes.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "LayoutPool":
+        with open(path, "rb") as f:
+            magic, size, n = struct.unpack("<4sHH", f.read(8))
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not a layout pool file.")
+            lengths = struct.unpack(f"<{n}H", f.read(2 * n))
+            codes = array("H")
+            codes.frombytes(f.read())
+        if sys.byteorder != "little":
+            codes.byteswap()
+        return cls(size, lengths, codes)
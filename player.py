@@ -1,14 +1,81 @@
 import random
+from array import array
 from abc import ABC, abstractmethod
-from typing import Tuple, Set, List, Optional
-from board import Board
+from dataclasses import dataclass
+from typing import Dict, Tuple, Set, List, Optional
+from board import Board, Fleet
+from candidates import FitIndex, DistanceField
+from placements import LayoutPool, placement_table
+from policy import PolicyTable
+from targeting import target_engine
+from transposition import TranspositionCache, zobrist_table
 from enums import ShotResult
 
+@dataclass(frozen=True)
+class Engine:
+    """
+    Engine choices for one run's players. They are handed to each player when it
+    is built instead of being set on the classes, so they travel with the
+    players into worker processes and never leak between runs.
+    """
+    # Board implementation (e.g. bitboard.BitBoard)
+    board_class: type = Board
+    # Pre-generated layouts every board draws its fleet from
+    layout_pool: Optional[LayoutPool] = None
+    # Shared hunt-decision cache; None disables it
+    transposition_cache: Optional[TranspositionCache] = None
+    # Policy file for TablePlayer, written by solver.py
+    policy_path: Optional[str] = None
+
 class Player(ABC):
-    def __init__(self, name: str):
+    # Per-game state is slotted; subclasses that declare no __slots__ get a __dict__ as usual
+    __slots__ = ("name", "rng", "size", "fleet", "board", "transposition_cache", "shots_fired", "remaining_lengths",
+                 "open_hits", "sunk_cells", "_fit_index", "_distance_field", "_zobrist_codes", "_zobrist")
+    # Whether tournaments and pickers should offer this class as a strategy
+    selectable = True
+
+    def __init__(self, name: str, rng=None, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+                 engine: Optional[Engine] = None):
+        engine = engine or Engine()
         self.name = name
-        self.board = Board()
-        self.shots_fired: Set[Tuple[int, int]] = set()
+        # RNG stream for placement and strategy; defaults to the process-wide random module
+        self.rng = rng if rng is not None else random
+        # Board size and fleet for both sides of the game; Board.SIZE / Board.FLEET by default
+        self.size = size or Board.SIZE
+        self.fleet = list(fleet or Board.FLEET)
+        self.board = engine.board_class(self.rng, self.size, self.fleet, engine.layout_pool)
+        # Hunt-decision cache shared by the run's players (transposition.TranspositionCache), or None
+        self.transposition_cache = engine.transposition_cache
+        # Cell indices (y * SIZE + x) fired at; small ints are shared, so no per-shot allocation
+        self.shots_fired: Set[int] = set()
+        # Opponent ships not yet sunk, and hit cells not yet attributed to a sunk ship (also indices)
+        self.remaining_lengths: List[int] = sorted(length for _, length in self.fleet)
+        self.open_hits: Set[int] = set()
+        self.sunk_cells: Set[int] = set()
+        self._fit_index: Optional[FitIndex] = None
+        self._distance_field: Optional[DistanceField] = None
+        # Zobrist hash of shots_fired, the hunt-mode state key
+        self._zobrist_codes = zobrist_table(self.size)
+        self._zobrist = 0
+
+    def reset(self):
+        """Clears all per-game state in place so the instance can play another game."""
+        self.board.reset()
+        self.shots_fired.clear()
+        self.remaining_lengths[:] = sorted(length for _, length in self.fleet)
+        self.open_hits.clear()
+        self.sunk_cells.clear()
+        self._fit_index = None
+        self._distance_field = None
+        self._zobrist = 0
+
+    def fired_coords(self) -> List[Tuple[int, int]]:
+        return [(cell % self.size, cell // self.size) for cell in self.shots_fired]
+
+    def set_rng(self, rng):
+        """Switches this player (and its board) to a new RNG stream."""
+        self.rng = rng
+        self.board.rng = rng
 
     def setup_board(self):
         """Strategies could override this to place ships intelligently."""
@@ -16,41 +83,117 @@ class Player(ABC):
 
     def random_probe(self) -> Tuple[int, int]:
         while True:
-            x = random.randint(0, Board.SIZE - 1)
-            y = random.randint(0, Board.SIZE - 1)
-            if (x, y) not in self.shots_fired:
+            x = self.rng.randint(0, self.size - 1)
+            y = self.rng.randint(0, self.size - 1)
+            if y * self.size + x not in self.shots_fired:
                 return x, y
 
+    def record_shot(self, x: int, y: int):
+        """Adds a shot to shots_fired, keeping any hunt index in sync."""
+        cell = y * self.size + x
+        if cell in self.shots_fired:
+            return
+        self.shots_fired.add(cell)
+        self._zobrist ^= self._zobrist_codes[cell]
+        if self._fit_index is not None:
+            self._fit_index.record(x, y)
+        if self._distance_field is not None:
+            self._distance_field.record(x, y)
+
+    def record_result(self, x: int, y: int, result: ShotResult):
+        """Tracks open hits and, on SUNK, removes the sunk ship's length from the fleet."""
+        if result == ShotResult.HIT:
+            self.open_hits.add(y * self.size + x)
+        elif result == ShotResult.SUNK:
+            cell = y * self.size + x
+            self.open_hits.add(cell)
+            self._resolve_sunk(cell)
+
+    def _resolve_sunk(self, cell: int):
+        # The result does not name the ship, so infer it from the longest line of
+        # open hits through the cell. Picking the largest remaining length that fits
+        # errs towards keeping short ships in the fleet, which only widens the hunt.
+        size = self.size
+        open_hits = self.open_hits
+        x, y = cell % size, cell // size
+        best_run = [cell]
+        # Along the row, then the column: the step and how many cells lie before and after
+        for step, before, after in ((1, x, size - 1 - x), (size, y, size - 1 - y)):
+            run = [cell]
+            for sign, limit in ((-step, before), (step, after)):
+                other = cell + sign
+                while limit and other in open_hits:
+                    run.append(other)
+                    other += sign
+                    limit -= 1
+            if len(run) > len(best_run):
+                best_run = run
+
+        fits = [length for length in self.remaining_lengths if length <= len(best_run)]
+        if not fits:
+            return
+        length = max(fits)
+        self.remaining_lengths.remove(length)
+
+        # Attribute the lowest-ordered segment of that length containing the cell
+        best_run.sort()
+        pos = best_run.index(cell)
+        start = max(0, pos - length + 1)
+        for sunk in best_run[start:start + length]:
+            open_hits.discard(sunk)
+            self.sunk_cells.add(sunk)
+
+    def target_probe(self) -> Optional[Tuple[int, int]]:
+        """Target Mode via the shared targeting.TargetEngine; None when no open hit needs finishing."""
+        if not self.open_hits:
+            return None
+        return target_engine(self.size).next_target(self.shots_fired, self.open_hits, self.remaining_lengths, self.rng)
+
+    def min_remaining_length(self) -> int:
+        if self.remaining_lengths:
+            return self.remaining_lengths[0]
+        return min(length for _, length in self.fleet)
+
+    def caching(self) -> bool:
+        """Whether hunt decisions for the current state go through the transposition cache."""
+        cache = self.transposition_cache
+        return cache is not None and len(self.shots_fired) <= cache.max_shots
+
+    def cached_probe(self, tag: int, min_len: int, compute) -> Optional[Tuple[int, int]]:
+        """
+        Draws from the hunt candidates for the current shots, via the transposition
+        cache when caching() holds. Returns None when there are no candidates.
+        """
+        if not self.caching():
+            candidates = compute()
+            return self.rng.choice(candidates) if candidates else None
+
+        cache = self.transposition_cache
+        key = (tag, self.size, min_len, len(self.shots_fired), self._zobrist)
+        cells = cache.get(key)
+        if cells is None:
+            cells = array("H", (y * self.size + x for x, y in compute()))
+            cache.put(key, cells)
+        if not cells:
+            return None
+        # Same list, same order, same rng.choice call as the uncached path
+        cell = self.rng.choice(cells)
+        return cell % self.size, cell // self.size
+
     def min_length_probe(self) -> Tuple[int, int]:
-        candidates = []
-        min_len = 2 # Smallest ship length
-        
-        for x in range(Board.SIZE):
-            for y in range(Board.SIZE):
-                if (x, y) in self.shots_fired:
-                    continue
-                
-                # Check Horizontal fit
-                h_fit = False
-                for start_x in range(max(0, x - min_len + 1), min(Board.SIZE - min_len + 1, x + 1)):
-                    if all((cx, y) not in self.shots_fired for cx in range(start_x, start_x + min_len)):
-                        h_fit = True
-                        break
-                
-                # Check Vertical fit
-                v_fit = False
-                if not h_fit:
-                    for start_y in range(max(0, y - min_len + 1), min(Board.SIZE - min_len + 1, y + 1)):
-                        if all((x, cy) not in self.shots_fired for cy in range(start_y, start_y + min_len)):
-                            v_fit = True
-                            break
-                
-                if h_fit or v_fit:
-                    candidates.append((x, y))
-        
-        if candidates:
-            return random.choice(candidates)
-        return self.random_probe()
+        min_len = self.min_remaining_length()
+        if self.caching():
+            shot = self.cached_probe(1, min_len, lambda: self._fit_index_for(min_len).ordered())
+        else:
+            # Same draw as rng.choice(ordered()), without sorting every candidate each turn
+            shot = self._fit_index_for(min_len).choice(self.rng)
+        return shot if shot is not None else self.random_probe()
+
+    def _fit_index_for(self, min_len: int) -> FitIndex:
+        # Rebuild only when the smallest remaining ship changes (at most once per sinking)
+        if self._fit_index is None or self._fit_index.k != min_len:
+            self._fit_index = FitIndex(self.size, min_len, self.fired_coords())
+        return self._fit_index
 
     @abstractmethod
     def get_shot(self) -> Tuple[int, int]:
@@ -63,9 +206,11 @@ class Player(ABC):
         pass
 
 class RandomPlayer(Player):
+    __slots__ = ()
+
     def get_shot(self) -> Tuple[int, int]:
         x, y = self.random_probe()
-        self.shots_fired.add((x, y))
+        self.record_shot(x, y)
         return x, y
 
     def inform_result(self, x: int, y: int, result: ShotResult):
@@ -74,121 +219,194 @@ class RandomPlayer(Player):
 
 class HuntTargetPlayer(Player):
     """
-    Hunt Mode: Fire randomly.
-    Target Mode: If a hit is recorded, add neighbors to a stack and fire at them.
+    Hunt Mode: Fire at gaps that fit the smallest remaining ship.
+    Target Mode: Finish open hits with the shared TargetEngine.
     """
-    def __init__(self, name: str):
-        super().__init__(name)
-        self.target_stack: List[Tuple[int, int]] = []
-        self.last_hit: Optional[Tuple[int, int]] = None
+    __slots__ = ()
 
     def get_shot(self) -> Tuple[int, int]:
-        # Target Mode
-        while self.target_stack:
-            x, y = self.target_stack.pop()
-            if (x, y) not in self.shots_fired:
-                self.shots_fired.add((x, y))
-                return x, y
-        
-        # Hunt Mode
-        x, y = self.min_length_probe()
-        self.shots_fired.add((x, y))
+        shot = self.target_probe()
+        if shot is None:
+            # Hunt Mode
+            shot = self.min_length_probe()
+        x, y = shot
+        self.record_shot(x, y)
         return x, y
 
     def inform_result(self, x: int, y: int, result: ShotResult):
-        if result == ShotResult.HIT:
-            if self.last_hit and (abs(x - self.last_hit[0]) + abs(y - self.last_hit[1]) == 1):
-                dx = x - self.last_hit[0]
-                dy = y - self.last_hit[1]
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < Board.SIZE and 0 <= ny < Board.SIZE:
-                    if (nx, ny) not in self.shots_fired:
-                        self.target_stack.append((nx, ny))
-            else:
-                self._add_neighbors(x, y)
-            self.last_hit = (x, y)
-        elif result == ShotResult.SUNK:
-            self.last_hit = None
-
-    def _add_neighbors(self, x: int, y: int):
-        neighbors = [
-            (x, y - 1), (x, y + 1),
-            (x - 1, y), (x + 1, y)
-        ]
-        for nx, ny in neighbors:
-            if 0 <= nx < Board.SIZE and 0 <= ny < Board.SIZE:
-                if (nx, ny) not in self.shots_fired:
-                    self.target_stack.append((nx, ny))
+        self.record_result(x, y, result)
 
 class HuntTargetPlayerMore(Player):
     """
-    Hunt Mode: Fire randomly.
-    Target Mode: If a hit is recorded, add neighbors to a stack and fire at them.
+    Hunt Mode: Fire as far as possible from previous shots.
+    Target Mode: Finish open hits with the shared TargetEngine.
     """
-    def __init__(self, name: str):
-        super().__init__(name)
-        self.target_stack: List[Tuple[int, int]] = []
-        self.last_hit: Optional[Tuple[int, int]] = None
+    __slots__ = ()
 
     def get_shot(self) -> Tuple[int, int]:
-        # Target Mode
-        while self.target_stack:
-            x, y = self.target_stack.pop()
-            if (x, y) not in self.shots_fired:
-                self.shots_fired.add((x, y))
-                return x, y
-        
-        # Hunt Mode
-        x, y = self.max_distance_probe()
-        self.shots_fired.add((x, y))
+        shot = self.target_probe()
+        if shot is None:
+            # Hunt Mode
+            shot = self.max_distance_probe()
+        x, y = shot
+        self.record_shot(x, y)
         return x, y
 
     def inform_result(self, x: int, y: int, result: ShotResult):
-        if result == ShotResult.HIT:
-            if self.last_hit and (abs(x - self.last_hit[0]) + abs(y - self.last_hit[1]) == 1):
-                dx = x - self.last_hit[0]
-                dy = y - self.last_hit[1]
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < Board.SIZE and 0 <= ny < Board.SIZE:
-                    if (nx, ny) not in self.shots_fired:
-                        self.target_stack.append((nx, ny))
-            else:
-                self._add_neighbors(x, y)
-            self.last_hit = (x, y)
-        elif result == ShotResult.SUNK:
-            self.last_hit = None
-
-    def _add_neighbors(self, x: int, y: int):
-        neighbors = [
-            (x, y - 1), (x, y + 1),
-            (x - 1, y), (x + 1, y)
-        ]
-        for nx, ny in neighbors:
-            if 0 <= nx < Board.SIZE and 0 <= ny < Board.SIZE:
-                if (nx, ny) not in self.shots_fired:
-                    self.target_stack.append((nx, ny))
+        self.record_result(x, y, result)
 
     def max_distance_probe(self) -> Tuple[int, int]:
         if not self.shots_fired:
             return self.random_probe()
 
-        best_candidates = []
-        max_min_dist = -1
-
-        for x in range(Board.SIZE):
-            for y in range(Board.SIZE):
-                if (x, y) in self.shots_fired:
-                    continue
-                
-                # Calculate Manhattan distance to the nearest shot
-                current_min_dist = min(abs(x - sx) + abs(y - sy) for sx, sy in self.shots_fired)
-                
-                if current_min_dist > max_min_dist:
-                    max_min_dist = current_min_dist
-                    best_candidates = [(x, y)]
-                elif current_min_dist == max_min_dist:
-                    best_candidates.append((x, y))
-        
-        if best_candidates:
-            return random.choice(best_candidates)
-        return self.random_probe()
\ No newline at end of file
+        shot = self.cached_probe(2, 0, self._distance_candidates)
+        return shot if shot is not None else self.random_probe()
+
+    def _distance_candidates(self) -> List[Tuple[int, int]]:
+        # Built once from the shots so far, then kept current by record_shot
+        if self._distance_field is None:
+            self._distance_field = DistanceField(self.size, self.fired_coords())
+        return self._distance_field.farthest()
+
+
+class ProbabilityDensityPlayer(Player):
+    """
+    Fires at the cell covered by the most legal placements of the unsunk ships.
+    Hunt Mode: Every placement avoiding misses and sunk ships counts equally.
+    Target Mode: Only placements through open hits count, weighted by how many they cover.
+    """
+    __slots__ = ("_tables", "_alive")
+    HIT_WEIGHT = 10
+
+    def __init__(self, name: str, rng=None, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+                 engine: Optional[Engine] = None):
+        super().__init__(name, rng, size, fleet, engine)
+        self._tables = {length: placement_table(self.size, length) for length in set(self.remaining_lengths)}
+        # Placements per length still consistent with every miss and sunk ship
+        self._alive = {length: set(range(len(table))) for length, table in self._tables.items()}
+
+    def reset(self):
+        super().reset()
+        for length, alive in self._alive.items():
+            alive.update(range(len(self._tables[length])))
+
+    def get_shot(self) -> Tuple[int, int]:
+        x, y = self.density_probe()
+        self.record_shot(x, y)
+        return x, y
+
+    def inform_result(self, x: int, y: int, result: ShotResult):
+        self.record_result(x, y, result)
+        if result == ShotResult.MISS:
+            self._prune(y * self.size + x)
+        elif result == ShotResult.SUNK:
+            for cell in self.sunk_cells:
+                self._prune(cell)
+
+    def _prune(self, cell: int):
+        for length, table in self._tables.items():
+            self._alive[length].difference_update(table.by_cell[cell])
+
+    def _density(self, hit_mask: int) -> List[int]:
+        density = [0] * (self.size * self.size)
+        # Duplicate lengths (e.g. two 3-ships) are counted once per ship
+        for length in self.remaining_lengths:
+            table = self._tables[length]
+            for pid in self._alive[length]:
+                if hit_mask:
+                    covered = bin(table.masks[pid] & hit_mask).count("1")
+                    if not covered:
+                        continue
+                    weight = self.HIT_WEIGHT ** covered
+                else:
+                    weight = 1
+                for cell in table.cells[pid]:
+                    density[cell] += weight
+        return density
+
+    def density_probe(self) -> Tuple[int, int]:
+        hit_mask = 0
+        for cell in self.open_hits:
+            hit_mask |= 1 << cell
+
+        density = self._density(hit_mask)
+        if hit_mask and not any(density):
+            # No placement explains the open hits (mis-attributed sinking): fall back to hunting
+            density = self._density(0)
+
+        best = 0
+        candidates: List[Tuple[int, int]] = []
+        for cell, score in enumerate(density):
+            x, y = cell % self.size, cell // self.size
+            if score < best or cell in self.shots_fired:
+                continue
+            if score > best:
+                best = score
+                candidates = []
+            candidates.append((x, y))
+
+        if candidates:
+            return self.rng.choice(candidates)
+        return self.random_probe()
+
+class TablePlayer(Player):
+    """
+    Plays a policy precomputed by solver.py: each shot is one lookup of the
+    (shot, hit, sunk) masks in the policy table. The table file is mapped on
+    the first shot and shared by every TablePlayer that uses it.
+    """
+    # Needs a policy file solved for the game's board size and fleet
+    selectable = False
+    _tables: Dict[str, PolicyTable] = {}
+
+    def __init__(self, name: str, rng=None, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+                 engine: Optional[Engine] = None, policy_path: Optional[str] = None):
+        super().__init__(name, rng, size, fleet, engine)
+        # An explicit policy_path wins over the engine's (main.py --policy)
+        self.policy_path = policy_path or (engine.policy_path if engine else None)
+        self._table: Optional[PolicyTable] = None
+        self._shot_mask = 0
+        self._hit_mask = 0
+        self._sunk_mask = 0
+
+    def reset(self):
+        super().reset()
+        self._shot_mask = self._hit_mask = self._sunk_mask = 0
+
+    def __getstate__(self):
+        # The mapped table stays behind; a copy in another process maps its own on the next shot
+        state = self.__dict__.copy()
+        state["_table"] = None
+        slots = {name: getattr(self, name) for name in Player.__slots__ if hasattr(self, name)}
+        return state, slots
+
+    def table(self) -> PolicyTable:
+        if self._table is None:
+            if not self.policy_path:
+                raise ValueError("TablePlayer needs a policy file written by solver.py.")
+            table = self._tables.get(self.policy_path)
+            if table is None:
+                table = self._tables[self.policy_path] = PolicyTable.load(self.policy_path)
+            if table.size != self.size or sorted(table.lengths) != sorted(length for _, length in self.fleet):
+                raise ValueError(f"{self.policy_path} was solved for a different board size or fleet.")
+            self._table = table
+        return self._table
+
+    def get_shot(self) -> Tuple[int, int]:
+        cell = self.table().lookup((self._shot_mask, self._hit_mask, self._sunk_mask))
+        if cell is None:
+            # Only reachable off-policy (e.g. a layout the solver's fleet could not produce)
+            x, y = self.random_probe()
+        else:
+            x, y = cell % self.size, cell // self.size
+        self.record_shot(x, y)
+        return x, y
+
+    def inform_result(self, x: int, y: int, result: ShotResult):
+        bit = 1 << (y * self.size + x)
+        self._shot_mask |= bit
+        if result == ShotResult.HIT:
+            self._hit_mask |= bit
+        elif result == ShotResult.SUNK:
+            self._hit_mask |= bit
+            self._sunk_mask |= bit
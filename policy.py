@@ -0,0 +1,72 @@
+import mmap
+import struct
+from typing import Dict, Optional, Sequence, Tuple
+
+# Hunt state: (cells shot, cells hit, cells whose shot sank a ship), as bitmasks over y * size + x
+State = Tuple[int, int, int]
+
+def _slot(state: State, capacity: int) -> int:
+    shot, hit, sunk = state
+    h = (shot * 0x9E3779B97F4A7C15 ^ hit * 0xC2B2AE3D27D4EB4F ^ sunk * 0x165667B19E3779F9) & 0xFFFFFFFFFFFFFFFF
+    return (h ^ (h >> 29)) % capacity
+
+class PolicyTable:
+    """
+    Precomputed policy: the cell to shoot in each reachable hunt state.
+
+    The file is an open-addressing hash table of fixed-size records, so it is
+    used straight from an mmap: a lookup hashes the state and reads one slot
+    (rarely a few, at load factor 1/2). Boards up to 8x8 fit the 64-bit masks.
+    """
+    MAGIC = b"BSPT"
+    HEADER = "<4sHH8sdQ"  # magic, size, fleet length count, lengths, expected shots, capacity
+    RECORD = "<QQQQ"      # shot, hit, sunk masks, cell + 1 (0 marks an empty slot)
+
+    def __init__(self, size: int, lengths: Sequence[int], expected_shots: float, buffer, capacity: int):
+        self.size = size
+        self.lengths = tuple(lengths)
+        self.expected_shots = expected_shots
+        self.capacity = capacity
+        self._buffer = buffer
+        self._offset = struct.calcsize(self.HEADER)
+        self._record = struct.Struct(self.RECORD)
+
+    @classmethod
+    def save(cls, path: str, size: int, lengths: Sequence[int], expected_shots: float, policy: Dict[State, int]):
+        if size * size > 64 or len(lengths) > 8:
+            raise ValueError("Policy files support boards up to 8x8 and fleets of up to 8 ships.")
+        capacity = max(1, 2 * len(policy))
+        slots = [None] * capacity
+        for state, cell in policy.items():
+            i = _slot(state, capacity)
+            while slots[i] is not None:
+                i = (i + 1) % capacity
+            slots[i] = (*state, cell + 1)
+        record = struct.Struct(cls.RECORD)
+        with open(path, "wb") as f:
+            f.write(struct.pack(cls.HEADER, cls.MAGIC, size, len(lengths), bytes(lengths).ljust(8, b"\0"),
+                                expected_shots, capacity))
+            empty = record.pack(0, 0, 0, 0)
+            for slot in slots:
+                f.write(record.pack(*slot) if slot is not None else empty)
+
+    @classmethod
+    def load(cls, path: str) -> "PolicyTable":
+        """Maps the file read-only; pages are read on first touch, not up front."""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, count, lengths, expected_shots, capacity = struct.unpack_from(cls.HEADER, buffer)
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path} is not a policy table file.")
+        return cls(size, lengths[:count], expected_shots, buffer, capacity)
+
+    def lookup(self, state: State) -> Optional[int]:
+        """The policy's cell for state, or None if the state is not in the table."""
+        i = _slot(state, self.capacity)
+        while True:
+            shot, hit, sunk, cell = self._record.unpack_from(self._buffer, self._offset + i * self._record.size)
+            if not cell:
+                return None
+            if (shot, hit, sunk) == state:
+                return cell - 1
+            i = (i + 1) % self.capacity
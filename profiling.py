@@ -0,0 +1,110 @@
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+class PhaseProfiler:
+    """
+    Opt-in per-phase timers for Game.play, keyed by (player class, phase).
+
+    instrument() switches the game's players and boards to timed subclasses of
+    their own classes for one game, so Game.play's loop is unchanged and costs
+    nothing extra when no profiler is passed, and the slotted instances need
+    no __dict__ for per-instance wrappers. receive_shot is charged to the
+    shooting player's class, since it is part of that player's turn.
+    """
+    PHASES = ("setup_board", "get_shot", "receive_shot", "inform_result", "observer")
+
+    def __init__(self):
+        self.time_ns: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.calls: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.games = 0
+        self.game_ns = 0
+        self._game_start = 0
+        # Timed subclass per (class, name its time is charged to), and the instances switched to one
+        self._classes: Dict[Tuple[type, str], type] = {}
+        self._switched: List[Tuple[object, type]] = []
+
+    def _timed(self, func, key: Tuple[str, str]):
+        clock = time.perf_counter_ns
+        time_ns = self.time_ns
+        calls = self.calls
+
+        def wrapper(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                time_ns[key] += clock() - start
+                calls[key] += 1
+        return wrapper
+
+    def _timed_class(self, cls: type, name: str, phases: Tuple[str, ...]) -> type:
+        """A subclass of cls whose phases are timed under name; it adds no instance fields."""
+        timed = self._classes.get((cls, name))
+        if timed is None:
+            namespace = {phase: self._timed(getattr(cls, phase), (name, phase)) for phase in phases}
+            namespace.update(__slots__=(), selectable=False, __module__=cls.__module__)
+            timed = self._classes[(cls, name)] = type(cls.__name__, (cls,), namespace)
+        return timed
+
+    def _switch(self, obj, cls: type):
+        self._switched.append((obj, type(obj)))
+        obj.__class__ = cls
+
+    def instrument(self, game, observer=None):
+        """Times the game's phases; returns the (possibly wrapped) observer to use."""
+        for shooter, target in ((game.p1, game.p2), (game.p2, game.p1)):
+            name = type(shooter).__name__
+            self._switch(shooter, self._timed_class(type(shooter), name, ("setup_board", "get_shot", "inform_result")))
+            self._switch(target.board, self._timed_class(type(target.board), name, ("receive_shot",)))
+        if observer is not None:
+            observer = self._timed(observer, ("Game", "observer"))
+        self._game_start = time.perf_counter_ns()
+        return observer
+
+    def finish(self, game):
+        """Stops the game timer and switches the players and boards back so they can be pickled."""
+        self.game_ns += time.perf_counter_ns() - self._game_start
+        self.games += 1
+        for obj, cls in reversed(self._switched):
+            obj.__class__ = cls
+        self._switched.clear()
+
+    def __getstate__(self):
+        # Only the totals travel between processes; timed classes are rebuilt on demand
+        state = self.__dict__.copy()
+        state["_classes"] = {}
+        state["_switched"] = []
+        return state
+
+    def merge(self, other: "PhaseProfiler"):
+        for key, value in other.time_ns.items():
+            self.time_ns[key] += value
+        for key, value in other.calls.items():
+            self.calls[key] += value
+        self.games += other.games
+        self.game_ns += other.game_ns
+
+    def loop_overhead_ns(self) -> int:
+        """Time inside Game.play not spent in any instrumented phase."""
+        return max(0, self.game_ns - sum(self.time_ns.values()))
+
+    def summary_lines(self) -> List[str]:
+        lines = [f"Phase Profile ({self.games} games, {self.game_ns / 1e9:.2f}s in Game.play):"]
+        total = self.game_ns or 1
+        for key in sorted(self.time_ns, key=self.time_ns.get, reverse=True):
+            name, phase = key
+            spent = self.time_ns[key]
+            calls = self.calls[key]
+            lines.append(f"  {name:<26} {phase:<14} {spent / 1e9:>8.3f}s {spent / total:>6.1%}"
+                         f" {calls:>10} calls {spent / calls / 1000:>9.2f}us/call")
+        overhead = self.loop_overhead_ns()
+        lines.append(f"  {'Game':<26} {'loop':<14} {overhead / 1e9:>8.3f}s {overhead / total:>6.1%}")
+        return lines
+
+    def export_folded(self, path: str):
+        """Writes folded stacks (Game.play;Class;phase microseconds) for flamegraph.pl / speedscope."""
+        with open(path, "w") as f:
+            for (name, phase), spent in sorted(self.time_ns.items()):
+                f.write(f"Game.play;{name};{phase} {spent // 1000}\n")
+            f.write(f"Game.play;loop {self.loop_overhead_ns() // 1000}\n")
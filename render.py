@@ -0,0 +1,548 @@
+"""
+Headless export of recorded games to animated GIFs and PNG frames.
+
+Move logs (replay.py) are replayed onto a RasterCanvas, a small stand-in for
+tkinter's Canvas that draws the visualizer's boards and legend (drawing.py)
+into a palette image. Frames are encoded with zlib and a pure-Python LZW
+encoder, so no display, tkinter or imaging library is needed, and games are
+rendered across a process pool after the run instead of holding up the
+simulation in a GUI loop.
+
+    python main.py --headless -n 10000 -s 1 --record-moves moves.bin
+    python render.py moves.bin -o frames --min-turns 170 -w 8
+"""
+import argparse
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from drawing import PADDING, cell_size_for, cell_style, draw_board, draw_cell, draw_legend, window_size
+from replay import MoveLog, read_move_logs, replay_game
+
+# Tk's values for the colors the drawing code uses; other "#rrggbb" colors are added on first use
+COLORS = {
+    "#f0f0f0": (240, 240, 240),
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "lightblue": (173, 216, 230),
+    "gray": (190, 190, 190),
+    "orange": (255, 165, 0),
+    "#d32f2f": (211, 47, 47),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+}
+# Palette index left out of every drawing, marking unchanged pixels in GIF sub-frames
+TRANSPARENT = 0
+
+# 5x7 bitmap font, one 5-bit row per byte with the leftmost pixel in bit 4; text is drawn upper-case
+FONT = {
+    " ": (0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00),
+    "A": (0x0E, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11), "B": (0x1E, 0x11, 0x11, 0x1E, 0x11, 0x11, 0x1E),
+    "C": (0x0E, 0x11, 0x10, 0x10, 0x10, 0x11, 0x0E), "D": (0x1E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x1E),
+    "E": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x1F), "F": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x10),
+    "G": (0x0E, 0x11, 0x10, 0x17, 0x11, 0x11, 0x0F), "H": (0x11, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11),
+    "I": (0x0E, 0x04, 0x04, 0x04, 0x04, 0x04, 0x0E), "J": (0x07, 0x02, 0x02, 0x02, 0x02, 0x12, 0x0C),
+    "K": (0x11, 0x12, 0x14, 0x18, 0x14, 0x12, 0x11), "L": (0x10, 0x10, 0x10, 0x10, 0x10, 0x10, 0x1F),
+    "M": (0x11, 0x1B, 0x15, 0x15, 0x11, 0x11, 0x11), "N": (0x11, 0x11, 0x19, 0x15, 0x13, 0x11, 0x11),
+    "O": (0x0E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E), "P": (0x1E, 0x11, 0x11, 0x1E, 0x10, 0x10, 0x10),
+    "Q": (0x0E, 0x11, 0x11, 0x11, 0x15, 0x12, 0x0D), "R": (0x1E, 0x11, 0x11, 0x1E, 0x14, 0x12, 0x11),
+    "S": (0x0F, 0x10, 0x10, 0x0E, 0x01, 0x01, 0x1E), "T": (0x1F, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04),
+    "U": (0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E), "V": (0x11, 0x11, 0x11, 0x11, 0x11, 0x0A, 0x04),
+    "W": (0x11, 0x11, 0x11, 0x15, 0x15, 0x15, 0x0A), "X": (0x11, 0x11, 0x0A, 0x04, 0x0A, 0x11, 0x11),
+    "Y": (0x11, 0x11, 0x0A, 0x04, 0x04, 0x04, 0x04), "Z": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x10, 0x1F),
+    "0": (0x0E, 0x11, 0x13, 0x15, 0x19, 0x11, 0x0E), "1": (0x04, 0x0C, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "2": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x08, 0x1F), "3": (0x1F, 0x02, 0x04, 0x02, 0x01, 0x11, 0x0E),
+    "4": (0x02, 0x06, 0x0A, 0x12, 0x1F, 0x02, 0x02), "5": (0x1F, 0x10, 0x1E, 0x01, 0x01, 0x11, 0x0E),
+    "6": (0x06, 0x08, 0x10, 0x1E, 0x11, 0x11, 0x0E), "7": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x08, 0x08),
+    "8": (0x0E, 0x11, 0x11, 0x0E, 0x11, 0x11, 0x0E), "9": (0x0E, 0x11, 0x11, 0x0F, 0x01, 0x02, 0x0C),
+    ":": (0x00, 0x0C, 0x0C, 0x00, 0x0C, 0x0C, 0x00), ".": (0x00, 0x00, 0x00, 0x00, 0x00, 0x0C, 0x0C),
+    ",": (0x00, 0x00, 0x00, 0x00, 0x0C, 0x04, 0x08), "-": (0x00, 0x00, 0x00, 0x1F, 0x00, 0x00, 0x00),
+    "_": (0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x1F), "|": (0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04),
+    "/": (0x01, 0x01, 0x02, 0x04, 0x08, 0x10, 0x10), "(": (0x02, 0x04, 0x08, 0x08, 0x08, 0x04, 0x02),
+    ")": (0x08, 0x04, 0x02, 0x02, 0x02, 0x04, 0x08), "[": (0x0E, 0x08, 0x08, 0x08, 0x08, 0x08, 0x0E),
+    "]": (0x0E, 0x02, 0x02, 0x02, 0x02, 0x02, 0x0E), "+": (0x00, 0x04, 0x04, 0x1F, 0x04, 0x04, 0x00),
+    "#": (0x0A, 0x0A, 0x1F, 0x0A, 0x1F, 0x0A, 0x0A), "%": (0x18, 0x19, 0x02, 0x04, 0x08, 0x13, 0x03),
+    "?": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x00, 0x04),
+}
+
+# Rectangles are (x0, y0, x1, y1) with exclusive ends
+Rect = Tuple[int, int, int, int]
+
+class RasterCanvas:
+    """
+    Palette image with the subset of tkinter.Canvas used by drawing.py:
+    create_rectangle, create_oval, create_line and create_text. Outlines and
+    lines are one pixel wide. Every drawing call records the area it touched,
+    so sub_frame() can return just what changed since the previous frame.
+    """
+
+    def __init__(self, width: int, height: int, background: str = "#f0f0f0"):
+        self.width = width
+        self.height = height
+        self.palette: List[Tuple[int, int, int]] = [(255, 0, 255)] + list(COLORS.values())
+        self._indices = {name: i + 1 for i, name in enumerate(COLORS)}
+        self.background = self.color(background)
+        self.pixels = bytearray([self.background]) * (width * height)
+        self.dirty: List[Rect] = [(0, 0, width, height)]
+
+    def color(self, name: str) -> int:
+        """Palette index of a color name or "#rrggbb"."""
+        index = self._indices.get(name)
+        if index is None:
+            if not (name.startswith("#") and len(name) == 7):
+                raise ValueError(f"Unknown color {name!r}.")
+            if len(self.palette) == 256:
+                raise ValueError("The palette is full.")
+            index = len(self.palette)
+            self.palette.append((int(name[1:3], 16), int(name[3:5], 16), int(name[5:7], 16)))
+            self._indices[name] = index
+        return index
+
+    def _touch(self, x0: int, y0: int, x1: int, y1: int):
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 < x1 and y0 < y1:
+            self.dirty.append((x0, y0, x1, y1))
+
+    def _fill(self, x0: int, y0: int, x1: int, y1: int, index: int):
+        """Fills x0 <= x < x1, y0 <= y < y1, clipped to the image."""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        run = bytes([index]) * (x1 - x0)
+        for y in range(y0, y1):
+            start = y * self.width + x0
+            self.pixels[start:start + len(run)] = run
+        self.dirty.append((x0, y0, x1, y1))
+
+    def _plot(self, x: int, y: int, index: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y * self.width + x] = index
+
+    def clear(self, rect: Rect):
+        self._fill(*rect, self.background)
+
+    def create_rectangle(self, x0, y0, x1, y1, fill=None, outline="black", **options):
+        x0, y0, x1, y1 = round(x0), round(y0), round(x1), round(y1)
+        if fill:
+            self._fill(x0, y0, x1, y1, self.color(fill))
+        if outline:
+            index = self.color(outline)
+            self._fill(x0, y0, x1 + 1, y0 + 1, index)
+            self._fill(x0, y1, x1 + 1, y1 + 1, index)
+            self._fill(x0, y0, x0 + 1, y1 + 1, index)
+            self._fill(x1, y0, x1 + 1, y1 + 1, index)
+
+    def create_oval(self, x0, y0, x1, y1, fill=None, outline="black", **options):
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+        if fill:
+            index = self.color(fill)
+            for y in range(round(y0), round(y1) + 1):
+                dy = (y - cy) / ry if ry else 0.0
+                if dy * dy <= 1:
+                    half = rx * (1 - dy * dy) ** 0.5
+                    self._fill(round(cx - half), y, round(cx + half) + 1, y + 1, index)
+        if outline:
+            index = self.color(outline)
+            # One quadrant stepped a pixel at a time along each axis, so the steep parts have no gaps
+            steps = max(2, round(max(rx, ry)))
+            for i in range(steps + 1):
+                t = i / steps
+                s = (1 - t * t) ** 0.5
+                for dx, dy in ((rx * t, ry * s), (rx * s, ry * t)):
+                    for sx in (-1, 1):
+                        for sy in (-1, 1):
+                            self._plot(round(cx + sx * dx), round(cy + sy * dy), index)
+            self._touch(round(x0), round(y0), round(x1) + 1, round(y1) + 1)
+
+    def create_line(self, x0, y0, x1, y1, fill="black", **options):
+        index = self.color(fill)
+        x0, y0, x1, y1 = round(x0), round(y0), round(x1), round(y1)
+        self._touch(min(x0, x1), min(y0, y1), max(x0, x1) + 1, max(y0, y1) + 1)
+        # Bresenham
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+        error = dx + dy
+        while True:
+            self._plot(x0, y0, index)
+            if x0 == x1 and y0 == y1:
+                return
+            twice = 2 * error
+            if twice >= dy:
+                error += dy
+                x0 += sx
+            if twice <= dx:
+                error += dx
+                y0 += sy
+
+    def text_box(self, x, y, text: str, font=None, anchor: str = "center") -> Rect:
+        """The area create_text would draw text in."""
+        scale, bold = self._font(font)
+        width = len(text) * 6 * scale - scale + bold
+        height = 7 * scale
+        anchor = "" if anchor == "center" else anchor
+        x0 = x if "w" in anchor else x - width if "e" in anchor else x - width / 2
+        y0 = y if "n" in anchor else y - height if "s" in anchor else y - height / 2
+        x0, y0 = round(x0), round(y0)
+        return x0, y0, x0 + width, y0 + height
+
+    @staticmethod
+    def _font(font) -> Tuple[int, int]:
+        """Pixel scale and extra bold width for a Tk font tuple like ("Arial", 14, "bold")."""
+        if not font:
+            return 1, 0
+        size = font[1] if len(font) > 1 else 10
+        return max(1, abs(size) // 7), int("bold" in font[2:])
+
+    def create_text(self, x, y, text="", font=None, anchor="center", fill="black", **options):
+        index = self.color(fill)
+        text = str(text).upper()
+        scale, bold = self._font(font)
+        x0, y0, x1, y1 = self.text_box(x, y, text, font, anchor)
+        for i, char in enumerate(text):
+            left = x0 + i * 6 * scale
+            for row, bits in enumerate(FONT.get(char, FONT["?"])):
+                top = y0 + row * scale
+                for column in range(5):
+                    if bits & (0x10 >> column):
+                        self._fill(left + column * scale, top, left + (column + 1) * scale + bold, top + scale, index)
+        self._touch(x0, y0, x1, y1)
+
+    def sub_frame(self) -> Optional[Tuple[int, int, int, int, bytes]]:
+        """
+        (left, top, width, height, pixels) covering everything drawn since the
+        last call, with pixels outside the drawn areas set to TRANSPARENT;
+        None if nothing was drawn.
+        """
+        if not self.dirty:
+            return None
+        left = min(rect[0] for rect in self.dirty)
+        top = min(rect[1] for rect in self.dirty)
+        right = max(rect[2] for rect in self.dirty)
+        bottom = max(rect[3] for rect in self.dirty)
+        width = right - left
+        data = bytearray([TRANSPARENT]) * (width * (bottom - top))
+        for x0, y0, x1, y1 in self.dirty:
+            for y in range(y0, y1):
+                start = (y - top) * width + x0 - left
+                source = y * self.width + x0
+                data[start:start + x1 - x0] = self.pixels[source:source + x1 - x0]
+        self.dirty = []
+        return left, top, width, bottom - top, bytes(data)
+
+def _palette_bytes(palette: Sequence[Tuple[int, int, int]], entries: int) -> bytes:
+    raw = b"".join(bytes(rgb) for rgb in palette)
+    return raw.ljust(3 * entries, b"\0")
+
+def encode_png(width: int, height: int, palette: Sequence[Tuple[int, int, int]], pixels: bytes) -> bytes:
+    """An 8-bit indexed-color PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\0" + pixels[y * width:(y + 1) * width] for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+            + chunk(b"PLTE", _palette_bytes(palette, len(palette)))
+            + chunk(b"IDAT", zlib.compress(rows, 6))
+            + chunk(b"IEND", b""))
+
+# A run of one byte value
+_RUN = re.compile(rb"(.)\1*", re.S)
+
+def lzw_encode(data: bytes, min_code_size: int) -> bytes:
+    """
+    GIF-flavoured LZW: variable-width codes up to 12 bits, packed LSB first,
+    a clear code when the table fills. Frames are mostly long runs of one
+    value (background, or transparent pixels around a changed cell), so the
+    codes for runs of each value are tracked and a run is consumed in one
+    step, as far as the table already holds a longer run, instead of one
+    table lookup per pixel. The output is the same as the plain loop's.
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    width = min_code_size + 1
+    next_code = end + 1
+    table: Dict[int, int] = {}
+    # Per byte value, the codes of runs of 1, 2, 3, ... copies of it
+    runs: Dict[int, List[int]] = {}
+    # Pending output bits, lowest first
+    bits = clear
+    count = width
+    prefix = value = data[0]
+    # While prefix is the code of a run of value, its length; 0 otherwise
+    length = 1
+    i = 1
+    n = len(data)
+    # End of the run of equal bytes last scanned; every byte before it from where the scan started is the same
+    run_end = 0
+    while i < n:
+        byte = data[i]
+        if length and byte == value:
+            codes = runs.get(value)
+            known = len(codes) if codes else 1
+            if known > length:
+                if i >= run_end:
+                    run_end = _RUN.match(data, i).end()
+                take = min(run_end - i, known - length)
+                length += take
+                i += take
+                prefix = codes[length - 1]
+                continue
+        key = prefix << 8 | byte
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            length = 0
+            i += 1
+            continue
+        bits |= prefix << count
+        count += width
+        while count >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            count -= 8
+        if next_code == 4096:
+            bits |= clear << count
+            count += width
+            table.clear()
+            runs.clear()
+            next_code = end + 1
+            width = min_code_size + 1
+        else:
+            table[key] = next_code
+            if length and byte == value:
+                runs.setdefault(value, [value]).append(next_code)
+            next_code += 1
+            # The decoder adds each code one step later, so the width grows once it would need the new code
+            if next_code > 1 << width and width < 12:
+                width += 1
+        prefix = value = byte
+        length = 1
+        i += 1
+    bits |= prefix << count
+    count += width
+    if next_code == 1 << width and width < 12:
+        width += 1
+    bits |= end << count
+    count += width
+    while count > 0:
+        out.append(bits & 0xFF)
+        bits >>= 8
+        count -= 8
+    return bytes(out)
+
+def encode_gif(width: int, height: int, palette: Sequence[Tuple[int, int, int]],
+               frames: Sequence[Tuple[int, int, int, int, bytes, int]]) -> bytes:
+    """
+    A looping GIF from (left, top, width, height, pixels, delay in 1/100 s)
+    frames. Each frame is drawn over the previous one, and TRANSPARENT pixels
+    leave it showing through, so frames only need to cover what changed.
+    """
+    depth = max(1, (len(palette) - 1).bit_length())
+    out = bytearray(b"GIF89a")
+    out += struct.pack("<HHBBB", width, height, 0x80 | (depth - 1) << 4 | (depth - 1), 0, 0)
+    out += _palette_bytes(palette, 1 << depth)
+    # NETSCAPE2.0 application extension: loop forever
+    out += b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"
+    min_code_size = max(2, depth)
+    for left, top, frame_width, frame_height, pixels, delay in frames:
+        # Graphic control: disposal 1 (keep the frame), transparent color flag
+        out += struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0x05, delay, TRANSPARENT, 0)
+        out += struct.pack("<BHHHHB", 0x2C, left, top, frame_width, frame_height, 0)
+        out.append(min_code_size)
+        data = lzw_encode(pixels, min_code_size)
+        for start in range(0, len(data), 255):
+            block = data[start:start + 255]
+            out.append(len(block))
+            out += block
+        out.append(0)
+    out.append(0x3B)
+    return bytes(out)
+
+class BoardRaster:
+    """
+    One board drawn on a RasterCanvas. update() redraws only the cells whose
+    style changed since the last frame; frames can be several turns apart,
+    so unlike visualizer.BoardItems it compares every cell.
+    """
+
+    def __init__(self, canvas: RasterCanvas, board, offset_x: int, offset_y: int, cell_size: int, player_name: str):
+        self.canvas = canvas
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.cell_size = cell_size
+        draw_board(canvas, board, offset_x, offset_y, cell_size, player_name)
+        self.styles = self._styles(board)
+
+    @staticmethod
+    def _styles(board) -> List[Tuple[str, Optional[str]]]:
+        grid, ship_map = board.grid, board.ship_map
+        return [cell_style(grid[y][x], ship_map.get((x, y))) for y in range(board.size) for x in range(board.size)]
+
+    def update(self, board) -> int:
+        """Redraws changed cells; returns how many were dirty."""
+        styles = self._styles(board)
+        dirty = 0
+        size = board.size
+        for index, style in enumerate(styles):
+            if style == self.styles[index]:
+                continue
+            dirty += 1
+            y, x = divmod(index, size)
+            draw_cell(self.canvas, self.offset_x + x * self.cell_size, self.offset_y + y * self.cell_size,
+                      self.cell_size, *style)
+        self.styles = styles
+        return dirty
+
+def game_path(out_dir: str, index: int, extension: str = "") -> str:
+    return os.path.join(out_dir, f"game_{index:06d}{extension}")
+
+def render_game(index: int, log: MoveLog, out_dir: str, image_format: str = "gif", step: int = 1,
+                delay_ms: int = 80, hold_ms: int = 2000, final_only: bool = False) -> Tuple[int, str, int]:
+    """
+    Renders one recorded game: an animated GIF, a directory of per-turn PNG
+    frames, or (final_only) one PNG of the finished boards. A frame is taken
+    every step turns, plus the final position. Returns (index, output path, frames).
+    """
+    size = log.size
+    cell_size = cell_size_for(size)
+    width, height = window_size(size)
+    board_pixel_size = size * cell_size
+    canvas = RasterCanvas(width, height)
+    header_font = ("Arial", 16, "bold")
+    scene = {"boards": None, "header": None, "turn": 0, "frames": 0}
+    gif_frames: List[Tuple[int, int, int, int, bytes, int]] = []
+    png_dir = game_path(out_dir, index)
+    if image_format == "png" and not final_only:
+        os.makedirs(png_dir, exist_ok=True)
+
+    def header(text: str):
+        if scene["header"] is not None:
+            canvas.clear(scene["header"])
+        font = header_font
+        if canvas.text_box(PADDING, 20, text, font, "w")[2] > width:
+            # Small boards make a narrow scene; the long final header drops to the legend's size
+            font = ("Arial", 12, "bold")
+        canvas.create_text(PADDING, 20, text=text, font=font, anchor="w")
+        scene["header"] = canvas.text_box(PADDING, 20, text, font, "w")
+
+    def capture(name: str, delay: int):
+        scene["frames"] += 1
+        if image_format == "gif":
+            frame = canvas.sub_frame()
+            if frame is not None:
+                # Viewers slow down delays under 20ms, so 2/100 s is the floor
+                gif_frames.append((*frame, max(2, round(delay / 10))))
+        else:
+            with open(os.path.join(png_dir, f"{name}.png"), "wb") as f:
+                f.write(encode_png(width, height, canvas.palette, canvas.pixels))
+
+    def observe(p1, p2, turn: int):
+        scene["turn"] = turn
+        if scene["boards"] is None:
+            # Boards are drawn under the opponent's name, as in the visualizer
+            scene["boards"] = (
+                BoardRaster(canvas, p1.board, PADDING, PADDING, cell_size, p2.name),
+                BoardRaster(canvas, p2.board, PADDING * 2 + board_pixel_size, PADDING, cell_size, p1.name),
+            )
+            draw_legend(canvas, PADDING, PADDING + board_pixel_size + 40, 20)
+        else:
+            for raster, player in zip(scene["boards"], (p1, p2)):
+                raster.update(player.board)
+        if final_only or turn % step:
+            return
+        header(f"Game: {index} | Turn: {turn}")
+        capture(f"turn_{turn:04d}", delay_ms)
+
+    replay_game(log, observer=observe)
+    turn = scene["turn"]
+    header(f"Game: {index} | Turn: {turn} | Winner: {log.names[log.winner - 1]}")
+    if final_only:
+        path = game_path(out_dir, index, ".png")
+        with open(path, "wb") as f:
+            f.write(encode_png(width, height, canvas.palette, canvas.pixels))
+        return index, path, 1
+    capture("final", hold_ms)
+    if image_format == "png":
+        return index, png_dir, scene["frames"]
+    path = game_path(out_dir, index, ".gif")
+    with open(path, "wb") as f:
+        f.write(encode_gif(width, height, canvas.palette, gif_frames))
+    return index, path, scene["frames"]
+
+def _render_job(job) -> Tuple[int, str, int]:
+    index, log, options = job
+    return render_game(index, log, **options)
+
+def parse_indices(text: str) -> Set[int]:
+    """Game indices from a list like "0,5,10-20" (ranges inclusive)."""
+    indices = set()
+    for part in text.split(","):
+        start, _, stop = part.partition("-")
+        indices.update(range(int(start), int(stop or start) + 1))
+    return indices
+
+def select_games(path: str, games: Optional[Set[int]] = None, min_turns: int = 0, max_turns: int = 0,
+                 limit: int = 0):
+    """(index, log) for the logged games that pass the filters, in file order."""
+    selected = 0
+    for index, log in enumerate(read_move_logs(path)):
+        if limit and selected >= limit:
+            return
+        if games is not None and index not in games:
+            continue
+        turns = len(log.cells)
+        if turns < min_turns or (max_turns and turns > max_turns):
+            continue
+        selected += 1
+        yield index, log
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render recorded games to GIF animations or PNG frames, without a display")
+    parser.add_argument("path", help="Move log file written with --record-moves")
+    parser.add_argument("-o", "--output", default="renders", help="Output directory (default: renders)")
+    parser.add_argument("--format", choices=("gif", "png"), default="gif", help="One animated GIF per game, or a directory of PNG frames per game")
+    parser.add_argument("--final-only", action="store_true", help="Write only a PNG of each game's final position")
+    parser.add_argument("--step", type=int, default=1, help="Take a frame every this many turns (default: 1)")
+    parser.add_argument("--delay", type=int, default=80, help="GIF frame delay in milliseconds (default: 80)")
+    parser.add_argument("--hold", type=int, default=2000, help="How long a GIF shows the final position, in milliseconds (default: 2000)")
+    parser.add_argument("-g", "--games", type=parse_indices, default=None, help='Game indices to render (0-based), e.g. "0,5,10-20"')
+    parser.add_argument("--min-turns", type=int, default=0, help="Only games that took at least this many turns")
+    parser.add_argument("--max-turns", type=int, default=0, help="Only games that took at most this many turns")
+    parser.add_argument("--limit", type=int, default=0, help="Render at most this many games")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes (default: 1)")
+    args = parser.parse_args()
+    if args.step < 1 or args.workers < 1:
+        parser.error("--step and --workers must be at least 1.")
+
+    os.makedirs(args.output, exist_ok=True)
+    options = {"out_dir": args.output, "image_format": args.format, "step": args.step, "delay_ms": args.delay,
+               "hold_ms": args.hold, "final_only": args.final_only}
+    jobs = ((index, log, options) for index, log in
+            select_games(args.path, args.games, args.min_turns, args.max_turns, args.limit))
+
+    start = time.time()
+    games = frames = 0
+    try:
+        if args.workers > 1:
+            with Pool(args.workers) as pool:
+                for _, _, count in pool.imap_unordered(_render_job, jobs, chunksize=4):
+                    games += 1
+                    frames += count
+        else:
+            for _, _, count in map(_render_job, jobs):
+                games += 1
+                frames += count
+    except (ValueError, IndexError) as e:
+        # A corrupt log: the layouts do not fit, or the replay diverges from the recorded results
+        sys.exit(f"Could not replay {args.path}: {e!r}")
+    elapsed = time.time() - start
+    rate = f", {frames / elapsed:.0f} frames/s" if elapsed > 0 else ""
+    print(f"Rendered {games} games ({frames} frames) to {args.output} in {elapsed:.2f}s{rate}")
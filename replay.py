@@ -0,0 +1,198 @@
+import argparse
+import struct
+from typing import Iterator, List, Optional, Sequence, Tuple
+from board import Board, Fleet
+from enums import ShotResult
+from game import Game
+from player import Player
+
+RESULT_CODES = {ShotResult.MISS: 0, ShotResult.HIT: 1, ShotResult.SUNK: 2, ShotResult.DUPLICATE: 3}
+CODE_RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+class MoveLog:
+    """
+    Compact binary record of one game: the ship lengths and both fleet layouts,
+    then one byte per shot (y * size + x) and a 2-bit result code per shot,
+    packed four to a byte. A standard 100-turn game encodes to roughly 200
+    bytes, player names included.
+    """
+    MAGIC = b"BSM2"
+    # Logs from before the header carried ship lengths; they hold the standard fleet
+    LEGACY_MAGIC = b"BSML"
+    HEADER = "<4sBQBH"
+
+    def __init__(self, size: int, seed: int, winner: int, names: Sequence[str], lengths: Sequence[int],
+                 layouts: Sequence[Sequence[Tuple[int, int, bool]]],
+                 cells: bytes, results: List[ShotResult]):
+        self.size = size
+        self.seed = seed
+        self.winner = winner
+        self.names = list(names)
+        self.lengths = list(lengths)
+        self.layouts = [list(layout) for layout in layouts]
+        self.cells = bytes(cells)
+        self.results = results
+
+    @classmethod
+    def from_game(cls, game: Game) -> "MoveLog":
+        """Builds the log of a finished game played with record_moves=True."""
+        if game.moves is None:
+            raise ValueError("Game was not played with record_moves=True.")
+        size = game.size
+        if size * size > 256:
+            raise ValueError(f"Move logs use one byte per cell and support boards up to 16x16, not {size}x{size}.")
+        return cls(
+            size, game.seed or 0, game.record.winner if game.record else 0,
+            (game.p1.name, game.p2.name),
+            [length for _, length in game.p1.fleet],
+            (game.p1.board.layout, game.p2.board.layout),
+            bytes(y * size + x for x, y, _ in game.moves),
+            [result for _, _, result in game.moves],
+        )
+
+    def shots(self, side: int) -> List[Tuple[int, int]]:
+        """Shots fired by player side (0 or 1), in order; player 1 fires first."""
+        return [(cell % self.size, cell // self.size) for cell in self.cells[side::2]]
+
+    @property
+    def fleet(self) -> Fleet:
+        """The recorded fleet; ship names are not stored, so custom fleets get numbered ones."""
+        if self.lengths == [length for _, length in Board.FLEET]:
+            return list(Board.FLEET)
+        return [(f"Ship {i + 1}", length) for i, length in enumerate(self.lengths)]
+
+    def encode(self) -> bytes:
+        out = bytearray(struct.pack(self.HEADER, self.MAGIC, self.size, self.seed, self.winner, len(self.cells)))
+        for name in self.names:
+            raw = name.encode("utf-8")[:255]
+            out.append(len(raw))
+            out += raw
+        out.append(len(self.lengths))
+        out += bytes(self.lengths)
+        for layout in self.layouts:
+            for x, y, horizontal in layout:
+                out += struct.pack("<H", (y * self.size + x) * 2 + int(horizontal))
+        out += self.cells
+
+        packed = bytearray((len(self.results) + 3) // 4)
+        for i, result in enumerate(self.results):
+            packed[i // 4] |= RESULT_CODES[result] << (2 * (i % 4))
+        out += packed
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "MoveLog":
+        magic, size, seed, winner, n_shots = struct.unpack_from(cls.HEADER, data)
+        if magic not in (cls.MAGIC, cls.LEGACY_MAGIC):
+            raise ValueError("Not a move log.")
+        pos = struct.calcsize(cls.HEADER)
+
+        names = []
+        for _ in range(2):
+            length = data[pos]
+            names.append(data[pos + 1:pos + 1 + length].decode("utf-8"))
+            pos += 1 + length
+
+        n_ships = data[pos]
+        pos += 1
+        if magic == cls.MAGIC:
+            lengths = list(data[pos:pos + n_ships])
+            pos += n_ships
+        else:
+            lengths = [length for _, length in Board.FLEET]
+        layouts = []
+        for _ in range(2):
+            layout = []
+            for code, in struct.iter_unpack("<H", data[pos:pos + 2 * n_ships]):
+                cell, horizontal = divmod(code, 2)
+                layout.append((cell % size, cell // size, bool(horizontal)))
+            layouts.append(layout)
+            pos += 2 * n_ships
+
+        cells = data[pos:pos + n_shots]
+        pos += n_shots
+        packed = data[pos:pos + (n_shots + 3) // 4]
+        results = [CODE_RESULTS[(packed[i // 4] >> (2 * (i % 4))) & 3] for i in range(n_shots)]
+        return cls(size, seed, winner, names, lengths, layouts, cells, results)
+
+class MoveLogWriter:
+    """Appends length-prefixed move logs to a single file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb")
+
+    def write(self, log: MoveLog):
+        data = log.encode()
+        self._file.write(struct.pack("<I", len(data)))
+        self._file.write(data)
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+def read_move_logs(path: str) -> Iterator[MoveLog]:
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(4)
+            if len(prefix) < 4:
+                return
+            length, = struct.unpack("<I", prefix)
+            yield MoveLog.decode(f.read(length))
+
+class ReplayPlayer(Player):
+    """Re-fires a recorded shot sequence on a recorded layout; no strategy runs."""
+    selectable = False
+
+    def __init__(self, name: str, layout: Sequence[Tuple[int, int, bool]], shots: Sequence[Tuple[int, int]],
+                 size: Optional[int] = None, fleet: Optional[Fleet] = None):
+        super().__init__(name, size=size, fleet=fleet)
+        self.layout = layout
+        self._shots = iter(shots)
+
+    def setup_board(self):
+        self.board.place_layout(self.layout)
+
+    def get_shot(self) -> Tuple[int, int]:
+        x, y = next(self._shots)
+        self.record_shot(x, y)
+        return x, y
+
+    def inform_result(self, x: int, y: int, result: ShotResult):
+        pass
+
+def replay_game(log: MoveLog, observer=None) -> Game:
+    """
+    Re-feeds a move log through Game.play (e.g. with an InteractiveVisualizer observer).
+    Raises ValueError if the boards do not reproduce the recorded results.
+    """
+    fleet = log.fleet
+    p1 = ReplayPlayer(log.names[0], log.layouts[0], log.shots(0), log.size, fleet)
+    p2 = ReplayPlayer(log.names[1], log.layouts[1], log.shots(1), log.size, fleet)
+    game = Game(p1, p2, seed=log.seed, record_moves=True)
+    game.play(observer=observer)
+    if [result for _, _, result in game.moves] != log.results:
+        raise ValueError("Replay diverged from the recorded shot results.")
+    return game
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Battleship games")
+    parser.add_argument("path", help="Move log file written with --record-moves")
+    parser.add_argument("-g", "--game", type=int, default=None, help="Replay only this game (0-based index)")
+    args = parser.parse_args()
+
+    from visualizer import InteractiveVisualizer
+
+    vis = None
+    for i, log in enumerate(read_move_logs(args.path)):
+        if args.game is not None and i != args.game:
+            continue
+        if vis is None:
+            vis = InteractiveVisualizer(size=log.size)
+        game = replay_game(log, observer=lambda p1, p2, turn: vis.update(p1, p2, i + 1, turn))
+        vis.show_round_result(game.p1, game.p2, i + 1, log.names[log.winner - 1])
+        if not vis.running:
+            break
+    if vis is not None and vis.running:
+        vis.close()
@@ -0,0 +1,164 @@
+import csv
+import json
+import mmap
+import os
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+class GameRecord(NamedTuple):
+    """Compact per-game result emitted by Game.play."""
+    seed: Optional[int]             # None for a game played without a seed
+    winner: int                     # 1 or 2
+    turn_count: int
+    p1_hits: int
+    p1_misses: int
+    p2_hits: int
+    p2_misses: int
+    p1_sink_shots: Tuple[int, ...]  # Player 1's shot count at each sinking, in order
+    p2_sink_shots: Tuple[int, ...]
+
+class ResultSink(ABC):
+    """
+    Buffers records and hands them to _write_batch in fixed-size batches,
+    so memory stays bounded however many games are streamed through.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer: List[GameRecord] = []
+
+    def write(self, record: GameRecord):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.count += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+
+    @abstractmethod
+    def _write_batch(self, records: List[GameRecord]):
+        """Writes one batch of buffered records."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JsonlSink(ResultSink):
+    """One JSON object per game."""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        super().__init__(path, batch_size)
+        self._file = open(path, "w")
+
+    def _write_batch(self, records: List[GameRecord]):
+        self._file.write("".join(json.dumps(r._asdict()) + "\n" for r in records))
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+class CsvSink(ResultSink):
+    """One row per game; sink shot lists are space-separated."""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        super().__init__(path, batch_size)
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(GameRecord._fields)
+
+    def _write_batch(self, records: List[GameRecord]):
+        self._writer.writerows(
+            [*r[:7], " ".join(map(str, r.p1_sink_shots)), " ".join(map(str, r.p2_sink_shots))]
+            for r in records
+        )
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+class ColumnarSink(ResultSink):
+    """
+    Directory with one raw little-endian array file per column plus a schema.json.
+    Sink shots become fixed-width columns (p1_sink_0 ...), 0 where the ship survived.
+    Unseeded games have seed 0 and seeded 0, so they stay apart from a real seed 0.
+    Columns can be memory-mapped with read_columns (or numpy.memmap) for analysis.
+    """
+    COLUMNS = [
+        ("seed", "Q"), ("seeded", "B"), ("winner", "B"), ("turn_count", "I"),
+        ("p1_hits", "H"), ("p1_misses", "H"), ("p2_hits", "H"), ("p2_misses", "H"),
+    ]
+    SINK_TYPE = "H"
+
+    def __init__(self, path: str, fleet_size: int, batch_size: int = 10000):
+        super().__init__(path, batch_size)
+        os.makedirs(path, exist_ok=True)
+        self.fleet_size = fleet_size
+        self.columns = list(self.COLUMNS)
+        for player in ("p1", "p2"):
+            self.columns += [(f"{player}_sink_{i}", self.SINK_TYPE) for i in range(fleet_size)]
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name, _ in self.columns}
+
+    def _write_batch(self, records: List[GameRecord]):
+        pad = (0,) * self.fleet_size
+        values: Dict[str, List[int]] = {name: [] for name, _ in self.columns}
+        for r in records:
+            values["seed"].append(r.seed or 0)
+            values["seeded"].append(r.seed is not None)
+            for name, _ in self.COLUMNS[2:]:
+                values[name].append(getattr(r, name))
+            for player, shots in (("p1", r.p1_sink_shots), ("p2", r.p2_sink_shots)):
+                for i, shot in enumerate((shots + pad)[:self.fleet_size]):
+                    values[f"{player}_sink_{i}"].append(shot)
+
+        for name, typecode in self.columns:
+            column = array(typecode, values[name])
+            if sys.byteorder != "little":
+                column.byteswap()
+            self._files[name].write(column.tobytes())
+
+    def close(self):
+        super().close()
+        for f in self._files.values():
+            f.close()
+        with open(os.path.join(self.path, "schema.json"), "w") as f:
+            json.dump({"rows": self.count, "columns": self.columns}, f)
+
+def read_columns(path: str) -> Dict[str, memoryview]:
+    """Memory-maps every column written by ColumnarSink as a typed memoryview."""
+    with open(os.path.join(path, "schema.json")) as f:
+        schema = json.load(f)
+    columns = {}
+    for name, typecode in schema["columns"]:
+        with open(os.path.join(path, f"{name}.bin"), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                columns[name] = memoryview(array(typecode))
+                continue
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        columns[name] = memoryview(mapped).cast(typecode)
+    return columns
+
+def open_sink(path: str, fleet_size: int) -> ResultSink:
+    """Picks a sink from the path's extension: .jsonl, .csv, otherwise a columnar directory."""
+    if path.endswith(".jsonl"):
+        return JsonlSink(path)
+    if path.endswith(".csv"):
+        return CsvSink(path)
+    return ColumnarSink(path, fleet_size)
+
+def shard_path(path: str, shard: int) -> str:
+    """Per-worker output path, e.g. results.jsonl -> results.003.jsonl."""
+    root, ext = os.path.splitext(path.rstrip(os.sep))
+    return f"{root}.{shard:03d}{ext}"
@@ -0,0 +1,36 @@
+import random
+from typing import List, Optional
+
+def derive_seeds(master_seed: Optional[int], count: int) -> List[int]:
+    """Derives independent 64-bit seeds (one per shard, player, ...) from a master seed."""
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+class SeedStream:
+    """Endless stream of per-game seeds whose position can be saved and restored."""
+
+    def __init__(self, shard_seed: int):
+        self.rng = random.Random(shard_seed)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        return self.rng.getrandbits(64)
+
+    def getstate(self) -> list:
+        """The stream position as JSON-friendly lists."""
+        version, internal, gauss = self.rng.getstate()
+        return [version, list(internal), gauss]
+
+    def setstate(self, state: list):
+        version, internal, gauss = state
+        self.rng.setstate((version, tuple(internal), gauss))
+
+def game_seeds(shard_seed: int) -> SeedStream:
+    """Endless stream of per-game seeds; any single game can be replayed from its seed."""
+    return SeedStream(shard_seed)
+
+def spawn_rngs(seed: Optional[int], count: int) -> List[random.Random]:
+    """Independent RNG streams derived from one seed, e.g. one per player of a game."""
+    return [random.Random(s) for s in derive_seeds(seed, count)]
@@ -0,0 +1,362 @@
+"""
+Self-play data for training learned strategies, and a Player for the result.
+
+SelfPlayGenerator plays seeded games between two strategies in its own game
+loop and streams every turn as (state, action, outcome) rows in fixed-size
+NumPy batches; generate() fans the games out over a pool of producer
+processes behind a bounded queue. LearnedPlayer shoots from a model's scores,
+and play_concurrent scores every game's state with one model call per turn.
+
+    python selfplay.py --p1 HuntTargetPlayer --p2 HuntTargetPlayerMore -n 100000 -w 4 -o data
+    python selfplay.py --evaluate 1000 --p2 HuntTargetPlayer
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+from board import Board, Fleet, parse_fleet
+from enums import CellState, ShotResult
+from game import Game
+from parallel import split_iterations
+from player import Player, RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer
+from seeding import derive_seeds, game_seeds, spawn_rngs
+
+# State planes: what the shooter knows about each cell of the board it fires at
+HIT, MISS, UNKNOWN = 0, 1, 2
+PLANES = 3
+# Shot result codes in Batch.results
+RESULT_CODES = {ShotResult.MISS: 0, ShotResult.HIT: 1, ShotResult.SUNK: 2, ShotResult.DUPLICATE: 3}
+
+# (games, PLANES, size, size) float32 states -> (games, size * size) scores
+Model = Callable[[np.ndarray], np.ndarray]
+
+class Batch(NamedTuple):
+    states: np.ndarray   # (n, PLANES, size, size) uint8, before the shot
+    actions: np.ndarray  # (n,) int16 cell index (y * size + x) shot
+    results: np.ndarray  # (n,) int8 RESULT_CODES of the shot
+    won: np.ndarray      # (n,) bool, whether the shooter won the game
+    turns: np.ndarray    # (n,) int16 turn number within the game, from 1
+
+def encode_state(board: Board, shots_fired) -> np.ndarray:
+    """Hit/miss/unknown planes of board as seen by a player who has fired at shots_fired."""
+    size = board.size
+    planes = np.zeros((PLANES, size * size), dtype=np.uint8)
+    planes[UNKNOWN] = 1
+    grid = board.grid
+    for cell in shots_fired:
+        planes[HIT if grid[cell // size][cell % size] is CellState.HIT else MISS, cell] = 1
+        planes[UNKNOWN, cell] = 0
+    return planes.reshape(PLANES, size, size)
+
+class SelfPlayGenerator:
+    """
+    Plays seeded games between two strategies and yields every turn in
+    batches of batch_size rows (the last one may be shorter).
+
+    The loop is Game.play's with the shooter's state planes kept up to
+    date one cell per shot, so a turn costs a row copy instead of an observer
+    call and a grid walk; the planes equal encode_state(target board,
+    shots_fired). Memory is one batch plus one game's turns, however many
+    games are played.
+    """
+
+    def __init__(self, p1_class, p2_class, batch_size: int = 4096, seed: Optional[int] = None,
+                 size: Optional[int] = None, fleet: Optional[Fleet] = None):
+        self.p1 = p1_class(p1_class.__name__, size=size, fleet=fleet)
+        self.p2 = p2_class(p2_class.__name__, size=size, fleet=fleet)
+        self.batch_size = batch_size
+        self.size = self.p1.size
+        self.seeds = game_seeds(derive_seeds(seed, 1)[0])
+        self.games = 0
+
+        cells = self.size * self.size
+        # Each side's view of the board it fires at, and the current game's turns
+        self._views = np.zeros((2, PLANES, cells), dtype=np.uint8)
+        max_turns = 2 * cells
+        self._states = np.zeros((max_turns, PLANES, cells), dtype=np.uint8)
+        self._actions = np.zeros(max_turns, dtype=np.int16)
+        self._results = np.zeros(max_turns, dtype=np.int8)
+        self._sides = np.zeros(max_turns, dtype=np.int8)
+        self._new_batch()
+
+    def _new_batch(self):
+        n = self.batch_size
+        self._batch = Batch(np.zeros((n, PLANES, self.size, self.size), dtype=np.uint8),
+                            np.zeros(n, dtype=np.int16), np.zeros(n, dtype=np.int8),
+                            np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int16))
+        self._filled = 0
+
+    def play_game(self) -> Tuple[int, int]:
+        """Plays one game into the turn buffers; returns (winning side, turns)."""
+        p1, p2 = self.p1, self.p2
+        if self.games:
+            p1.reset()
+            p2.reset()
+        self.games += 1
+        # Seeded exactly as Game(p1, p2, seed) would seed them
+        rng1, rng2 = spawn_rngs(next(self.seeds), 2)
+        p1.set_rng(rng1)
+        p2.set_rng(rng2)
+        p1.setup_board()
+        p2.setup_board()
+
+        views = self._views
+        views[:] = 0
+        views[:, UNKNOWN] = 1
+        states, actions, results, sides = self._states, self._actions, self._results, self._sides
+        players = (p1, p2)
+        targets = (p2.board, p1.board)
+        size = self.size
+        side = 0
+        turn = 0
+        while True:
+            current, target, view = players[side], targets[side], views[side]
+            states[turn] = view
+            x, y = current.get_shot()
+            result = target.receive_shot(x, y)
+            current.inform_result(x, y, result)
+
+            cell = y * size + x
+            actions[turn] = cell
+            results[turn] = RESULT_CODES[result]
+            sides[turn] = side
+            turn += 1
+            if result is not ShotResult.DUPLICATE:
+                view[MISS if result is ShotResult.MISS else HIT, cell] = 1
+                view[UNKNOWN, cell] = 0
+                if result is ShotResult.SUNK and not target.remaining:
+                    return side, turn
+            side ^= 1
+
+    def batches(self, games: int) -> Iterator[Batch]:
+        for _ in range(games):
+            winner, turns = self.play_game()
+            start = 0
+            while start < turns:
+                n = min(turns - start, self.batch_size - self._filled)
+                rows = slice(self._filled, self._filled + n)
+                done = slice(start, start + n)
+                batch = self._batch
+                batch.states[rows] = self._states[done].reshape(n, PLANES, self.size, self.size)
+                batch.actions[rows] = self._actions[done]
+                batch.results[rows] = self._results[done]
+                batch.won[rows] = self._sides[done] == winner
+                batch.turns[rows] = np.arange(start + 1, start + n + 1)
+                self._filled += n
+                start += n
+                if self._filled == self.batch_size:
+                    yield batch
+                    self._new_batch()
+        if self._filled:
+            yield Batch(*(column[:self._filled] for column in self._batch))
+            self._new_batch()
+
+def _produce(batches: multiprocessing.Queue, stop, p1_class, p2_class, games: int, batch_size: int,
+             seed: int, size: Optional[int], fleet: Optional[Fleet]):
+    """Producer process: puts its batches on the queue, then None; gives up early once stop is set."""
+    generator = SelfPlayGenerator(p1_class, p2_class, batch_size, seed, size, fleet)
+    for item in itertools.chain(generator.batches(games), [None]):
+        while True:
+            if stop.is_set():
+                # The consumer went away: exit without waiting for buffered batches to be read
+                batches.cancel_join_thread()
+                return
+            try:
+                batches.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+def generate(p1_class, p2_class, games: int, batch_size: int = 4096, workers: int = 1,
+             seed: Optional[int] = None, size: Optional[int] = None, fleet: Optional[Fleet] = None,
+             max_queued: Optional[int] = None) -> Iterator[Batch]:
+    """
+    Streams batches of games split across workers producer processes. At most
+    max_queued batches (default 2 per worker) wait in the queue, so memory
+    stays bounded however far the consumer falls behind. Each worker's games
+    are reproducible from seed, but batches from different workers arrive
+    interleaved in whatever order they finish.
+    """
+    if workers <= 1:
+        yield from SelfPlayGenerator(p1_class, p2_class, batch_size, seed, size, fleet).batches(games)
+        return
+
+    batches = multiprocessing.Queue(maxsize=max_queued or 2 * workers)
+    stop = multiprocessing.Event()
+    producers = [multiprocessing.Process(target=_produce, daemon=True,
+                                         args=(batches, stop, p1_class, p2_class, n, batch_size, s, size, fleet))
+                 for n, s in zip(split_iterations(games, workers), derive_seeds(seed, workers))]
+    for producer in producers:
+        producer.start()
+    try:
+        running = len(producers)
+        while running:
+            item = batches.get()
+            if item is None:
+                running -= 1
+            else:
+                yield item
+    finally:
+        stop.set()
+        for producer in producers:
+            producer.join(timeout=5)
+            if producer.is_alive():
+                producer.terminate()
+
+class LearnedPlayer(Player):
+    """
+    Shoots the unknown cell a model scores highest. On its own, get_shot
+    scores a batch of one; play_concurrent batches every game's state into
+    one model call per turn.
+    """
+    # Needs a model to construct
+    selectable = False
+
+    def __init__(self, name: str, model: Model, rng=None, size: Optional[int] = None,
+                 fleet: Optional[Fleet] = None):
+        super().__init__(name, rng, size, fleet)
+        self.model = model
+        # Same planes as encode_state(target board, shots_fired), kept up to date per shot
+        self.view = np.zeros((PLANES, self.size * self.size), dtype=np.uint8)
+        self.view[UNKNOWN] = 1
+
+    def reset(self):
+        super().reset()
+        self.view[:] = 0
+        self.view[UNKNOWN] = 1
+
+    def state(self) -> np.ndarray:
+        return self.view.reshape(PLANES, self.size, self.size)
+
+    def shoot(self, scores: np.ndarray) -> Tuple[int, int]:
+        """Fires at the best-scoring unknown cell of one row of model output."""
+        cell = int(np.where(self.view[UNKNOWN] == 1, scores, -np.inf).argmax())
+        x, y = cell % self.size, cell // self.size
+        self.record_shot(x, y)
+        return x, y
+
+    def get_shot(self) -> Tuple[int, int]:
+        return self.shoot(self.model(self.state()[None].astype(np.float32))[0])
+
+    def inform_result(self, x: int, y: int, result: ShotResult):
+        if result is ShotResult.DUPLICATE:
+            return
+        cell = y * self.size + x
+        self.view[MISS if result is ShotResult.MISS else HIT, cell] = 1
+        self.view[UNKNOWN, cell] = 0
+
+def play_concurrent(games: List[Game]) -> Tuple[List[Player], int]:
+    """
+    Plays many games in lockstep. Every game starts with player 1 and
+    alternates, so on each turn the same side moves in every unfinished game;
+    the LearnedPlayers to move are grouped by model and board size and each
+    group is scored with a single model call. Other players shoot as usual.
+    Returns the winners in game order and the number of model calls made.
+    """
+    for game in games:
+        game.p1.setup_board()
+        game.p2.setup_board()
+    winners: List[Optional[Player]] = [None] * len(games)
+    active = list(range(len(games)))
+    model_calls = 0
+    side = 0
+    turn = 0
+    while active:
+        turn += 1
+        shooters = [games[i].p2 if side else games[i].p1 for i in active]
+        shots: List[Optional[Tuple[int, int]]] = [None] * len(active)
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for j, shooter in enumerate(shooters):
+            if isinstance(shooter, LearnedPlayer):
+                groups.setdefault((id(shooter.model), shooter.size), []).append(j)
+            else:
+                shots[j] = shooter.get_shot()
+        for group in groups.values():
+            first = shooters[group[0]]
+            states = np.stack([shooters[j].view for j in group]).reshape(len(group), PLANES, first.size, first.size)
+            scores = first.model(states.astype(np.float32))
+            model_calls += 1
+            for row, j in enumerate(group):
+                shots[j] = shooters[j].shoot(scores[row])
+
+        still_active = []
+        for j, i in enumerate(active):
+            game, shooter = games[i], shooters[j]
+            target = game.p1.board if side else game.p2.board
+            x, y = shots[j]
+            result = target.receive_shot(x, y)
+            shooter.inform_result(x, y, result)
+            if result is ShotResult.SUNK and not target.remaining:
+                winners[i] = shooter
+                game.turn_count = turn
+            else:
+                still_active.append(i)
+        active = still_active
+        side ^= 1
+    return winners, model_calls
+
+def neighbor_model(states: np.ndarray) -> np.ndarray:
+    """
+    Stand-in for a trained model: scores unknown cells by how many hits they
+    touch, with a checkerboard preference for hunting.
+    """
+    n, size = states.shape[0], states.shape[-1]
+    hits = states[:, HIT]
+    touching = np.zeros_like(hits)
+    touching[:, 1:, :] += hits[:, :-1, :]
+    touching[:, :-1, :] += hits[:, 1:, :]
+    touching[:, :, 1:] += hits[:, :, :-1]
+    touching[:, :, :-1] += hits[:, :, 1:]
+    parity = (np.add.outer(np.arange(size), np.arange(size)) % 2 == 0)
+    scores = states[:, UNKNOWN] * (1.0 + 4.0 * touching + 0.5 * parity)
+    return scores.reshape(n, size * size)
+
+PLAYER_CLASSES = {cls.__name__: cls for cls in (RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate self-play training data, or evaluate a learned policy")
+    parser.add_argument("--p1", choices=sorted(PLAYER_CLASSES), default=HuntTargetPlayer.__name__, help="Player 1 strategy")
+    parser.add_argument("--p2", choices=sorted(PLAYER_CLASSES), default=HuntTargetPlayerMore.__name__, help="Player 2 strategy (the opponent with --evaluate)")
+    parser.add_argument("-n", "--iterations", type=int, default=10000, help="Number of games")
+    parser.add_argument("-b", "--batch-size", type=int, default=4096, help="Turns per batch")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Producer processes")
+    parser.add_argument("-o", "--output", default=None, help="Write each batch as an .npz file in this directory")
+    parser.add_argument("--evaluate", type=int, default=0, metavar="GAMES", help="Instead play this many concurrent games of the stand-in learned model against --p2")
+    parser.add_argument("--size", type=int, default=None, help=f"Board width and height (default {Board.SIZE})")
+    parser.add_argument("--fleet", type=parse_fleet, default=None, help='Ship lengths, e.g. "5,4,3,3,2"')
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Master seed")
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.evaluate:
+        opponent = PLAYER_CLASSES[args.p2]
+        seeds = game_seeds(derive_seeds(args.seed, 1)[0])
+        games = [Game(LearnedPlayer("LearnedPlayer", neighbor_model, size=args.size, fleet=args.fleet),
+                      opponent(opponent.__name__, size=args.size, fleet=args.fleet), seed=next(seeds))
+                 for _ in range(args.evaluate)]
+        winners, model_calls = play_concurrent(games)
+        wins = sum(winner is game.p1 for winner, game in zip(winners, games))
+        turns = sum(game.turn_count for game in games)
+        print(f"LearnedPlayer vs {opponent.__name__}: {wins}/{len(games)} wins ({wins / len(games):.1%}), "
+              f"{turns / len(games):.1f} turns per game")
+        learned_turns = sum((game.turn_count + 1) // 2 for game in games)
+        print(f"{model_calls} model calls for {learned_turns} learned-player turns ({time.time() - start:.2f}s)")
+        raise SystemExit(0)
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    rows = 0
+    count = 0
+    for count, batch in enumerate(generate(PLAYER_CLASSES[args.p1], PLAYER_CLASSES[args.p2], args.iterations,
+                                           args.batch_size, args.workers, args.seed, args.size, args.fleet), 1):
+        rows += len(batch.actions)
+        if args.output:
+            np.savez(os.path.join(args.output, f"batch-{count:05d}.npz"), **batch._asdict())
+    elapsed = time.time() - start
+    print(f"{args.iterations} games, {rows} turns in {count} batches ({elapsed:.2f}s, {rows / elapsed:.0f} turns/s)")
+    if args.output:
+        print(f"Wrote batches to {args.output}")
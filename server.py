@@ -0,0 +1,320 @@
+"""
+Asyncio match server for bots that run as separate processes.
+
+Bots speak a line-delimited text protocol over a pipe (a spawned process's
+stdin/stdout) or a local TCP socket. One connection carries many games at once,
+each identified by a game id. The server keeps both boards, so bots only pick
+shots:
+
+    bot -> server   HELLO <name>                         once, on connect
+    server -> bot   NEW <game> <size> <len,len,...>      a game starts
+    server -> bot   SHOT <game>                          your move
+    bot -> server   SHOT <game> <x> <y>                  the reply
+    server -> bot   RESULT <game> <x> <y> <MISS|HIT|SUNK|DUPLICATE>
+    server -> bot   END <game> <WIN|LOSS|FORFEIT>
+
+A bot that misses its move deadline, replies with a malformed move or
+disconnects forfeits the game. Games' move requests queue at the server, and
+only the request at the head of that queue is written to the bot, once every
+earlier one has been answered or has timed out. The deadline is the per-move
+timeout from that write, and move latency runs from the write to the reply, so
+neither counts time spent behind other games' requests.
+bot.py is a stand-in bot built on the in-process strategies.
+"""
+import argparse
+import asyncio
+import shlex
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from board import Board, Fleet, parse_fleet
+from enums import ShotResult
+from game import Game
+from player import Player, RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer
+from seeding import derive_seeds, game_seeds
+from stats import percentile
+
+class Forfeit(Exception):
+    """A remote bot lost a game by timing out, misbehaving or disconnecting."""
+
+class BotConnection:
+    """One bot process or socket, multiplexing any number of concurrent games."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, process=None):
+        self.reader = reader
+        self.writer = writer
+        self.process = process
+        self.name = "bot"
+        self.latencies_ns: List[int] = []
+        self.timeouts = 0
+        self.errors = 0
+        self.disconnected = False
+        self._pending: Dict[int, asyncio.Future] = {}
+        # Games waiting to move, in request order; each future is set when that game's SHOT may be written
+        self._queue: "OrderedDict[int, asyncio.Future]" = OrderedDict()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def spawn(cls, command: str) -> "BotConnection":
+        """Starts a bot process and talks to it over its stdin/stdout."""
+        process = await asyncio.create_subprocess_exec(
+            *shlex.split(command), stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        return cls(process.stdout, process.stdin, process)
+
+    async def handshake(self, timeout: float):
+        line = await asyncio.wait_for(self.reader.readline(), timeout)
+        parts = line.decode().split(maxsplit=1)
+        if len(parts) != 2 or parts[0] != "HELLO":
+            raise ConnectionError(f"Expected HELLO from bot, got {line!r}")
+        self.name = parts[1].strip()
+        self._reader_task = asyncio.create_task(self._read_replies())
+
+    async def _read_replies(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                parts = line.decode().split()
+                if len(parts) != 4 or parts[0] != "SHOT" or not parts[1].isdigit():
+                    self.errors += 1
+                    continue
+                game_id = int(parts[1])
+                future = self._pending.pop(game_id, None)
+                # Replies to games that already timed out are dropped
+                if future is not None and not future.done():
+                    future.set_result((parts[2], parts[3], time.perf_counter_ns()))
+                    self._settle(game_id)
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnected = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"{self.name} disconnected"))
+            self._pending.clear()
+
+    def send(self, line: str):
+        if not self.disconnected and not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+    async def request_shot(self, game_id: int, size: int, timeout: float) -> Tuple[int, int]:
+        if self.disconnected:
+            raise Forfeit(f"{self.name} disconnected")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[game_id] = future
+        at_head = loop.create_future()
+        self._queue[game_id] = at_head
+        if len(self._queue) == 1:
+            at_head.set_result(None)
+        try:
+            # Earlier requests each settle within their own deadline, so this wait is bounded
+            await at_head
+            self.send(f"SHOT {game_id}")
+            start = time.perf_counter_ns()
+            await self.writer.drain()
+            raw_x, raw_y, replied = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(game_id, None)
+            self.timeouts += 1
+            raise Forfeit(f"{self.name} timed out")
+        except ConnectionError as e:
+            self._pending.pop(game_id, None)
+            raise Forfeit(str(e))
+        finally:
+            self._settle(game_id)
+        self.latencies_ns.append(replied - start)
+        try:
+            x, y = int(raw_x), int(raw_y)
+        except ValueError:
+            x = y = -1
+        if not (0 <= x < size and 0 <= y < size):
+            self.errors += 1
+            raise Forfeit(f"{self.name} sent an invalid move {raw_x} {raw_y}")
+        return x, y
+
+    def _settle(self, game_id: int):
+        """Takes a game's request out of the queue and lets the next one be written."""
+        if self._queue.pop(game_id, None) is not None and self._queue:
+            at_head = next(iter(self._queue.values()))
+            if not at_head.done():
+                at_head.set_result(None)
+
+    def latency_summary(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies_ns)
+        return {
+            "moves": len(ordered),
+            "p50_us": percentile(ordered, 50) / 1000,
+            "p90_us": percentile(ordered, 90) / 1000,
+            "p99_us": percentile(ordered, 99) / 1000,
+            "max_us": (ordered[-1] if ordered else 0) / 1000,
+        }
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        if self.process is not None:
+            await self.process.wait()
+        if self._reader_task is not None:
+            await self._reader_task
+
+class RemotePlayer(Player):
+    """
+    A bot on the other end of a BotConnection. The server places its ships and
+    keeps its board; get_shot is replaced by the awaitable next_shot.
+    """
+    selectable = False
+
+    def __init__(self, name: str, connection: BotConnection, game_id: int, timeout: float,
+                 rng=None, size: Optional[int] = None, fleet: Optional[Fleet] = None):
+        super().__init__(name, rng, size, fleet)
+        self.connection = connection
+        self.game_id = game_id
+        self.timeout = timeout
+
+    def setup_board(self):
+        super().setup_board()
+        lengths = ",".join(str(length) for _, length in self.fleet)
+        self.connection.send(f"NEW {self.game_id} {self.size} {lengths}")
+
+    async def next_shot(self) -> Tuple[int, int]:
+        return await self.connection.request_shot(self.game_id, self.size, self.timeout)
+
+    def get_shot(self) -> Tuple[int, int]:
+        raise RuntimeError("RemotePlayer moves are awaited with next_shot(); play it with play_async().")
+
+    def inform_result(self, x: int, y: int, result: ShotResult):
+        self.connection.send(f"RESULT {self.game_id} {x} {y} {result.name}")
+
+    def end(self, outcome: str):
+        self.connection.send(f"END {self.game_id} {outcome}")
+
+async def play_async(game: Game) -> Tuple[Player, Optional[str]]:
+    """
+    Game.play for games with a RemotePlayer: awaits remote moves so other games
+    on the loop run meanwhile. Returns (winner, forfeit reason or None).
+    """
+    game.p1.setup_board()
+    game.p2.setup_board()
+    current, opponent = game.p1, game.p2
+    while True:
+        game.turn_count += 1
+        if isinstance(current, RemotePlayer):
+            try:
+                x, y = await current.next_shot()
+            except Forfeit as e:
+                return opponent, str(e)
+        else:
+            x, y = current.get_shot()
+        result = opponent.board.receive_shot(x, y)
+        current.inform_result(x, y, result)
+        if opponent.board.all_ships_sunk():
+            return current, None
+        current, opponent = opponent, current
+
+class MatchServer:
+    def __init__(self, connection: BotConnection, opponent_class: type, timeout: float = 1.0,
+                 concurrency: int = 200, size: Optional[int] = None, fleet: Optional[Fleet] = None):
+        self.connection = connection
+        self.opponent_class = opponent_class
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.size = size
+        self.fleet = fleet
+        self.games = 0
+        self.bot_wins = 0
+        self.forfeits = 0
+        self.turns = 0
+
+    async def _play_one(self, game_id: int, seed: int, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            bot = RemotePlayer(self.connection.name, self.connection, game_id, self.timeout,
+                               size=self.size, fleet=self.fleet)
+            local = self.opponent_class(self.opponent_class.__name__, size=self.size, fleet=self.fleet)
+            # Alternate who moves first, as tournaments do
+            game = Game(bot, local, seed=seed) if game_id % 2 == 0 else Game(local, bot, seed=seed)
+            winner, forfeit = await play_async(game)
+            bot.end("FORFEIT" if forfeit else "WIN" if winner is bot else "LOSS")
+            self.games += 1
+            self.turns += game.turn_count
+            if winner is bot:
+                self.bot_wins += 1
+            if forfeit:
+                self.forfeits += 1
+
+    async def run(self, games: int, seed: Optional[int] = None):
+        """Plays games against the bot, at most concurrency at a time on this event loop."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        seeds = game_seeds(derive_seeds(seed, 1)[0])
+        await asyncio.gather(*(self._play_one(i, next(seeds), semaphore) for i in range(games)))
+
+    def report(self) -> List[str]:
+        latency = self.connection.latency_summary()
+        games = max(1, self.games)
+        return [
+            f"{self.connection.name} vs {self.opponent_class.__name__}: {self.games} games",
+            f"{self.connection.name} Wins: {self.bot_wins} ({self.bot_wins / games:.1%}), "
+            f"forfeits: {self.forfeits} ({self.connection.timeouts} timeouts, {self.connection.errors} protocol errors)",
+            f"Average Turns per Game: {self.turns / games:.1f}",
+            f"Move Latency ({latency['moves']} moves): p50 {latency['p50_us']:.1f}us  p90 {latency['p90_us']:.1f}us"
+            f"  p99 {latency['p99_us']:.1f}us  max {latency['max_us']:.1f}us",
+        ]
+
+async def accept_bot(host: str, port: int) -> BotConnection:
+    """Waits for one bot to connect over TCP."""
+    connected: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    async def on_connect(reader, writer):
+        if not connected.done():
+            connected.set_result(BotConnection(reader, writer))
+        else:
+            writer.close()
+
+    server = await asyncio.start_server(on_connect, host, port)
+    async with server:
+        print(f"Waiting for a bot on {host}:{port}")
+        return await connected
+
+async def main(args):
+    if args.listen:
+        host, _, port = args.listen.rpartition(":")
+        connection = await accept_bot(host or "127.0.0.1", int(port))
+    else:
+        connection = await BotConnection.spawn(args.bot)
+    await connection.handshake(args.handshake_timeout)
+
+    server = MatchServer(connection, PLAYER_CLASSES[args.opponent], args.timeout, args.concurrency,
+                         args.size, args.fleet)
+    print(f"Playing {args.iterations} games: {connection.name} vs {args.opponent} "
+          f"(up to {args.concurrency} at once, {args.timeout * 1000:.0f}ms per move)")
+    start_time = time.time()
+    await server.run(args.iterations, args.seed)
+    elapsed = time.time() - start_time
+    await connection.close()
+
+    print("-" * 30)
+    print(f"Results ({elapsed:.2f}s):")
+    for line in server.report():
+        print(line)
+    print("-" * 30)
+
+PLAYER_CLASSES = {cls.__name__: cls for cls in (RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play an external bot process against a built-in strategy")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--bot", default="python bot.py", help="Command that starts the bot (talks over stdin/stdout)")
+    source.add_argument("--listen", default=None, help="Instead wait for a bot to connect to HOST:PORT")
+    parser.add_argument("--opponent", choices=sorted(PLAYER_CLASSES), default=HuntTargetPlayer.__name__, help="Built-in strategy to play against")
+    parser.add_argument("-n", "--iterations", type=int, default=1000, help="Number of games")
+    parser.add_argument("-c", "--concurrency", type=int, default=200, help="Games in flight at once")
+    parser.add_argument("-t", "--timeout", type=float, default=1.0, help="Seconds a bot has for each move, from when its request is written")
+    parser.add_argument("--handshake-timeout", type=float, default=10.0, help="Seconds to wait for the bot's HELLO")
+    parser.add_argument("--size", type=int, default=None, help=f"Board width and height (default {Board.SIZE})")
+    parser.add_argument("--fleet", type=parse_fleet, default=None, help='Ship lengths, e.g. "5,4,3,3,2"')
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Master seed for board layouts and the built-in strategy")
+    asyncio.run(main(parser.parse_args()))
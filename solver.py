@@ -0,0 +1,282 @@
+"""
+Offline expected-shots solver for small boards.
+
+Enumerates every fleet configuration as per-ship cell bitmasks, then searches
+for the shot policy that minimises the expected number of shots needed to sink
+the whole fleet, with layouts weighted as Board.place_ships_randomly draws them.
+The policy is written as a policy.PolicyTable for TablePlayer.
+
+The exact search is only practical on tiny boards: 4x4 with one ship takes
+seconds, 4x4 with ships 3 and 2 takes minutes, and 5x5 with two ships does not
+finish. Larger boards need --width, which caps the cells tried per state.
+
+    python solver.py --size 4 --fleet 3 -o policy-4x4.bin
+    python solver.py --size 5 --fleet 3,2 --width 2 -o policy-5x5.bin
+"""
+import argparse
+import math
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from board import Board, Fleet, parse_fleet
+from placements import placement_table
+from policy import PolicyTable, State
+from seeding import derive_seeds, game_seeds, spawn_rngs
+
+# Layout ids still consistent with what has been observed, in ascending order
+Belief = Tuple[int, ...]
+
+def enumerate_layouts(size: int, lengths: Sequence[int]) -> Tuple[List[Tuple[int, ...]], List[float]]:
+    """
+    Every fleet configuration as a tuple of per-ship cell bitmasks, with its
+    probability under sample_layout (each ship uniform over the placements left
+    by the ships before it). Configurations that differ only by which of two
+    equal-length ships is where are merged, since no shot result tells them apart.
+    """
+    masks = [placement_table(size, length).masks for length in lengths]
+    weights: Dict[Tuple[int, ...], float] = {}
+
+    def place(i: int, occupied: int, ships: Tuple[int, ...], p: float):
+        if i == len(masks):
+            key = tuple(sorted(ships))
+            weights[key] = weights.get(key, 0.0) + p
+            return
+        legal = [mask for mask in masks[i] if not mask & occupied]
+        for mask in legal:
+            place(i + 1, occupied | mask, ships + (mask,), p / len(legal))
+
+    place(0, 0, (), 1.0)
+    # Prefixes with no legal placement left (where sample_layout raises) are dropped
+    total = sum(weights.values())
+    layouts = sorted(weights)
+    return layouts, [weights[layout] / total for layout in layouts]
+
+class Solver:
+    """
+    Memoised search over (cells shot, layouts still possible).
+
+    Every shot splits the belief into the layouts that answer MISS, HIT, SUNK
+    or end the game, so the expected shots of a state is 1 plus the
+    probability-weighted values of the non-final outcomes, minimised over
+    cells. With width 0 every cell that could hit is tried and the result is
+    exact; a positive width tries only that many of the likeliest cells.
+    Pruning keeps the exact search tractable:
+    - A cell every remaining layout covers is shot at once.
+    - Once one layout is left, its unshot cells are the remaining shots.
+    - Branch and bound: a candidate is abandoned as soon as a lower bound on
+      its value (each open branch needs at least its expected number of unshot
+      ship cells) reaches the best value found, and each child search gets the
+      budget left over, recording a lower bound when it runs out.
+    """
+
+    def __init__(self, size: int, lengths: Sequence[int], width: int = 0):
+        self.size = size
+        self.lengths = tuple(lengths)
+        self.width = width
+        self.ships, self.weights = enumerate_layouts(size, lengths)
+        self.occupied = [sum(ships) for ships in self.ships]
+        # Per cell, the mask of the ship covering it in each layout (0 if none)
+        self.cover: List[List[int]] = [[0] * len(self.ships) for _ in range(size * size)]
+        for i, ships in enumerate(self.ships):
+            for ship in ships:
+                left = ship
+                while left:
+                    low = left & -left
+                    self.cover[low.bit_length() - 1][i] = ship
+                    left ^= low
+        # Solved states as (expected shots, best cell), and lower bounds for states cut off early
+        self.memo: Dict[Tuple[int, Belief], Tuple[float, int]] = {}
+        self.bounds: Dict[Tuple[int, Belief], float] = {}
+
+    def root(self) -> Belief:
+        return tuple(range(len(self.ships)))
+
+    def split(self, shot: int, belief: Belief, cell: int):
+        """
+        The outcomes of shooting cell: (miss, hit, sunk) as (layouts, weight,
+        weighted count of ship cells left) each. Layouts where the shot wins are dropped.
+        """
+        unshot = ~(shot | (1 << cell))
+        occupied, weights, cover = self.occupied, self.weights, self.cover[cell]
+        outcomes = [[[], 0.0, 0.0], [[], 0.0, 0.0], [[], 0.0, 0.0]]
+        miss, hit, sunk = outcomes
+        for i in belief:
+            left = occupied[i] & unshot
+            ship = cover[i]
+            if not ship:
+                outcome = miss
+            elif not left:
+                continue
+            else:
+                outcome = hit if ship & unshot else sunk
+            weight = weights[i]
+            outcome[0].append(i)
+            outcome[1] += weight
+            outcome[2] += weight * left.bit_count()
+        return outcomes
+
+    def key(self, shot: int, belief: Belief) -> Tuple[int, Belief]:
+        """Memo key: shots outside every remaining layout cannot change the value, so they are dropped."""
+        union = 0
+        for i in belief:
+            union |= self.occupied[i]
+        return shot & union, belief
+
+    def solve(self, shot: int = 0, belief: Optional[Belief] = None, cutoff: float = math.inf) -> float:
+        """
+        Expected shots still needed from this state under the best policy, if
+        that is below cutoff; otherwise some lower bound on it that is at least cutoff.
+        """
+        if belief is None:
+            belief = self.root()
+        key = self.key(shot, belief)
+        found = self.memo.get(key)
+        if found is not None:
+            return found[0]
+        known = self.bounds.get(key, 0.0)
+        if known >= cutoff:
+            return known
+
+        occupied = self.occupied
+        if len(belief) == 1:
+            left = occupied[belief[0]] & ~shot
+            found = (float(left.bit_count()), (left & -left).bit_length() - 1)
+            self.memo[key] = found
+            return found[0]
+
+        weights = self.weights
+        marginal = [0.0] * (self.size * self.size)
+        total = 0.0
+        common = ~0
+        for i in belief:
+            left = occupied[i] & ~shot
+            common &= left
+            weight = weights[i]
+            total += weight
+            while left:
+                low = left & -left
+                marginal[low.bit_length() - 1] += weight
+                left ^= low
+
+        if common:
+            cells = [(common & -common).bit_length() - 1]
+        else:
+            cells = sorted((c for c, p in enumerate(marginal) if p > 0), key=lambda c: -marginal[c])
+        # Cells that split the belief the same way are interchangeable, so only the first is searched
+        candidates = []
+        seen = set()
+        for cell in cells:
+            outcomes = self.split(shot, belief, cell)
+            signature = tuple(tuple(layouts) for layouts, _, _ in outcomes)
+            if signature not in seen:
+                seen.add(signature)
+                candidates.append((cell, outcomes))
+                if len(candidates) == self.width:
+                    break
+
+        best, best_cell = math.inf, candidates[0][0]
+        # Lowest lower bound among candidates cut off before being solved
+        floor = math.inf
+        for cell, outcomes in candidates:
+            limit = min(best, cutoff)
+            after = shot | (1 << cell)
+            outcomes = [(layouts, weight / total, cells_left / total)
+                        for layouts, weight, cells_left in outcomes if layouts]
+            # Every unshot ship cell costs a shot, so expected cells left bound the outcomes not yet solved
+            rest = sum(bound for _, _, bound in outcomes)
+            value = 1.0
+            solved = True
+            for layouts, p, bound in outcomes:
+                if value + rest >= limit:
+                    solved = False
+                    break
+                rest -= bound
+                # Only a child value below its share of the remaining budget can matter
+                budget = (limit - value - rest) / p
+                child = self.solve(after, tuple(layouts), budget)
+                value += p * child
+                if child >= budget:
+                    solved = False
+                    break
+            if solved and value < limit:
+                best, best_cell = value, cell
+            elif limit == cutoff:
+                floor = min(floor, value + rest)
+
+        if best < cutoff:
+            self.memo[key] = (best, best_cell)
+            return best
+        self.bounds[key] = floor
+        return floor
+
+    def policy(self) -> Dict[State, int]:
+        """The best cell for every state the solved policy can reach, keyed by (shot, hit, sunk) masks."""
+        self.solve()
+        table: Dict[State, int] = {}
+        stack = [(0, 0, 0, self.root())]
+        while stack:
+            shot, hit, sunk, belief = stack.pop()
+            self.solve(shot, belief)
+            cell = self.memo[self.key(shot, belief)][1]
+            table[(shot, hit, sunk)] = cell
+            bit = 1 << cell
+            miss_branch, hit_branch, sunk_branch = self.split(shot, belief, cell)
+            for (layouts, _, _), hit_mask, sunk_mask in ((miss_branch, hit, sunk), (hit_branch, hit | bit, sunk),
+                                                         (sunk_branch, hit | bit, sunk | bit)):
+                if layouts:
+                    stack.append((shot | bit, hit_mask, sunk_mask, tuple(layouts)))
+        return table
+
+def solo_shots(player_class: type, size: int, fleet: Fleet, games: int, seed: Optional[int] = None,
+               engine=None) -> float:
+    """Average shots a strategy takes to sink a randomly placed fleet, with no opponent."""
+    seeds = game_seeds(derive_seeds(seed, 1)[0])
+    shots = 0
+    for _ in range(games):
+        shooter_rng, board_rng = spawn_rngs(next(seeds), 2)
+        shooter = player_class(player_class.__name__, shooter_rng, size, fleet, engine)
+        target = Board(board_rng, size, fleet)
+        target.place_ships_randomly()
+        while target.remaining:
+            x, y = shooter.get_shot()
+            shooter.inform_result(x, y, target.receive_shot(x, y))
+            shots += 1
+    return shots / games
+
+if __name__ == "__main__":
+    from player import Engine, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer, TablePlayer
+
+    parser = argparse.ArgumentParser(description="Solve small boards for the expected-shots-minimising policy")
+    parser.add_argument("--size", type=int, default=4, help="Board width and height (up to 8; an exact search is practical up to 4x4)")
+    parser.add_argument("--fleet", type=parse_fleet, default=parse_fleet("3"), help='Ship lengths, e.g. "3,2"')
+    parser.add_argument("--width", type=int, default=0, help="Try only this many likeliest cells per state (0: all, exact; "
+                        "needed beyond 4x4 with one ship: 2 solves 5x5 with ships 3,2 in seconds)")
+    parser.add_argument("-o", "--output", default=None, help="Write the policy table to this file")
+    parser.add_argument("--compare", type=int, default=2000, metavar="GAMES", help="Games to estimate each heuristic's shots over (0 skips)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed for the comparison games")
+    args = parser.parse_args()
+
+    lengths = [length for _, length in args.fleet]
+    if args.size * args.size > 64 or max(lengths) > args.size:
+        parser.error("The solver supports boards up to 8x8 whose ships fit on them.")
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * args.size * args.size + 100))
+
+    start = time.time()
+    solver = Solver(args.size, lengths, args.width)
+    print(f"{args.size}x{args.size}, fleet {','.join(map(str, lengths))}: {len(solver.ships)} fleet configurations")
+    expected = solver.solve()
+    policy = solver.policy()
+    kind = "exact optimum" if not args.width else f"best with width {args.width}"
+    print(f"Expected shots ({kind}): {expected:.4f}")
+    print(f"Solved in {time.time() - start:.2f}s: {len(solver.memo)} states searched, {len(policy)} in the policy")
+
+    if args.output:
+        PolicyTable.save(args.output, args.size, lengths, expected, policy)
+        print(f"Wrote policy table to {args.output}")
+
+    if args.compare:
+        engine = Engine(policy_path=args.output)
+        classes = [HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer] + ([TablePlayer] if args.output else [])
+        for cls in classes:
+            shots = solo_shots(cls, args.size, args.fleet, args.compare, args.seed, engine)
+            print(f"{cls.__name__:<26} {shots:>8.3f} shots  ({shots - expected:+.3f} vs the policy, {args.compare} games)")
@@ -0,0 +1,8 @@
+from typing import List
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank q-th percentile of already sorted values; 0.0 when there are none."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
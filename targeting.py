@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
+
+@lru_cache(maxsize=None)
+def neighbor_table(size: int) -> List[Tuple[Tuple[Tuple[int, int], int], ...]]:
+    """Per cell index, the on-board ((x, y), index) neighbors in up, down, left, right order."""
+    table = []
+    for cell in range(size * size):
+        x, y = cell % size, cell // size
+        table.append(tuple(((nx, ny), ny * size + nx)
+                           for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                           if 0 <= nx < size and 0 <= ny < size))
+    return table
+
+class TargetEngine:
+    """
+    Target mode shared by the strategies: picks the next shot around the open
+    hits (hits not yet attributed to a sunk ship).
+
+    Open hits are grouped into clusters of orthogonally connected cells, and the
+    largest cluster is finished first. A straight cluster is a line of one ship:
+    its two endpoints are scored by how many placements of the remaining ship
+    lengths could extend the line through them, given the free cells beyond
+    each end, and the higher one is shot first. Once no remaining ship fits the
+    line (both ends blocked, or the line is longer than any ship left, so it
+    must be several adjacent ships side by side), or the cluster is bent, each
+    hit is scored on its own along both axes, which brings in the perpendicular
+    cells of adjacent ships.
+
+    The engine holds only per-size tables and is shared by every player of that size.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._neighbors = neighbor_table(size)
+
+    def clusters(self, hits: Collection[int]) -> List[List[int]]:
+        """Open hit cells grouped into connected clusters, largest (then lowest cell) first."""
+        if len(hits) == 1:
+            return [list(hits)]
+        left = set(hits)
+        clusters = []
+        while left:
+            start = min(left)
+            left.discard(start)
+            cluster, frontier = [start], [start]
+            while frontier:
+                for _, cell in self._neighbors[frontier.pop()]:
+                    if cell in left:
+                        left.discard(cell)
+                        cluster.append(cell)
+                        frontier.append(cell)
+            clusters.append(sorted(cluster))
+        clusters.sort(key=lambda cluster: (-len(cluster), cluster[0]))
+        return clusters
+
+    def score_line(self, scores: Dict[int, int], first: int, last: int, horizontal: bool,
+                   shots_fired: Collection[int], hits: Collection[int], lengths: Dict[int, int]):
+        """
+        Adds to scores, for the unshot cell just before first and just after
+        last, the number of placements of the remaining ships that cover the
+        whole line first..last and that cell without crossing a miss or sunk ship.
+        """
+        size = self.size
+        step = 1 if horizontal else size
+        # Positions along the axis, and how far a ship could extend the line either way
+        start, end = (first % size, last % size) if horizontal else (first // size, last // size)
+        reach = max(lengths) - (end - start + 1)
+        if reach <= 0:
+            return
+        before = 0
+        limit = reach if reach < start else start
+        cell = first - step
+        while before < limit and (cell not in shots_fired or cell in hits):
+            before += 1
+            cell -= step
+        after = 0
+        limit = reach if reach < size - 1 - end else size - 1 - end
+        cell = last + step
+        while after < limit and (cell not in shots_fired or cell in hits):
+            after += 1
+            cell += step
+
+        votes_before = votes_after = 0
+        for length, count in lengths.items():
+            # Start positions low..high of the placements of this length covering the line;
+            # those up to start - 1 cover the cell before it, those from end - length + 2 the cell after
+            low = end - length + 1
+            if low < start - before:
+                low = start - before
+            high = end + after - length + 1
+            if high > start:
+                high = start
+            if low > high:
+                continue
+            if low < start:
+                votes_before += count * ((high if high < start else start - 1) - low + 1)
+            if high > end - length + 1:
+                votes_after += count * (high - (low if low > end - length + 1 else end - length + 2) + 1)
+        if votes_before and first - step not in shots_fired:
+            scores[first - step] = scores.get(first - step, 0) + votes_before
+        if votes_after and last + step not in shots_fired:
+            scores[last + step] = scores.get(last + step, 0) + votes_after
+
+    def next_target(self, shots_fired: Collection[int], open_hits: Collection[int],
+                    remaining_lengths: Sequence[int], rng) -> Optional[Tuple[int, int]]:
+        """
+        The next target-mode shot, or None when there is nothing left to target
+        (no open hits, or none with an unshot cell next to it).
+        """
+        if not open_hits:
+            return None
+        size = self.size
+        hits = open_hits
+        # Ships of each remaining length; two ships of a length are two chances for each placement
+        lengths: Dict[int, int] = {}
+        for length in remaining_lengths:
+            lengths[length] = lengths.get(length, 0) + 1
+        for cluster in self.clusters(hits):
+            scores: Dict[int, int] = {}
+            if lengths:
+                first, last = cluster[0], cluster[-1]
+                horizontal = first // size == last // size
+                if len(cluster) > 1 and (horizontal or first % size == last % size):
+                    self.score_line(scores, first, last, horizontal, shots_fired, hits, lengths)
+                if not scores:
+                    for hit in cluster:
+                        self.score_line(scores, hit, hit, True, shots_fired, hits, lengths)
+                        self.score_line(scores, hit, hit, False, shots_fired, hits, lengths)
+            if not scores:
+                # No remaining ship explains the cluster (e.g. a mis-attributed sinking): try its neighbors
+                for hit in cluster:
+                    for _, cell in self._neighbors[hit]:
+                        if cell not in shots_fired:
+                            scores[cell] = 1
+            if scores:
+                best = max(scores.values())
+                cells = [cell for cell, score in scores.items() if score == best]
+                cell = cells[0] if len(cells) == 1 else rng.choice(sorted(cells))
+                return cell % size, cell // size
+        return None
+
+@lru_cache(maxsize=None)
+def target_engine(size: int) -> TargetEngine:
+    """Module-level cache: one engine per board size per process."""
+    return TargetEngine(size)
@@ -0,0 +1,22 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch import run_batch
+from parallel import run_parallel
+from player import HuntTargetPlayer, HuntTargetPlayerMore
+
+GAMES = 2000
+# Per-game turns have a standard deviation of about 20, so over GAMES games the two
+# means differ by about 0.65 turns (one sigma) by chance. The neighbor-stack target
+# mode the batch engine used to play was about 7 turns slower than targeting.TargetEngine.
+TOLERANCE = 2.0
+
+@pytest.mark.parametrize("p1_class, p2_class", [
+    (HuntTargetPlayer, HuntTargetPlayerMore),
+    (HuntTargetPlayerMore, HuntTargetPlayerMore),
+])
+def test_batch_mean_turns_match_scalar(p1_class, p2_class):
+    batch = run_batch(p1_class, p2_class, GAMES, seed=11)
+    scalar = run_parallel(p1_class, p2_class, GAMES, workers=1, seed=11)
+    assert batch["total_turns"] / GAMES == pytest.approx(scalar["total_turns"] / GAMES, abs=TOLERANCE)
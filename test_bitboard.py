@@ -0,0 +1,39 @@
+import pytest
+
+from bitboard import BitBoard
+from board import Board, parse_fleet
+from game import Game
+from placements import LayoutPool
+from player import (Engine, HuntTargetPlayer, HuntTargetPlayerMore, ProbabilityDensityPlayer,
+                    RandomPlayer)
+
+GAMES = 40
+
+def play_games(p1_class, p2_class, engine, size=None, fleet=None):
+    """Records and shot-by-shot moves of GAMES seeded games, reusing the players as main.py does."""
+    p1 = p1_class(p1_class.__name__, size=size, fleet=fleet, engine=engine)
+    p2 = p2_class(p2_class.__name__, size=size, fleet=fleet, engine=engine)
+    games = []
+    for seed in range(GAMES):
+        if games:
+            p1.reset()
+            p2.reset()
+        game = Game(p1, p2, seed=seed, record_moves=True)
+        game.play()
+        games.append((game.record, game.moves))
+    return games
+
+@pytest.mark.parametrize("p1_class, p2_class", [
+    (RandomPlayer, HuntTargetPlayer),
+    (HuntTargetPlayerMore, ProbabilityDensityPlayer),
+])
+def test_bitboard_plays_the_same_games(p1_class, p2_class):
+    assert (play_games(p1_class, p2_class, Engine(board_class=Board))
+            == play_games(p1_class, p2_class, Engine(board_class=BitBoard)))
+
+def test_bitboard_plays_the_same_games_with_custom_fleet_and_layout_pool():
+    size, fleet = 7, parse_fleet("4,3,3,2")
+    pool = LayoutPool.generate(size, [length for _, length in fleet], 50)
+    for board_engine in (lambda cls: Engine(board_class=cls), lambda cls: Engine(board_class=cls, layout_pool=pool)):
+        assert (play_games(HuntTargetPlayerMore, ProbabilityDensityPlayer, board_engine(Board), size, fleet)
+                == play_games(HuntTargetPlayerMore, ProbabilityDensityPlayer, board_engine(BitBoard), size, fleet))
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from candidates import DistanceField, FitIndex
+
+def scan_farthest(size, fired):
+    """The original max_distance_probe scan: unfired cells with the largest Manhattan distance to any shot."""
+    best, best_dist = [], -1
+    for x in range(size):
+        for y in range(size):
+            if (x, y) in fired:
+                continue
+            dist = min(abs(x - sx) + abs(y - sy) for sx, sy in fired)
+            if dist > best_dist:
+                best, best_dist = [(x, y)], dist
+            elif dist == best_dist:
+                best.append((x, y))
+    return best
+
+def scan_fit(size, k, fired):
+    """The original min_length_probe scan: unfired cells in x-major order with an open k-window through them."""
+    candidates = []
+    for x in range(size):
+        for y in range(size):
+            if (x, y) in fired:
+                continue
+            h_fit = any(all((cx, y) not in fired for cx in range(sx, sx + k))
+                        for sx in range(max(0, x - k + 1), min(size - k + 1, x + 1)))
+            v_fit = any(all((x, cy) not in fired for cy in range(sy, sy + k))
+                        for sy in range(max(0, y - k + 1), min(size - k + 1, y + 1)))
+            if h_fit or v_fit:
+                candidates.append((x, y))
+    return candidates
+
+@pytest.mark.parametrize("size, k", [(3, 2), (5, 2), (5, 3), (7, 5), (10, 2), (10, 4), (13, 3)])
+def test_fit_index_matches_scan(size, k):
+    rng = random.Random(size * 100 + k)
+    for _ in range(5):
+        cells = [(x, y) for x in range(size) for y in range(size)]
+        rng.shuffle(cells)
+        index = FitIndex(size, k)
+        fired = set()
+        for cell in cells:
+            expected = scan_fit(size, k, fired)
+            assert index.ordered() == expected
+            state = rng.getstate()
+            picked = index.choice(rng)
+            rng.setstate(state)
+            assert picked == (rng.choice(expected) if expected else None)
+            index.record(*cell)
+            fired.add(cell)
+        assert index.choice(rng) is None
+
+def test_fit_index_built_from_fired_cells():
+    rng = random.Random(3)
+    for size, k in [(6, 2), (10, 3), (10, 5)]:
+        cells = [(x, y) for x in range(size) for y in range(size)]
+        for count in (0, size, size * size // 2, size * size - 1):
+            fired = set(rng.sample(cells, count))
+            index = FitIndex(size, k, fired)
+            expected = scan_fit(size, k, fired)
+            assert index.ordered() == expected
+            state = rng.getstate()
+            picked = index.choice(rng)
+            rng.setstate(state)
+            assert picked == (rng.choice(expected) if expected else None)
+
+@pytest.mark.parametrize("size", [1, 2, 5, 10, 12])
+def test_distance_field_matches_scan(size):
+    rng = random.Random(size)
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    for _ in range(5):
+        rng.shuffle(cells)
+        field = DistanceField(size)
+        # No shots yet: every cell sits in the top bucket at distance 2 * size
+        assert field.farthest() == sorted(cells)
+        fired = set()
+        for cell in cells:
+            field.record(*cell)
+            fired.add(cell)
+            assert field.farthest() == (scan_farthest(size, fired) if len(fired) < len(cells) else [])
+
+def test_distance_field_nearly_full_board():
+    rng = random.Random(7)
+    size = 10
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    for open_cells in (1, 2, 3, 5):
+        fired = set(rng.sample(cells, len(cells) - open_cells))
+        field = DistanceField(size, fired)
+        assert field.farthest() == scan_farthest(size, fired)
+        for cell in sorted(set(cells) - fired):
+            field.record(*cell)
+            fired.add(cell)
+            assert field.farthest() == (scan_farthest(size, fired) if len(fired) < len(cells) else [])
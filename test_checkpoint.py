@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from checkpoint import Checkpointer, load_checkpoint
+from main import run_simulation
+from parallel import run_parallel
+from player import HuntTargetPlayer, HuntTargetPlayerMore
+from results import shard_path
+
+GAMES = 60
+STOP_AFTER = 10
+CONFIG = {"p1": "HuntTargetPlayer", "p2": "HuntTargetPlayerMore", "games": GAMES}
+
+class Stopped(Exception):
+    pass
+
+class StopAfter(Checkpointer):
+    """
+    Checkpoints every game and stops the run, as a crash would, once stop_at
+    games are saved. In a pool only shard 0 raises; the others wait to be
+    terminated, so none is caught halfway through sending back its exception.
+    """
+
+    def __init__(self, path, stop_at, wait=False):
+        super().__init__(path, CONFIG, every_games=1, every_seconds=0)
+        self.stop_at = stop_at
+        self.wait = wait
+
+    def for_shard(self, shard):
+        return StopAfter(shard_path(self.path, shard), self.stop_at, wait=shard != 0)
+
+    def save(self, shards, games=0, complete=False):
+        super().save(shards, games, complete)
+        if not complete and games >= self.stop_at:
+            if self.wait:
+                time.sleep(60)
+            raise Stopped
+
+def shard_totals(path):
+    """Every shard's saved totals and seed position, without the wall-clock time."""
+    data = load_checkpoint(path)
+    assert data["complete"]
+    return {shard: {key: value for key, value in saved.items() if key != "elapsed"}
+            for shard, saved in data["shards"].items()}
+
+def play(path, workers, checkpoint=None, resume=None):
+    checkpoint = checkpoint or Checkpointer(str(path), CONFIG, every_games=1, every_seconds=0)
+    if workers == 1:
+        run_simulation(HuntTargetPlayer, HuntTargetPlayerMore, GAMES, seed=5, final_window=False,
+                       checkpoint=checkpoint, resume=resume)
+        return None
+    summary = run_parallel(HuntTargetPlayer, HuntTargetPlayerMore, GAMES, workers, seed=5,
+                           checkpoint=checkpoint, resume=resume)
+    return {key: summary[key] for key in ("iterations", "p1_wins", "p2_wins", "total_turns")}
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_resumed_run_matches_clean_run(tmp_path, workers):
+    clean = play(tmp_path / "clean.json", workers)
+
+    stopped = tmp_path / "stopped.json"
+    with pytest.raises(Stopped):
+        play(stopped, workers, StopAfter(str(stopped), STOP_AFTER))
+    saved = load_checkpoint(str(stopped))
+    assert not saved["complete"]
+    # Serial runs keep their one shard in the run's file; workers keep theirs in shard files.
+    # The pool is torn down as soon as shard 0 stops, so the others may stop a few games short.
+    partial = [saved] if workers == 1 else [load_checkpoint(shard_path(str(stopped), i)) for i in range(workers)
+                                            if os.path.exists(shard_path(str(stopped), i))]
+    games = [next(iter(data["shards"].values()))["games"] for data in partial]
+    assert max(games) == STOP_AFTER and all(0 < n <= STOP_AFTER for n in games)
+    resumed = play(stopped, workers, resume=saved)
+
+    assert resumed == clean
+    assert shard_totals(str(stopped)) == shard_totals(str(tmp_path / "clean.json"))
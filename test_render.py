@@ -0,0 +1,111 @@
+import random
+import struct
+
+import pytest
+
+from render import TRANSPARENT, encode_gif, lzw_encode
+
+def lzw_decode(data: bytes, min_code_size: int) -> bytes:
+    """A plain GIF LZW decoder, as an image viewer would run it."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    bits = int.from_bytes(data, "little")
+    pos = 0
+    out = bytearray()
+    width = min_code_size + 1
+    table, prev = [], None
+    while True:
+        assert pos + width <= 8 * len(data), "ran out of data before the end code"
+        code = bits >> pos & ((1 << width) - 1)
+        pos += width
+        if code == clear:
+            table = [bytes([i]) for i in range(clear)] + [b"", b""]
+            width = min_code_size + 1
+            prev = None
+            continue
+        if code == end:
+            break
+        assert table, "data does not start with a clear code"
+        if prev is None:
+            entry = table[code]
+        elif code < len(table):
+            entry = table[code]
+            if len(table) < 4096:
+                table.append(prev + entry[:1])
+        else:
+            assert code == len(table)
+            entry = prev + prev[:1]
+            table.append(entry)
+        out += entry
+        prev = entry
+        if len(table) == 1 << width and width < 12:
+            width += 1
+    # Only padding bits may follow the end code
+    assert len(data) == (pos + 7) // 8
+    return bytes(out)
+
+def sub_blocks(gif: bytes, pos: int):
+    """The joined data of a run of GIF sub-blocks at pos, and the position after its terminator."""
+    data = bytearray()
+    while gif[pos]:
+        data += gif[pos + 1:pos + 1 + gif[pos]]
+        pos += 1 + gif[pos]
+    return bytes(data), pos + 1
+
+def decode_gif(gif: bytes):
+    """The screen size and (left, top, width, height, pixels, delay) of every frame."""
+    assert gif[:6] == b"GIF89a"
+    width, height, flags = struct.unpack("<HHB", gif[6:11])
+    assert flags & 0x80
+    pos = 13 + 3 * (2 << (flags & 7))
+    frames, delay = [], None
+    while gif[pos] != 0x3B:
+        if gif[pos] == 0x21:
+            if gif[pos + 1] == 0xF9:
+                delay, transparent = struct.unpack("<HB", gif[pos + 4:pos + 7])
+                assert transparent == TRANSPARENT
+            _, pos = sub_blocks(gif, pos + 2)
+        else:
+            assert gif[pos] == 0x2C
+            left, top, frame_width, frame_height, _ = struct.unpack("<HHHHB", gif[pos + 1:pos + 10])
+            min_code_size = gif[pos + 10]
+            data, pos = sub_blocks(gif, pos + 11)
+            frames.append((left, top, frame_width, frame_height, lzw_decode(data, min_code_size), delay))
+    assert pos == len(gif) - 1
+    return (width, height), frames
+
+def random_bytes(rng, n, colors):
+    return bytes(rng.randrange(colors) for _ in range(n))
+
+def run_bytes(rng, n, colors, longest):
+    data = bytearray()
+    while len(data) < n:
+        data += bytes([rng.randrange(colors)]) * rng.randint(1, longest)
+    return bytes(data[:n])
+
+@pytest.mark.parametrize("min_code_size", [2, 3, 4, 8])
+def test_lzw_round_trips(min_code_size):
+    rng = random.Random(min_code_size)
+    colors = 1 << min_code_size
+    inputs = [bytes([0]), bytes([colors - 1]) * 2, bytes(range(colors))]
+    for n in (10, 1000, 20000):
+        inputs.append(random_bytes(rng, n, colors))
+        inputs.append(run_bytes(rng, n, colors, 40))
+        inputs.append(run_bytes(rng, n, min(colors, 3), 3000))
+    # Runs long enough to fill the code table and force clear codes
+    inputs.append(bytes([1]) * 200000)
+    inputs.append(run_bytes(rng, 200000, colors, 5000) + random_bytes(rng, 30000, colors))
+    for data in inputs:
+        assert lzw_decode(lzw_encode(data, min_code_size), min_code_size) == data
+
+def test_gif_decodes_to_its_frames():
+    rng = random.Random(1)
+    palette = [(i, 255 - i, i // 2) for i in range(0, 256, 16)]
+    frames = [(0, 0, 60, 40, run_bytes(rng, 60 * 40, len(palette), 200), 8)]
+    for delay in (8, 8, 200):
+        left, top = rng.randrange(50), rng.randrange(30)
+        width, height = rng.randint(1, 60 - left), rng.randint(1, 40 - top)
+        frames.append((left, top, width, height, random_bytes(rng, width * height, len(palette)), delay))
+    gif = encode_gif(60, 40, palette, frames)
+    assert gif.endswith(b"\x3b")
+    assert decode_gif(gif) == ((60, 40), frames)
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import shlex
+import sys
+
+from board import parse_fleet
+from player import RandomPlayer
+from server import BotConnection, MatchServer
+
+BOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+
+def play(delay, timeout, games, concurrency):
+    """A match against bot.py thinking delay seconds per move; returns the server after it finishes."""
+    async def run():
+        connection = await BotConnection.spawn(f"{shlex.quote(sys.executable)} {shlex.quote(BOT)} --delay {delay}")
+        await connection.handshake(30.0)
+        server = MatchServer(connection, RandomPlayer, timeout, concurrency, size=5, fleet=parse_fleet("3,2"))
+        await server.run(games, seed=1)
+        await connection.close()
+        return server
+    return asyncio.run(run())
+
+def test_slow_bot_forfeits():
+    server = play(delay=0.5, timeout=0.1, games=3, concurrency=3)
+    assert server.games == 3
+    assert server.forfeits == 3
+    assert server.connection.timeouts == 3
+    assert server.connection.latencies_ns == []
+
+def test_queued_requests_do_not_count_against_the_deadline():
+    # Six games in flight queue up to six moves of 0.04s, longer than the timeout,
+    # but each move's clock starts only when its request is written to the bot
+    server = play(delay=0.04, timeout=0.2, games=6, concurrency=6)
+    assert server.games == 6
+    assert server.forfeits == 0
+    latency = server.connection.latency_summary()
+    assert 40000 <= latency["p50_us"] < 200000
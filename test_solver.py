@@ -0,0 +1,63 @@
+import pytest
+
+from board import Board, parse_fleet
+from enums import ShotResult
+from player import Engine, TablePlayer
+from policy import PolicyTable
+from seeding import spawn_rngs
+from solver import Solver, solo_shots
+
+SIZE = 4
+FLEET = parse_fleet("3")
+
+@pytest.fixture(scope="module")
+def solved(tmp_path_factory):
+    """The exact 4x4 policy for one 3-ship, and the table file it was saved to."""
+    solver = Solver(SIZE, [3])
+    expected = solver.solve()
+    policy = solver.policy()
+    path = str(tmp_path_factory.mktemp("policy") / "policy.bin")
+    PolicyTable.save(path, SIZE, [3], expected, policy)
+    return expected, policy, path
+
+def test_policy_table_round_trips(solved):
+    expected, policy, path = solved
+    table = PolicyTable.load(path)
+    assert (table.size, table.lengths, table.expected_shots) == (SIZE, (3,), expected)
+    for state, cell in policy.items():
+        assert table.lookup(state) == cell
+    # Every cell shot without a hit can never happen, so it is not in the table
+    unreachable = ((1 << SIZE * SIZE) - 1, 0, 0)
+    assert unreachable not in policy
+    assert table.lookup(unreachable) is None
+
+def test_table_player_plays_the_stored_policy(solved):
+    _, policy, path = solved
+    for seed in range(50):
+        shooter_rng, board_rng = spawn_rngs(seed, 2)
+        player = TablePlayer("TablePlayer", shooter_rng, SIZE, FLEET, Engine(policy_path=path))
+        target = Board(board_rng, SIZE, FLEET)
+        target.place_ships_randomly()
+        shot = hit = sunk = 0
+        while target.remaining:
+            x, y = player.get_shot()
+            cell = y * SIZE + x
+            assert cell == policy[(shot, hit, sunk)]
+            result = target.receive_shot(x, y)
+            player.inform_result(x, y, result)
+            bit = 1 << cell
+            shot |= bit
+            if result in (ShotResult.HIT, ShotResult.SUNK):
+                hit |= bit
+            if result == ShotResult.SUNK:
+                sunk |= bit
+
+def test_table_player_averages_the_expected_shots(solved):
+    expected, _, path = solved
+    assert solo_shots(TablePlayer, SIZE, FLEET, 2000, seed=1, engine=Engine(policy_path=path)) == pytest.approx(expected, abs=0.1)
+
+def test_table_player_rejects_a_policy_for_another_board(solved):
+    _, _, path = solved
+    player = TablePlayer("TablePlayer", size=5, fleet=FLEET, engine=Engine(policy_path=path))
+    with pytest.raises(ValueError):
+        player.get_shot()
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from player import HuntTargetPlayer, HuntTargetPlayerMore, RandomPlayer
+from tournament import Tournament, pooled_interval, wilson_interval
+
+@pytest.mark.parametrize("wins, games, expected", [
+    (50, 100, (0.4038, 0.5962)),
+    (0, 10, (0.0, 0.2775)),
+    (10, 10, (0.7225, 1.0)),
+    (0, 0, (0.0, 1.0)),
+])
+def test_wilson_interval_known_values(wins, games, expected):
+    assert wilson_interval(wins, games, 1.96) == pytest.approx(expected, abs=1e-4)
+
+def test_pooled_interval_is_centred_on_the_mean_rate():
+    z = 1.96
+    lo, hi = pooled_interval([30, 70], [100, 100], z)
+    assert (lo + hi) / 2 == pytest.approx(0.5)
+    adjusted = [(w + z * z / 2) / (100 + z * z) for w in (30, 70)]
+    sd = math.sqrt(sum(p * (1 - p) / (100 + z * z) for p in adjusted)) / 2
+    assert hi - lo == pytest.approx(2 * z * sd)
+
+def test_pooled_interval_narrows_with_more_games():
+    few = pooled_interval([6, 8], [10, 10], 1.96)
+    many = pooled_interval([600, 800], [1000, 1000], 1.96)
+    assert many[1] - many[0] < (few[1] - few[0]) / 5
+    # A strategy that lost every game still has an interval above zero
+    assert pooled_interval([0, 0], [40, 40], 1.96)[1] > 0
+
+def make_tournament():
+    return Tournament([RandomPlayer, HuntTargetPlayer, HuntTargetPlayerMore], precision=0.05,
+                      confidence_z=1.96, min_games=40, max_games=1000, seed=1)
+
+@pytest.mark.parametrize("games, a_wins, done", [
+    (20, 20, False),   # Decisive, but fewer than min_games
+    (40, 40, True),    # Interval excludes 50%
+    (40, 22, False),   # Close and still wide
+    (800, 400, True),  # Close, but narrower than the precision
+    (300, 150, False), # Close, half-width still above 5%
+])
+def test_check_stops_matchups(games, a_wins, done):
+    tournament = make_tournament()
+    matchup = tournament.matchups[0]
+    matchup.games, matchup.a_wins = games, a_wins
+    tournament._check(matchup)
+    assert matchup.done is done
+
+def test_check_stops_at_max_games():
+    tournament = make_tournament()
+    tournament.max_games = 100
+    matchup = tournament.matchups[0]
+    matchup.games, matchup.a_wins = 99, 50
+    tournament._check(matchup)
+    assert not matchup.done
+    # Still close and far wider than the precision, but out of games
+    matchup.games, matchup.a_wins = 100, 50
+    tournament._check(matchup)
+    assert matchup.done
+
+def test_run_stops_every_matchup():
+    tournament = make_tournament()
+    tournament.run()
+    assert all(m.done and tournament.min_games <= m.games <= tournament.max_games for m in tournament.matchups)
+    ranking = tournament.ranking()
+    assert ranking[-1][0] is RandomPlayer
+    for _, mean, (lo, hi), _ in ranking:
+        assert lo <= mean <= hi
@@ -0,0 +1,49 @@
+from array import array
+
+import pytest
+
+from game import Game
+from player import Engine, HuntTargetPlayer, HuntTargetPlayerMore
+from transposition import TranspositionCache
+
+GAMES = 60
+
+def play_records(engine, p1_class=HuntTargetPlayer, p2_class=HuntTargetPlayerMore):
+    p1 = p1_class(p1_class.__name__, engine=engine)
+    p2 = p2_class(p2_class.__name__, engine=engine)
+    records = []
+    for seed in range(GAMES):
+        if records:
+            p1.reset()
+            p2.reset()
+        game = Game(p1, p2, seed=seed)
+        game.play()
+        records.append(game.record)
+    return records
+
+@pytest.mark.parametrize("max_entries", [200000, 16])
+def test_cache_does_not_change_games(max_entries):
+    cache = TranspositionCache(max_shots=8, max_entries=max_entries)
+    assert play_records(Engine(transposition_cache=cache)) == play_records(Engine())
+    assert cache.hits > 0
+    assert len(cache.entries) <= max_entries
+
+def test_opening_book_does_not_change_games(tmp_path):
+    book = TranspositionCache()
+    play_records(Engine(transposition_cache=book))
+    book.save(tmp_path / "book.bin")
+    loaded = TranspositionCache()
+    loaded.load(tmp_path / "book.bin")
+    assert loaded.entries == book.entries
+    assert play_records(Engine(transposition_cache=loaded)) == play_records(Engine())
+
+def test_lru_evicts_least_recently_used():
+    cache = TranspositionCache(max_entries=2)
+    a, b, c = (1, 10, 2, 0, 1), (1, 10, 2, 1, 2), (1, 10, 2, 2, 3)
+    cache.put(a, array("H", [1]))
+    cache.put(b, array("H", [2]))
+    assert cache.get(a) == array("H", [1])
+    cache.put(c, array("H", [3]))
+    assert list(cache.entries) == [a, c]
+    assert cache.get(b) is None
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,175 @@
+"""
+Adaptive round-robin tournament over every Player strategy.
+
+Matchups are played in blocks. The next block always goes to the unfinished
+matchup with the widest win-rate confidence interval, and a matchup stops as soon
+as its interval excludes 50% (the winner is clear) or its half-width reaches the
+requested precision. Lopsided pairings settle in a few dozen games, and compute
+goes to the strategies that are close.
+"""
+import argparse
+import inspect
+import math
+import time
+from itertools import combinations
+from typing import List, Optional, Tuple
+from game import Game
+from player import Player
+from seeding import derive_seeds, game_seeds
+
+def player_classes() -> List[type]:
+    """Every concrete, selectable Player subclass currently imported."""
+    found = []
+    pending = list(Player.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        pending.extend(cls.__subclasses__())
+        if not inspect.isabstract(cls) and cls.selectable and cls not in found:
+            found.append(cls)
+    return found
+
+def wilson_interval(wins: int, games: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a win rate; well behaved near 0%/100% and for few games."""
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denom
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def pooled_interval(wins: List[int], games: List[int], z: float) -> Tuple[float, float]:
+    """
+    Normal interval for the mean of several independent win rates p_i, with
+    variance sum(p_i * (1 - p_i) / n_i) / k**2. The variance terms use the
+    Agresti-Coull rate (wins + z*z/2) / (n + z*z), so a matchup won or lost
+    every time still adds uncertainty, and one with no games counts as 0.5.
+    """
+    if not games:
+        return 0.0, 1.0
+    k = len(games)
+    mean = sum(won / n if n else 0.5 for won, n in zip(wins, games)) / k
+    variance = 0.0
+    for won, n in zip(wins, games):
+        adjusted = (won + z * z / 2) / (n + z * z)
+        variance += adjusted * (1 - adjusted) / (n + z * z)
+    half = z * math.sqrt(variance) / k
+    return max(0.0, mean - half), min(1.0, mean + half)
+
+class Matchup:
+    def __init__(self, a: type, b: type, seed: int):
+        self.a = a
+        self.b = b
+        self.games = 0
+        self.a_wins = 0
+        self.turns = 0
+        self.done = False
+        self._seeds = game_seeds(seed)
+
+    def play(self, count: int):
+        for _ in range(count):
+            # Alternate who moves first so first-mover advantage cancels out
+            a_first = self.games % 2 == 0
+            first, second = (self.a, self.b) if a_first else (self.b, self.a)
+            p1 = first(first.__name__)
+            p2 = second(second.__name__)
+            game = Game(p1, p2, seed=next(self._seeds))
+            winner = game.play()
+            if (winner is p1) == a_first:
+                self.a_wins += 1
+            self.games += 1
+            self.turns += game.turn_count
+
+    def interval(self, z: float) -> Tuple[float, float]:
+        return wilson_interval(self.a_wins, self.games, z)
+
+class Tournament:
+    def __init__(self, classes: List[type], precision: float = 0.03, confidence_z: float = 2.576,
+                 min_games: int = 40, max_games: int = 5000, block: int = 20, seed: Optional[int] = None):
+        self.classes = classes
+        self.precision = precision
+        # 99% by default: the interval is re-checked after every block, so a
+        # stricter level keeps the chance of stopping on a fluke low
+        self.z = confidence_z
+        self.min_games = min_games
+        self.max_games = max_games
+        self.block = block
+        pairs = list(combinations(classes, 2))
+        self.matchups = [Matchup(a, b, s) for (a, b), s in zip(pairs, derive_seeds(seed, len(pairs)))]
+
+    def _check(self, m: Matchup):
+        if m.games >= self.max_games:
+            m.done = True
+            return
+        if m.games < self.min_games:
+            return
+        lo, hi = m.interval(self.z)
+        if lo > 0.5 or hi < 0.5 or (hi - lo) / 2 <= self.precision:
+            m.done = True
+
+    def run(self, progress=None):
+        while True:
+            pending = [m for m in self.matchups if not m.done]
+            if not pending:
+                return
+            # Widest interval first: that is where another block buys the most information
+            m = max(pending, key=lambda m: m.interval(self.z)[1] - m.interval(self.z)[0])
+            m.play(self.block)
+            self._check(m)
+            if progress:
+                progress(m)
+
+    def ranking(self) -> List[Tuple[type, float, Tuple[float, float], int]]:
+        """(class, mean pairwise win rate, pooled_interval of that mean, games) ordered best first."""
+        rows = []
+        for cls in self.classes:
+            wins, counts = [], []
+            for m in self.matchups:
+                if cls is not m.a and cls is not m.b:
+                    continue
+                wins.append(m.a_wins if cls is m.a else m.games - m.a_wins)
+                counts.append(m.games)
+            rates = [won / games if games else 0.5 for won, games in zip(wins, counts)]
+            mean = sum(rates) / max(1, len(rates))
+            rows.append((cls, mean, pooled_interval(wins, counts, self.z), sum(counts)))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def report(self) -> List[str]:
+        lines = ["Matchups:"]
+        for m in sorted(self.matchups, key=lambda m: m.games, reverse=True):
+            lo, hi = m.interval(self.z)
+            rate = m.a_wins / m.games if m.games else 0.0
+            lines.append(f"  {m.a.__name__:>26} vs {m.b.__name__:<26} {rate:>6.1%} [{lo:.1%}, {hi:.1%}]"
+                         f" {m.games:>6} games  {m.turns / max(1, m.games):>6.1f} turns/game")
+        lines.append("Ranking (mean pairwise win rate and interval):")
+        for rank, (cls, mean, (lo, hi), games) in enumerate(self.ranking(), 1):
+            lines.append(f"  {rank}. {cls.__name__:<26} {mean:>6.1%} [{lo:.1%}, {hi:.1%}] {games:>7} games")
+        return lines
+
+def run_tournament(precision: float = 0.03, confidence_z: float = 2.576, min_games: int = 40,
+                   max_games: int = 5000, block: int = 20, seed: Optional[int] = None) -> Tournament:
+    """Runs a tournament over player_classes() and prints its report."""
+    classes = player_classes()
+    print(f"Tournament: {', '.join(cls.__name__ for cls in classes)}")
+    start_time = time.time()
+    tournament = Tournament(classes, precision, confidence_z, min_games, max_games, block, seed)
+    tournament.run()
+    print("-" * 30)
+    print(f"Results ({time.time() - start_time:.2f}s, {sum(m.games for m in tournament.matchups)} games):")
+    for line in tournament.report():
+        print(line)
+    print("-" * 30)
+    return tournament
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adaptive round-robin tournament over all strategies")
+    parser.add_argument("--precision", type=float, default=0.03, help="Stop a matchup once its interval half-width is this small")
+    parser.add_argument("--min-games", type=int, default=40, help="Games per matchup before early stopping is considered")
+    parser.add_argument("--max-games", type=int, default=5000, help="Hard cap on games per matchup")
+    parser.add_argument("--block", type=int, default=20, help="Games played per scheduling step")
+    parser.add_argument("-z", type=float, default=2.576, help="Interval z-score (2.576 = 99%%)")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Master seed")
+    args = parser.parse_args()
+
+    run_tournament(args.precision, args.z, args.min_games, args.max_games, args.block, args.seed)
@@ -0,0 +1,82 @@
+import random
+import struct
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Key: (probe tag, board size, min ship length or 0, shots fired, Zobrist hash of the fired cells)
+Key = Tuple[int, int, int, int, int]
+
+@lru_cache(maxsize=None)
+def zobrist_table(size: int) -> List[int]:
+    """One fixed 64-bit code per cell; fixed seed so hashes match across processes and books."""
+    rng = random.Random(0x5EED + size)
+    return [rng.getrandbits(64) for _ in range(size * size)]
+
+class TranspositionCache:
+    """
+    LRU-bounded map from a hunt-mode state to its candidate cells.
+
+    Hunt decisions in HuntTargetPlayer/HuntTargetPlayerMore depend only on the
+    fired cells (and the smallest remaining ship), and early-game states repeat
+    across games. Candidates are stored as compact cell arrays in the probe's own
+    order, and callers draw from them with the same rng.choice call as the
+    uncached path, so outcomes do not change. States deeper than max_shots are
+    almost never revisited, so they bypass the cache entirely.
+    """
+    MAGIC = b"BSOB"
+
+    def __init__(self, max_shots: int = 8, max_entries: int = 200000):
+        self.max_shots = max_shots
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Key, array]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Key) -> Optional[array]:
+        found = self.entries.get(key)
+        if found is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return found
+
+    def put(self, key: Key, cells: array):
+        self.entries[key] = cells
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def merge_stats(self, hits: int, misses: int):
+        self.hits += hits
+        self.misses += misses
+
+    def summary(self) -> str:
+        return (f"Transposition Cache: {self.hit_rate():.1%} hit rate "
+                f"({self.hits} hits, {self.misses} misses, {len(self.entries)} entries)")
+
+    def save(self, path: str):
+        """Writes every cached state as an opening book."""
+        with open(path, "wb") as f:
+            entries = list(self.entries.items())
+            f.write(struct.pack("<4sI", self.MAGIC, len(entries)))
+            for (tag, size, min_len, fired, zobrist), cells in entries:
+                f.write(struct.pack("<BHBHQH", tag, size, min_len, fired, zobrist, len(cells)))
+                f.write(struct.pack(f"<{len(cells)}H", *cells))
+
+    def load(self, path: str):
+        """Pre-seeds the cache from an opening book written by save()."""
+        with open(path, "rb") as f:
+            magic, count = struct.unpack("<4sI", f.read(8))
+            if magic != self.MAGIC:
+                raise ValueError(f"{path} is not an opening book file.")
+            header = struct.calcsize("<BHBHQH")
+            for _ in range(count):
+                tag, size, min_len, fired, zobrist, n = struct.unpack("<BHBHQH", f.read(header))
+                cells = array("H", struct.unpack(f"<{n}H", f.read(2 * n)))
+                self.put((tag, size, min_len, fired, zobrist), cells)
@@ -1,79 +1,78 @@
 import tkinter as tk
 import time
 import sys
-from enums import CellState
-
-def draw_board(canvas, board, offset_x, offset_y, cell_size, player_name):
-    # Draw Player Name
-    canvas.create_text(offset_x + (10 * cell_size) / 2, offset_y - 20, 
-                       text=player_name, font=("Arial", 14, "bold"))
-
-    for y in range(10):
-        for x in range(10):
-            x0 = offset_x + x * cell_size
-            y0 = offset_y + y * cell_size
-            x1 = x0 + cell_size
-            y1 = y0 + cell_size
-
-            cell = board.grid[y][x]
-            
-            fill_color = "lightblue" # Empty/Water
-            
-            if cell == CellState.MISS:
-                fill_color = "white"
-            elif cell == CellState.SHIP:
-                fill_color = "gray"
-            elif cell == CellState.HIT:
-                # Check if the ship at this location is sunk
-                if (x, y) in board.ship_map and board.ship_map[(x, y)].is_sunk:
-                    fill_color = "#d32f2f" # Red (Sunk)
-                else:
-                    fill_color = "orange" # Hit
-
-            canvas.create_rectangle(x0, y0, x1, y1, fill=fill_color, outline="black")
-            
-            # Draw simple markers for clarity
-            if cell == CellState.MISS:
-                canvas.create_oval(x0 + 10, y0 + 10, x1 - 10, y1 - 10, outline="black")
-            elif cell == CellState.HIT:
-                canvas.create_line(x0, y0, x1, y1, fill="black")
-                canvas.create_line(x0, y1, x1, y0, fill="black")
-
-def draw_legend(canvas, x, y, size):
-    items = [
-        ("Water", "lightblue", None),
-        ("Ship", "gray", None),
-        ("Miss", "white", "oval"),
-        ("Hit", "orange", "cross"),
-        ("Sunk", "#d32f2f", "cross")
-    ]
-    
-    canvas.create_text(x, y, text="Legend:", font=("Arial", 12, "bold"), anchor="w")
-    
-    start_x = x + 70
-    for label, color, marker in items:
-        canvas.create_rectangle(start_x, y - 10, start_x + size, y - 10 + size, fill=color, outline="black")
-        if marker == "oval":
-            canvas.create_oval(start_x + 4, y - 10 + 4, start_x + size - 4, y - 10 + size - 4, outline="black")
-        elif marker == "cross":
-            canvas.create_line(start_x, y - 10, start_x + size, y - 10 + size, fill="black")
-            canvas.create_line(start_x, y - 10 + size, start_x + size, y - 10, fill="black")
-        canvas.create_text(start_x + size + 5, y, text=label, anchor="w")
-        start_x += 90
+from collections import deque
+from drawing import PADDING, cell_size_for, cell_style, draw_board, draw_legend, window_size
+
+class BoardItems:
+    """
+    Canvas items for one board, created once per game and then restyled in place.
+    Every cell gets a rectangle plus hidden oval and cross items. The first
+    update() styles every cell; later ones restyle only the cell the board's
+    last shot landed on, plus the whole ship when that shot sank it, so
+    update() must see every shot of the game.
+    """
+
+    def __init__(self, canvas, offset_x, offset_y, cell_size, player_name, size=10):
+        self.canvas = canvas
+        self.size = size
+        inset = cell_size // 3
+        canvas.create_text(offset_x + (size * cell_size) / 2, offset_y - 20,
+                           text=player_name, font=("Arial", 14, "bold"))
+        self.items = []
+        self.styles = []
+        for y in range(size):
+            for x in range(size):
+                x0 = offset_x + x * cell_size
+                y0 = offset_y + y * cell_size
+                x1 = x0 + cell_size
+                y1 = y0 + cell_size
+                rect = canvas.create_rectangle(x0, y0, x1, y1, fill="lightblue", outline="black")
+                oval = canvas.create_oval(x0 + inset, y0 + inset, x1 - inset, y1 - inset, outline="black", state="hidden")
+                line1 = canvas.create_line(x0, y0, x1, y1, fill="black", state="hidden")
+                line2 = canvas.create_line(x0, y1, x1, y0, fill="black", state="hidden")
+                self.items.append((rect, oval, line1, line2))
+                self.styles.append(("lightblue", None))
+        self.synced = False
+
+    def update(self, board) -> int:
+        """Restyles the cells changed by the last shot; returns how many were dirty."""
+        ship_at = board._ship_at
+        if not self.synced:
+            self.synced = True
+            cells = range(self.size * self.size)
+        elif board.last_shot is None:
+            return 0
+        else:
+            index = board.last_shot
+            ship = ship_at[index]
+            cells = board.ship_cells(ship) if ship is not None and ship.is_sunk else (index,)
+
+        canvas = self.canvas
+        dirty = 0
+        for index in cells:
+            style = cell_style(board.cell_state(index), ship_at[index])
+            if style == self.styles[index]:
+                continue
+            self.styles[index] = style
+            dirty += 1
+            rect, oval, line1, line2 = self.items[index]
+            fill_color, marker = style
+            canvas.itemconfig(rect, fill=fill_color)
+            canvas.itemconfig(oval, state="normal" if marker == "oval" else "hidden")
+            cross = "normal" if marker == "cross" else "hidden"
+            canvas.itemconfig(line1, state=cross)
+            canvas.itemconfig(line2, state=cross)
+        return dirty
 
 class InteractiveVisualizer:
-    def __init__(self):
+    def __init__(self, size=10):
         self.root = tk.Tk()
         self.root.title("Battleship Play-by-Play (Press Space to Advance)")
         
-        self.cell_size = 30
-        self.padding = 70
-        self.board_pixel_size = 10 * self.cell_size
-        
-        window_width = self.padding * 3 + self.board_pixel_size * 2
-        window_height = self.padding * 2 + self.board_pixel_size + 80
-        
-        self.canvas = tk.Canvas(self.root, width=window_width, height=window_height, bg="#f0f0f0")
+        self.padding = PADDING
+        self.canvas = tk.Canvas(self.root, bg="#f0f0f0")
+        self._set_board_size(size)
         self.canvas.pack()
         
         self.advance = False
@@ -93,6 +92,18 @@ class InteractiveVisualizer:
         self.running = True
         self.root.protocol("WM_DELETE_WINDOW", self.close)
 
+        # Per-game scene (built on the first frame of each game) and frame timestamps for the fps readout
+        self.scene = None
+        self.frame_times = deque(maxlen=30)
+
+    def _set_board_size(self, size):
+        """Sizes cells and the window for size x size boards."""
+        self.board_size = size
+        self.cell_size = cell_size_for(size)
+        self.board_pixel_size = size * self.cell_size
+        window_width, window_height = window_size(size, self.padding)
+        self.canvas.config(width=window_width, height=window_height)
+
     def _on_space(self, event):
         self.advance = True
 
@@ -135,31 +146,24 @@ class InteractiveVisualizer:
         if self.fast_forward:
             return
 
-        # Optimization: In unlimited mode, skip rendering most frames to speed up
-        if self.auto_play and self.delay == 0 and turn % 20 != 0 and turn != 1:
-            # Process events to keep UI responsive (e.g. stopping auto-play)
-            self.root.update()
-            return
+        if self.scene is None:
+            self._build_scene(p1, p2)
+
+        # Note: boards are drawn under the opponent's name, matching show_game_state logic
+        for items, player in zip(self.scene["boards"], (p1, p2)):
+            items.update(player.board)
 
-        self.canvas.delete("all")
-        
         # Display Info
+        self.frame_times.append(time.perf_counter())
         if self.auto_play:
             delay_info = " | Delay: Unlimited" if self.delay == 0 else f" | Delay: {self.delay * 1000:.2f}ms"
+            if len(self.frame_times) > 1 and self.frame_times[-1] > self.frame_times[0]:
+                fps = (len(self.frame_times) - 1) / (self.frame_times[-1] - self.frame_times[0])
+                delay_info += f" | {fps:.1f} fps"
         else:
             delay_info = ""
         info_text = f"Iteration: {iteration} | Turn: {turn}{delay_info}"
-        self.canvas.create_text(self.padding, 20, text=info_text, font=("Arial", 16, "bold"), anchor="w")
-        
-        # Display Options at the bottom
-        opts_text = "Options: [Space] Next Turn | [Enter] Finish Game | [A] Auto-Play | [+/-] Speed | [Esc] Quit"
-        window_height = int(self.canvas['height'])
-        self.canvas.create_text(self.padding, window_height - 20, text=opts_text, font=("Arial", 10), anchor="w")
-
-        # Note: Names are swapped to indicate target board, matching show_game_state logic
-        draw_board(self.canvas, p1.board, self.padding, self.padding, self.cell_size, p2.name)
-        draw_board(self.canvas, p2.board, self.padding * 2 + self.board_pixel_size, self.padding, self.cell_size, p1.name)
-        draw_legend(self.canvas, self.padding, self.padding + self.board_pixel_size + 40, 20)
+        self.canvas.itemconfig(self.scene["header"], text=info_text)
         
         if self.auto_play:
             self.root.update()
@@ -177,10 +181,34 @@ class InteractiveVisualizer:
             self.fast_forward = True
             self.trigger_enter = False
 
+    def _build_scene(self, p1, p2):
+        """Creates every canvas item for a new game; later frames only restyle them."""
+        if p1.board.size != self.board_size:
+            self._set_board_size(p1.board.size)
+        self.canvas.delete("all")
+        header = self.canvas.create_text(self.padding, 20, text="", font=("Arial", 16, "bold"), anchor="w")
+
+        # Display Options at the bottom
+        opts_text = "Options: [Space] Next Turn | [Enter] Finish Game | [A] Auto-Play | [+/-] Speed | [Esc] Quit"
+        window_height = int(self.canvas['height'])
+        self.canvas.create_text(self.padding, window_height - 20, text=opts_text, font=("Arial", 10), anchor="w")
+
+        boards = (
+            BoardItems(self.canvas, self.padding, self.padding, self.cell_size, p2.name, self.board_size),
+            BoardItems(self.canvas, self.padding * 2 + self.board_pixel_size, self.padding, self.cell_size, p1.name,
+                       self.board_size),
+        )
+        draw_legend(self.canvas, self.padding, self.padding + self.board_pixel_size + 40, 20)
+        self.scene = {"header": header, "boards": boards}
+        self.frame_times.clear()
+
     def show_round_result(self, p1, p2, iteration, winner_name):
         if not self.running: return
 
+        if p1.board.size != self.board_size:
+            self._set_board_size(p1.board.size)
         self.canvas.delete("all")
+        self.scene = None
         
         # Header
         self.canvas.create_text(self.padding, 20, text=f"Iteration: {iteration} - Finished", font=("Arial", 16, "bold"), anchor="w")
@@ -217,12 +245,10 @@ def show_game_state(p1, p2, winner_name=None):
     root = tk.Tk()
     root.title("Battleship Final Game State")
 
-    cell_size = 30
-    padding = 70
-    board_pixel_size = 10 * cell_size
-    
-    window_width = padding * 3 + board_pixel_size * 2
-    window_height = padding * 2 + board_pixel_size + 80
+    cell_size = cell_size_for(p1.board.size)
+    padding = PADDING
+    board_pixel_size = p1.board.size * cell_size
+    window_width, window_height = window_size(p1.board.size, padding)
 
     canvas = tk.Canvas(root, width=window_width, height=window_height, bg="#f0f0f0")
     canvas.pack()